@@ -1,27 +1,51 @@
 import sys
 import os
+import time
+_process_boot_started = time.perf_counter()
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from flask import Flask, request, jsonify, send_from_directory, session
-from sqlalchemy import func
+from flask import Flask, request, jsonify, send_from_directory, session, has_request_context
 from datetime import datetime
 import json
 from functools import wraps
-import threading
-import time
 import uuid
 from contextlib import contextmanager
 from werkzeug.utils import secure_filename
+from werkzeug.formparser import parse_form_data
 
 # Local imports
 from config.config_loader import config
-from database.database import SessionLocal, init_db
+from database.database import SessionLocal, ReadSessionLocal, init_db, pool_metrics, replica_engine, replica_health
 from exception.custom_exception import CustomException, ValidationError, NotFoundError
 from logger.logger import logger
-from model.models import Candidate, JobDescription, Interview, User
+from model.models import Interview, User
 from model.status_constants import StatusConstants
 from src.hiring_service import HiringService
-from src.helpers import cleanup_directory
 from src.email_templates import EMAIL_TEMPLATES
+from src.ats_cache import ats_result_cache
+from src.llm_client import get_llm_client
+from src.smtp_pool import get_smtp_pool
+from src.notification_outbox import notification_outbox, OutboxDeliveryWorker
+from src.job_queue import bulk_job_queue, BulkJobWorker
+from src.upload_store import ChunkedUploadStore
+from src.archive_ingest import is_archive_file, list_archive_members
+from src.dashboard_stats import dashboard_stats_cache
+from src.pipeline_counters import pipeline_counters
+from src.candidate_search import candidate_search_index
+from src.skill_matcher import skill_matcher
+from src.prescreen import build_prescreen_report
+from src.helpers import cleanup_directory
+
+# --- Startup Timing ---
+# Each boot phase is timed so slow worker starts can be traced to a phase; see /api/health/startup.
+startup_timings = {"imports": round(time.perf_counter() - _process_boot_started, 3)}
+
+@contextmanager
+def _startup_phase(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings[name] = round(time.perf_counter() - started, 3)
 
 # --- Application Setup ---
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -29,33 +53,76 @@ app = Flask(__name__, static_folder=os.path.join(PROJECT_ROOT, 'frontend-react',
 app.secret_key = config.APP_SECRET_KEY
 
 # --- File Upload Security Configuration ---
-app.config['MAX_CONTENT_LENGTH'] = 25 * 1024 * 1024  # 25 MB total request size limit
+app.config['MAX_CONTENT_LENGTH'] = int(config.MAX_UPLOAD_REQUEST_MB * 1024 * 1024)  # Total request size limit
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
-
-# --- Create Upload Directories ---
-os.makedirs(config.TEMP_BULK_UPLOAD_FOLDER, exist_ok=True)
-os.makedirs(config.RESUME_UPLOAD_FOLDER, exist_ok=True)
-with app.app_context():
-    init_db()
-    logger.info("Application started and database initialized.")
-
-# --- Thread-Safe Task Management ---
-tasks = {}
-task_lock = threading.Lock()
+upload_store = ChunkedUploadStore(max_chunk_bytes=int(config.UPLOAD_CHUNK_MAX_MB * 1024 * 1024))
+
+# Resume extraction processes (src/resume_pipeline.py) re-import this module as __mp_main__ when the app is run
+# with `python -m api.main`; they must not initialize the database or start background workers of their own.
+if __name__ != "__mp_main__":
+    # --- Create Upload Directories ---
+    os.makedirs(config.TEMP_BULK_UPLOAD_FOLDER, exist_ok=True)
+    os.makedirs(config.RESUME_UPLOAD_FOLDER, exist_ok=True)
+    with app.app_context():
+        with _startup_phase("init_db"):
+            init_db()
+        with SessionLocal() as startup_db:
+            with _startup_phase("pipeline_counters"):
+                pipeline_counters.ensure_initialized(startup_db)
+            with _startup_phase("search_index"):
+                candidate_search_index.ensure_initialized(startup_db)
+            with _startup_phase("skill_vectors"):
+                skill_matcher.ensure_initialized(startup_db)
+        logger.info("Application started and database initialized.")
+
+    # --- Background Bulk Job Worker ---
+    # Every app process runs one worker; jobs live in the database, so any process can pick them up or resume them.
+    if config.JOB_WORKER_ENABLED:
+        with _startup_phase("job_worker"):
+            bulk_job_worker = BulkJobWorker(bulk_job_queue)
+            bulk_job_worker.start()
+
+    # --- Background Notification Outbox Worker ---
+    # Emails queued by status changes and bulk screening are delivered here, off the request and bulk-job threads.
+    if config.OUTBOX_WORKER_ENABLED:
+        with _startup_phase("outbox_worker"):
+            outbox_delivery_worker = OutboxDeliveryWorker(notification_outbox)
+            outbox_delivery_worker.start()
+
+startup_timings["total"] = round(time.perf_counter() - _process_boot_started, 3)
+logger.info("Startup timing (s): " + ", ".join(f"{phase}={seconds}" for phase, seconds in startup_timings.items()))
 
 # --- Helper Functions ---
 def allowed_file(filename):
-    """Checks if an uploaded file has an allowed extension."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    """Checks if an uploaded file has an allowed extension, or is a .zip/.tar/.tar.gz archive of resumes."""
+    return ('.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS) or is_archive_file(filename)
+
+def expand_uploaded_file(file_path):
+    """Returns the resumes to queue for an uploaded file: the file itself, or one reference per archive member."""
+    return list_archive_members(file_path) if is_archive_file(file_path) else [file_path]
+
+READ_ONLY_METHODS = ("GET", "HEAD")
 
 @contextmanager
-def get_db_session():
-    """Provides a transactional database session that is safely closed."""
-    db = SessionLocal()
+def get_db_session(read_only: bool = None):
+    """
+    Provides a transactional database session that is safely closed.
+    GET requests get a session that reads from the replica (when one is configured) unless this user wrote
+    something in the last db_replica_pin_seconds; any other request uses the primary and starts that pin.
+    :param read_only: Overrides the routing decided from the request method.
+    """
+    in_request = has_request_context()
+    if read_only is None:
+        read_only = in_request and request.method in READ_ONLY_METHODS
+    if read_only and in_request and session.get("db_primary_until", 0) > time.time():
+        read_only = False
+    db = ReadSessionLocal() if read_only else SessionLocal()
     try:
         yield db
     finally:
         db.close()
+        if replica_engine is not None and in_request and request.method not in READ_ONLY_METHODS:
+            session["db_primary_until"] = time.time() + config.DB_REPLICA_PIN_SECONDS
 
 # --- Decorators ---
 def login_required(f):
@@ -86,58 +153,6 @@ def handle_general_exception(error):
     return jsonify({"message": "An unexpected internal server error occurred."}), 500
 
 
-def process_resumes_in_background(task_id, file_paths, jd_id, ats_threshold, changed_by, temp_dir_to_delete):
-    """
-    Background thread worker that orchestrates parallel resume processing
-    by calling the HiringService and updating the shared task status.
-    """
-    app.logger.info(f"Starting background processing for task {task_id}")
-    with task_lock:
-        tasks[task_id]['status'] = 'processing'
-
-    def progress_callback(result_type: str):
-        """A nested function to safely update the global tasks dictionary."""
-        with task_lock:
-            if tasks.get(task_id):
-                tasks[task_id]['processed'] += 1
-                if result_type in tasks[task_id]:
-                    tasks[task_id][result_type] += 1
-    
-    with app.app_context():
-        with get_db_session() as db:
-            hiring_service = HiringService(db)
-            try:
-                # Delegate the entire parallel processing job to the service layer
-                hiring_service.bulk_process_and_shortlist_resumes(
-                    resume_file_paths=file_paths,
-                    jd_id=jd_id,
-                    ats_threshold=ats_threshold,
-                    changed_by=changed_by,
-                    progress_callback=progress_callback
-                )
-                
-                with task_lock:
-                    if tasks.get(task_id) and tasks[task_id].get('status') != 'cancelled':
-                        tasks[task_id]['status'] = 'completed'
-                app.logger.info(f"Background processing for task {task_id} completed.")
-
-            except Exception as e:
-                with task_lock:
-                    if tasks.get(task_id):
-                        tasks[task_id]['status'] = 'failed'
-                        tasks[task_id]['error'] = str(e)
-                app.logger.error(f"Background processing for task {task_id} failed critically: {e}", exc_info=True)
-            finally:
-
-                time.sleep(3) # Give a moment for file handles to release
-                db.close()
-                time.sleep(1) # A small delay is still a good safety measure
-                if temp_dir_to_delete:
-                    cleanup_directory(temp_dir_to_delete)
-                with task_lock:
-                    if tasks.get(task_id):
-                        tasks[task_id]['finished_at'] = time.time()
-
 # =============================================================================
 # === API ENDPOINTS ===========================================================
 # =============================================================================
@@ -230,31 +245,46 @@ def handle_users():
 @app.route("/api/tasks/progress", methods=["GET"])
 @login_required
 def get_tasks_progress():
-    """Polls the status of active background processing tasks."""
-    with task_lock:
-        # Clean up old, completed tasks from memory
-        cleanup_threshold = time.time() - 300 # 5 minutes
-        tasks_to_delete = [tid for tid, task in tasks.items() if task.get('finished_at') and task['finished_at'] < cleanup_threshold]
-        for tid in tasks_to_delete:
-            del tasks[tid]
-        
-        # Return only tasks that are currently processing
-        active_tasks = {tid: task for tid, task in tasks.items() if task.get('status') == 'processing'}
-        return jsonify(active_tasks), 200
+    """Polls the status of queued and running background processing tasks from the shared job store."""
+    with get_db_session() as db:
+        return jsonify(bulk_job_queue.get_active_jobs(db)), 200
 
 @app.route("/api/tasks/<task_id>/cancel", methods=["POST"])
 @login_required
 def cancel_task(task_id):
-    """Requests cancellation of a running background task."""
-    with task_lock:
-        if task_id in tasks:
-            if tasks[task_id]['status'] == 'processing':
-                tasks[task_id]['status'] = 'cancelled'
-                logger.info(f"User requested cancellation for task {task_id}")
-                return jsonify({"message": f"Cancellation requested for task {task_id}."}), 200
-            else:
-                return jsonify({"message": "Task has already completed or been cancelled."}), 400 # 400 Bad Request
-    return jsonify({"message": "Task not found."}), 404
+    """Requests cancellation of a queued or running background task."""
+    previous_status = bulk_job_queue.get_status(task_id)
+    if previous_status is None:
+        return jsonify({"message": "Task not found."}), 404
+    if previous_status not in ('pending', 'processing'):
+        return jsonify({"message": "Task has already completed or been cancelled."}), 400 # 400 Bad Request
+    bulk_job_queue.request_cancel(task_id)
+    return jsonify({"message": f"Cancellation requested for task {task_id}."}), 200
+
+@app.route("/api/tasks/<task_id>/resume", methods=["POST"])
+@login_required
+def resume_task(task_id):
+    """Re-queues a cancelled or failed background task so its unprocessed files are picked up again."""
+    status = bulk_job_queue.get_status(task_id)
+    if status is None:
+        return jsonify({"message": "Task not found."}), 404
+    if not bulk_job_queue.resume_job(task_id):
+        return jsonify({"message": "Only cancelled or failed tasks with unprocessed files can be resumed."}), 400
+    return jsonify({"message": f"Task {task_id} resumed."}), 200
+
+@app.route("/api/tasks/<task_id>/deferred/run", methods=["POST"])
+@login_required
+def run_deferred_task_items(task_id):
+    """Sends the resumes the pre-screen deferred for a finished task to the LLM, queued at low priority."""
+    status = bulk_job_queue.get_status(task_id)
+    if status is None:
+        return jsonify({"message": "Task not found."}), 404
+    if status in ('pending', 'processing'):
+        return jsonify({"message": "Task is still running; run its deferred resumes once it has finished."}), 409
+    requeued = bulk_job_queue.run_deferred(task_id)
+    if not requeued:
+        return jsonify({"message": "Task has no deferred resumes."}), 400
+    return jsonify({"message": f"{requeued} deferred resumes queued for LLM screening.", "requeued": requeued}), 202
 
 # --- Application Configuration Endpoints ---
 @app.route("/api/config/statuses", methods=["GET"])
@@ -269,38 +299,84 @@ def get_email_templates():
     """Provides the frontend with all available email templates."""
     return jsonify(EMAIL_TEMPLATES), 200
 
+@app.route("/api/prescreen/report", methods=["GET"])
+@login_required
+def prescreen_report():
+    """
+    Precision/recall of the local pre-screen against the LLM ATS score, overall or for one job (?job_id=).
+    Pass ?min_score= to see how a different cut-off would have performed before changing prescreen_min_score.
+    """
+    with get_db_session() as db:
+        report = build_prescreen_report(db, job_description_id=request.args.get('job_id', type=int), min_score=request.args.get('min_score', type=float))
+        report["mode"] = config.PRESCREEN_MODE
+        return jsonify(report), 200
+
+@app.route("/api/health/startup", methods=["GET"])
+@login_required
+def get_startup_timings():
+    """Reports how long each boot phase of this worker process took, in seconds."""
+    return jsonify({"pid": os.getpid(), "timings": startup_timings}), 200
+
+@app.route("/api/health/db-pools", methods=["GET"])
+@login_required
+def get_db_pool_stats():
+    """Reports checkout counters and live state of this worker process's API and background connection pools."""
+    return jsonify({
+        "pid": os.getpid(),
+        "pools": {name: metrics.snapshot() for name, metrics in pool_metrics.items()},
+        "replica": replica_health.status(),
+    }), 200
+
+@app.route("/api/ats/cache/stats", methods=["GET"])
+@login_required
+def get_ats_cache_stats():
+    """Reports hit/miss counters for the ATS result cache in this worker process."""
+    return jsonify(ats_result_cache.stats()), 200
+
+@app.route("/api/ats/llm/stats", methods=["GET"])
+@login_required
+def get_llm_client_stats():
+    """Reports request, retry and throttling counters for the shared LLM client in this worker process."""
+    return jsonify(get_llm_client().stats()), 200
+
+@app.route("/api/notifications/smtp/stats", methods=["GET"])
+@login_required
+def get_smtp_pool_stats():
+    """Reports connection reuse, reconnect and send counters for the pooled SMTP sender in this worker process."""
+    return jsonify(get_smtp_pool().stats()), 200
+
+@app.route("/api/notifications/outbox/stats", methods=["GET"])
+@login_required
+def get_outbox_stats():
+    """Reports how many queued emails are pending, being sent, sent and dead-lettered."""
+    with get_db_session() as db:
+        return jsonify(notification_outbox.stats(db)), 200
+
+@app.route("/api/notifications/outbox/dead/retry", methods=["POST"])
+@login_required
+def retry_dead_notifications():
+    """Requeues dead-lettered emails (all, or the IDs in 'message_ids') for another round of delivery attempts."""
+    message_ids = (request.get_json(silent=True) or {}).get('message_ids')
+    if message_ids is not None and not isinstance(message_ids, list):
+        raise ValidationError("'message_ids' must be a list of outbox message IDs.")
+    with get_db_session() as db:
+        requeued = notification_outbox.requeue_dead(db, message_ids)
+        return jsonify({"message": f"Requeued {requeued} dead-lettered emails.", "requeued": requeued}), 200
+
 # --- Dashboard & Analytics Endpoints ---
 @app.route("/api/dashboard/stats", methods=["GET"])
 @login_required
 def get_dashboard_stats():
     """Retrieves key performance indicators for the dashboard."""
     with get_db_session() as db:
-        hiring_service = HiringService(db)
-        interview_statuses = [ StatusConstants.L1_INTERVIEW_SCHEDULED_DESCR, StatusConstants.L2_INTERVIEW_SCHEDULED_DESCR, StatusConstants.HR_SCHEDULED_DESCR ]
-        offer_statuses = [ StatusConstants.OFFER_LETTER_ISSUED_DESCR, StatusConstants.OFFER_ACCEPTED_DESCR ]
-        total_jobs = db.query(func.count(JobDescription.id)).scalar() or 0
-        total_candidates = db.query(func.count(Candidate.id)).scalar() or 0
-        candidates_interviewing = db.query(func.count(Candidate.id)).filter(Candidate.current_status.in_(interview_statuses)).scalar() or 0
-        offers_extended = db.query(func.count(Candidate.id)).filter(Candidate.current_status.in_(offer_statuses)).scalar() or 0
-        stats = { "active_jobs": total_jobs, "total_candidates_shortlisted": total_candidates, "candidates_interviewing": candidates_interviewing, "offers_extended": offers_extended }
-        return jsonify(stats), 200
+        return jsonify(dashboard_stats_cache.dashboard_kpis(db)), 200
 
 @app.route("/api/candidates/distribution", methods=["GET"])
 @login_required
 def get_candidate_status_distribution():
     """Retrieves data for the candidate distribution doughnut chart."""
     with get_db_session() as db:
-        # A bit verbose, but clear. Could be simplified.
-        interview_statuses = [ StatusConstants.L1_INTERVIEW_SCHEDULED_DESCR, StatusConstants.L2_INTERVIEW_SCHEDULED_DESCR, StatusConstants.HR_SCHEDULED_DESCR, StatusConstants.L1_SELECTED_DESCR, StatusConstants.L2_SELECTED_DESCR, StatusConstants.HR_ROUND_SELECTED_DESCR ]
-        offer_statuses = [ StatusConstants.OFFER_LETTER_ISSUED_DESCR, StatusConstants.OFFER_ACCEPTED_DESCR, ]
-        rejected_statuses = [ StatusConstants.ATS_DISCARDED_DESCR, StatusConstants.L1_REJECTED_DESCR, StatusConstants.L2_REJECTED_DESCR, StatusConstants.HR_ROUND_REJECTED_DESCR, StatusConstants.OFFER_REJECTED_DESCR, StatusConstants.CANDIDATE_NOT_JOINED_DESCR, ]
-        shortlisted_count = db.query(func.count(Candidate.id)).filter(Candidate.current_status == StatusConstants.ATS_SHORTLISTED_DESCR).scalar() or 0
-        interviewing_count = db.query(func.count(Candidate.id)).filter(Candidate.current_status.in_(interview_statuses)).scalar() or 0
-        offers_count = db.query(func.count(Candidate.id)).filter(Candidate.current_status.in_(offer_statuses)).scalar() or 0
-        rejected_count = db.query(func.count(Candidate.id)).filter(Candidate.current_status.in_(rejected_statuses)).scalar() or 0
-        joined_count = db.query(func.count(Candidate.id)).filter(Candidate.current_status == StatusConstants.CANDIDATE_JOINED_DESCR).scalar() or 0
-        distribution_data = { "ATS Shortlisted": shortlisted_count, "Interviewing": interviewing_count, "Offers": offers_count, "Joined": joined_count, "Rejected": rejected_count }
-        final_distribution = {label: count for label, count in distribution_data.items() if count > 0}
+        final_distribution = dashboard_stats_cache.status_distribution(db)
         return jsonify({"labels": list(final_distribution.keys()), "data": list(final_distribution.values())}), 200
 
 # --- Job Management Endpoints ---
@@ -312,9 +388,10 @@ def handle_jobs():
         hiring_service = HiringService(db)
         if request.method == "GET":
             # GET /api/jobs - Fetches a list of all jobs.
-            # NOTE: This route has a potential N+1 performance issue on `len(j.candidates)`.
+            # Candidate counts come from the pipeline_counters table, not from loading each job's candidates.
             jobs = hiring_service.get_jobs()
-            return jsonify([{"id": j.id, "title": j.title, "created_at": j.created_at.isoformat(), "candidate_count": len(j.candidates), "min_experience_years": j.min_experience_years} for j in jobs]), 200
+            candidate_counts = pipeline_counters.job_totals(db)
+            return jsonify([{"id": j.id, "title": j.title, "created_at": j.created_at.isoformat(), "candidate_count": candidate_counts.get(j.id, 0), "min_experience_years": j.min_experience_years} for j in jobs]), 200
         
         elif request.method == "POST":
             # POST /api/jobs - Creates a new job.
@@ -362,6 +439,26 @@ def handle_single_job(job_id):
             db.commit()
             return jsonify({"message": "Job updated successfully.", "job_id": updated_job.id}), 200
 
+@app.route("/api/jobs/<int:job_id>/matches", methods=["GET"])
+@login_required
+def job_matches_api(job_id):
+    """
+    Ranks past candidates from every job against this job's title and description using precomputed
+    skill/term vectors, without any LLM calls. Query params: limit (default 20), method (bm25 | cosine),
+    include_applicants (default false; candidates who already applied to this job are left out).
+    """
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 200)
+    method = request.args.get('method', 'bm25').lower()
+    include_applicants = request.args.get('include_applicants', 'false').lower() in ('1', 'true', 'yes')
+    with get_db_session() as db:
+        matches = HiringService(db).match_candidates_to_job(job_id, limit=limit, method=method, include_applicants=include_applicants)
+        return jsonify({"job_id": job_id, "method": method, "matches": [{
+            "id": m["candidate"].id, "first_name": m["candidate"].first_name, "last_name": m["candidate"].last_name,
+            "email": m["candidate"].email, "status": m["candidate"].current_status,
+            "job_title": m["candidate"].job_description.title if m["candidate"].job_description else "N/A",
+            "ats_score": m["candidate"].ats_score, "match_score": round(m["score"], 4), "matched_terms": m["matched_terms"],
+        } for m in matches]}), 200
+
 @app.route("/api/jobs/bulk", methods=["DELETE"])
 @login_required
 def bulk_delete_jobs_api():
@@ -382,72 +479,172 @@ def bulk_delete_jobs_api():
 @login_required
 def bulk_process_resumes_start():
     """Accepts resume files to start a background processing job."""
-    if 'resumes' not in request.files:
-        raise ValidationError("No 'resumes' file part in the request.")
-    
-    resume_files = request.files.getlist('resumes')
-    jd_id = request.form.get('job_description_id')
-    job_title = request.form.get('job_title', 'Unknown Job')
-    ats_threshold = request.form.get('ats_threshold', type=float, default=70.0)
-    
-    if not resume_files or not jd_id: 
-        raise ValidationError("Missing resume files or a selected job.")
-
     task_id = str(uuid.uuid4())
-    # temp_path = os.path.join(config.TEMP_BULK_UPLOAD_FOLDER, task_id)
     temp_path = os.path.abspath(os.path.join(config.TEMP_BULK_UPLOAD_FOLDER, task_id))
     os.makedirs(temp_path, exist_ok=True)
-    
+
+    # File parts are streamed straight into the task folder as the body is read, rather than
+    # spooled to a system temp file and then copied again by file.save().
+    _, form, files = parse_form_data(
+        request.environ,
+        stream_factory=upload_store.stream_factory(temp_path),
+        max_content_length=app.config['MAX_CONTENT_LENGTH']
+    )
+    resume_files = files.getlist('resumes')
+    jd_id = form.get('job_description_id')
+    job_title = form.get('job_title', 'Unknown Job')
+    ats_threshold = form.get('ats_threshold', type=float, default=70.0)
+
     uploaded_paths = []
     
     """
     This loop checks if the files in resume_files have .pdf or .doc extensions,
-    secures the filenames, and saves them to a temporary folder.
+    secures the filenames, and renames them into the task folder.
     
     """
-    for file in resume_files:
-        if file.filename == '':
-            continue
-        if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            save_path = os.path.join(temp_path, filename)
-            file.save(save_path)
-            uploaded_paths.append(save_path)
-        else:
-            logger.warning(f"Skipped disallowed file type during bulk upload: {file.filename}")
-
+    try:
+        for file in resume_files:
+            if file.filename and allowed_file(file.filename):
+                saved_path = upload_store.finalize_streamed_file(temp_path, file, secure_filename(file.filename))
+                # Archives stay packed; their members are read into memory by the workers as they are processed.
+                uploaded_paths.extend(expand_uploaded_file(saved_path))
+            else:
+                file.stream.close()
+                os.remove(file.stream.name)
+                logger.warning(f"Skipped disallowed file type during bulk upload: {file.filename}")
+    except ValidationError:
+        cleanup_directory(temp_path)
+        raise
+
+    if not resume_files or not jd_id:
+        cleanup_directory(temp_path)
+        raise ValidationError("Missing resume files or a selected job.")
     if not uploaded_paths:
-        raise ValidationError("No valid files were uploaded. Check file types are one of: " + ", ".join(ALLOWED_EXTENSIONS))
+        cleanup_directory(temp_path)
+        raise ValidationError("No valid files were uploaded. Check file types are one of: " + ", ".join(ALLOWED_EXTENSIONS) + ", or a .zip/.tar.gz archive of them")
 
-    with task_lock:
-        tasks[task_id] = {'status': 'pending', 'total': len(uploaded_paths), 'processed': 0, 'shortlisted': 0, 'rejected': 0, 'failed': 0, 'job_title': job_title, 'started_at': datetime.utcnow().isoformat()}
-    
-    
-    # thread = threading.Thread(target=process_resumes_in_background, args=(task_id, uploaded_paths, int(jd_id), ats_threshold, "HR System"))
-    thread = threading.Thread(target=process_resumes_in_background, args=(task_id, uploaded_paths, int(jd_id), ats_threshold, "HR System", temp_path))
-    thread.daemon = True
-    thread.start()
+    # The job is persisted and picked up by whichever worker process claims it first.
+    with get_db_session() as db:
+        bulk_job_queue.enqueue(db, task_id, int(jd_id), job_title, ats_threshold, "HR System", temp_path, uploaded_paths)
 
     return jsonify({"message": "Resume processing started.", "task_id": task_id}), 202
 
+# --- Chunked / Resumable Bulk Upload Endpoints ---
+# Large batches are uploaded one file at a time in chunks. Each completed file is queued immediately,
+# so screening starts while the rest of the batch is still uploading.
+@app.route("/api/uploads", methods=["POST"])
+@login_required
+def start_chunked_upload():
+    """Opens an upload session, backed by a bulk job that processes files as they arrive."""
+    data = request.json or {}
+    jd_id = data.get('job_description_id')
+    if not jd_id:
+        raise ValidationError("A job_description_id is required.")
+
+    task_id = str(uuid.uuid4())
+    temp_path = os.path.abspath(os.path.join(config.TEMP_BULK_UPLOAD_FOLDER, task_id))
+    os.makedirs(temp_path, exist_ok=True)
+    with get_db_session() as db:
+        bulk_job_queue.enqueue(
+            db, task_id, int(jd_id), data.get('job_title', 'Unknown Job'), float(data.get('ats_threshold', 70.0)),
+            "HR System", temp_path, [], receiving=True
+        )
+    return jsonify({"task_id": task_id, "max_chunk_bytes": upload_store.max_chunk_bytes}), 201
+
+def _get_upload_target(task_id: str, file_name: str) -> tuple[str, str]:
+    """Resolves the upload folder and secured file name for a chunked upload request."""
+    upload_dir = bulk_job_queue.get_receiving_upload_dir(task_id)
+    if not upload_dir:
+        raise NotFoundError("Upload session not found or no longer accepting files.")
+    safe_name = secure_filename(file_name)
+    if not safe_name or not allowed_file(safe_name):
+        raise ValidationError("Invalid file type. Allowed types are: " + ", ".join(ALLOWED_EXTENSIONS) + ", zip, tar, tar.gz")
+    return upload_dir, safe_name
+
+@app.route("/api/uploads/<task_id>/files/<file_name>", methods=["GET", "PUT"])
+@login_required
+def handle_upload_file(task_id, file_name):
+    """
+    GET returns how many bytes of a file were received, so an interrupted upload can resume.
+    PUT appends a raw chunk at ?offset=<bytes received>&total_size=<file size>.
+    """
+    upload_dir, safe_name = _get_upload_target(task_id, file_name)
+    if request.method == "GET":
+        return jsonify({"file_name": safe_name, "received": upload_store.received_bytes(upload_dir, safe_name)}), 200
+
+    offset = request.args.get('offset', type=int)
+    total_size = request.args.get('total_size', type=int)
+    if offset is None or not total_size or total_size < 0:
+        raise ValidationError("Both 'offset' and 'total_size' query parameters are required.")
+
+    received, final_path = upload_store.write_chunk(upload_dir, safe_name, offset, total_size, request.stream)
+    if final_path and not bulk_job_queue.add_items(task_id, expand_uploaded_file(final_path)):
+        raise ValidationError("Upload session is no longer accepting files.")
+    return jsonify({"file_name": safe_name, "received": received, "complete": final_path is not None}), 200
+
+@app.route("/api/uploads/<task_id>/complete", methods=["POST"])
+@login_required
+def complete_chunked_upload(task_id):
+    """Closes an upload session; the job finishes once every received file has been screened."""
+    if bulk_job_queue.get_status(task_id) is None:
+        raise NotFoundError("Upload session not found.")
+    if not bulk_job_queue.complete_upload(task_id):
+        raise ValidationError("Upload session was already closed.")
+    return jsonify({"message": "Upload complete. Remaining files are being processed.", "task_id": task_id}), 200
+
 @app.route("/api/candidates", methods=["GET"])
 @login_required
 def get_candidates_api():
-    """Fetches a paginated and filterable list of all candidates."""
+    """
+    Fetches a paginated and filterable list of all candidates.
+    Pass the returned `next_cursor` as `cursor` to fetch the next page in constant time; `page` still works
+    for jumping to a page. Set `include_total=false` to skip computing the total.
+    """
     page = request.args.get('page', 1, type=int)
-    limit = request.args.get('limit', 10, type=int)
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 200)
+    cursor = request.args.get('cursor')
+    include_total = request.args.get('include_total', 'true').lower() not in ('0', 'false', 'no')
     status_filter = request.args.getlist('status')
     job_id_filter = request.args.get('job_id', type=int)
     search_query = request.args.get('search')
     
     with get_db_session() as db:
         hiring_service = HiringService(db)
-        query, total_count = hiring_service.get_candidates(status=status_filter, job_id=job_id_filter, search_query=search_query, paginated=True)
-        offset = (page - 1) * limit
-        paginated_query = query.offset(offset).limit(limit)
-        candidates = paginated_query.all()
-        results = [{"id": c.id, "first_name": c.first_name, "last_name": c.last_name, "email": c.email, "phone_number": c.phone_number, "status": c.current_status, "job_title": c.job_description.title if c.job_description else "N/A", "ats_score": c.ats_score} for c in candidates]
-        return jsonify({"candidates": results, "total": total_count}), 200
+        result = hiring_service.get_candidates_page(
+            status=status_filter, job_id=job_id_filter, search_query=search_query,
+            limit=limit, cursor=cursor, page=page, include_total=include_total
+        )
+        results = [{"id": c.id, "first_name": c.first_name, "last_name": c.last_name, "email": c.email, "phone_number": c.phone_number, "status": c.current_status, "job_title": c.job_description.title if c.job_description else "N/A", "ats_score": c.ats_score} for c in result["candidates"]]
+        return jsonify({"candidates": results, "total": result["total"], "next_cursor": result["next_cursor"]}), 200
+
+def _ranked_candidates_json(ranked):
+    return [{"id": c.id, "first_name": c.first_name, "last_name": c.last_name, "email": c.email, "status": c.current_status, "job_title": c.job_description.title if c.job_description else "N/A", "ats_score": c.ats_score, "relevance": round(score, 4)} for c, score in ranked]
+
+@app.route("/api/candidates/search", methods=["GET"])
+@login_required
+def search_candidates_api():
+    """Ranked full-text search: every word of `q` must prefix-match a name, email, job title, skill or resume word."""
+    search_query = request.args.get('q', '').strip()
+    if not search_query:
+        raise ValidationError("Query parameter 'q' is required.")
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+    with get_db_session() as db:
+        ranked = HiringService(db).search_candidates(search_query, job_id=request.args.get('job_id', type=int), limit=limit)
+        return jsonify({"candidates": _ranked_candidates_json(ranked)}), 200
+
+@app.route("/api/candidates/search/skills", methods=["GET"])
+@login_required
+def search_candidates_by_skills_api():
+    """
+    Ranked search by skill, e.g. ?skills=python,machine learning&match=all.
+    Skills are matched as whole words or phrases against the AI-matched skills and the resume text.
+    """
+    skills = [skill.strip() for value in request.args.getlist('skills') for skill in value.split(',') if skill.strip()]
+    match_all = request.args.get('match', 'any').lower() == 'all'
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+    with get_db_session() as db:
+        ranked = HiringService(db).search_candidates_by_skills(skills, job_id=request.args.get('job_id', type=int), match_all=match_all, limit=limit)
+        return jsonify({"skills": skills, "match": "all" if match_all else "any", "candidates": _ranked_candidates_json(ranked)}), 200
 
 @app.route("/api/candidates/<int:candidate_id>", methods=["GET", "DELETE"])
 @login_required
@@ -472,6 +669,7 @@ def handle_candidate(candidate_id):
             # DELETE /api/candidates/{id} - Deletes one candidate.
             hiring_service.bulk_delete_candidates([candidate_id])
             db.commit()
+            dashboard_stats_cache.invalidate()
             return jsonify({"message": f"Candidate {candidate_id} deleted successfully."}), 200 # Can also be 204 No Content
 
 @app.route("/api/candidates/bulk", methods=["DELETE"])
@@ -486,6 +684,7 @@ def bulk_delete_candidates_api():
         hiring_service = HiringService(db)
         hiring_service.bulk_delete_candidates(candidate_ids)
         db.commit()
+        dashboard_stats_cache.invalidate()
         return jsonify({"message": f"{len(candidate_ids)} candidates deleted successfully."}), 200
 
 @app.route("/api/candidates/counts", methods=["GET"])
@@ -493,15 +692,8 @@ def bulk_delete_candidates_api():
 def get_candidate_counts():
     """Gets the count of candidates for each major pipeline stage (for UI tabs)."""
     with get_db_session() as db:
-        hiring_service = HiringService(db)
-        tab_stages = hiring_service.status_configs['tab_status_groups']
-        all_query_statuses = [status for sublist in tab_stages.values() for status in sublist]
-        db_counts = dict(db.query(Candidate.current_status, func.count(Candidate.id)).filter(Candidate.current_status.in_(all_query_statuses)).group_by(Candidate.current_status).all())
-        final_counts = {tab_key: 0 for tab_key in tab_stages.keys()}
-        for tab_key, associated_statuses in tab_stages.items():
-            for status in associated_statuses:
-                final_counts[tab_key] += db_counts.get(status, 0)
-        return jsonify(final_counts), 200
+        tab_stages = StatusConstants.get_all_configs()['tab_status_groups']
+        return jsonify(dashboard_stats_cache.tab_counts(db, tab_stages)), 200
 
 @app.route("/api/candidates/<int:candidate_id>/update_status", methods=["POST"])
 @login_required
@@ -601,7 +793,10 @@ def bulk_send_messages():
         # NOTE: 'changed_by' is hardcoded.
         result = hiring_service.send_bulk_notification(candidate_ids, channel, subject, message, "HR")
         db.commit()
-        return jsonify({"message": f"Bulk {channel} process complete. Sent: {result['success']}, Failed: {result['failed']}."}), 200
+        return jsonify({
+            "message": f"Bulk {channel} process complete. Sent: {result['success']}, Failed: {result['failed']}.",
+            "results": result["results"],
+        }), 200
 
 # --- Main Execution ---
 if __name__ == "__main__":
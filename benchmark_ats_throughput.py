@@ -0,0 +1,52 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Force the offline backend before anything reads the config.
+os.environ["LLM_BACKEND"] = "fake"
+
+from src.ats_cache import ats_result_cache
+from src.ats_service import ATSService
+from src.llm_client import get_llm_client
+
+SAMPLE_JD = "Senior Python developer with Flask, SQLAlchemy, MySQL and REST API experience. " * 20
+
+def run_benchmark(num_resumes: int, workers: int, duplicate_ratio: float):
+    """
+    Scores synthetic resumes through ATSService using the fake LLM backend and reports throughput,
+    so limiter and concurrency settings can be tuned without spending Gemini quota.
+    """
+    ats_service = ATSService()
+    unique_count = max(1, int(num_resumes * (1 - duplicate_ratio)))
+    resumes = [f"Resume {i % unique_count}: candidate{i % unique_count}@example.com, 5 years Python, Flask, SQL." for i in range(num_resumes)]
+
+    started = time.perf_counter()
+    failures = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(ats_service.generate_ats_score, text, {}, SAMPLE_JD, "3") for text in resumes]
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception:
+                failures += 1
+    elapsed = time.perf_counter() - started
+
+    print("--- ATS Throughput Benchmark (fake LLM backend) ---")
+    print(f"Resumes scored:   {num_resumes} ({failures} failed)")
+    print(f"Elapsed:          {elapsed:.2f}s")
+    print(f"Throughput:       {num_resumes / elapsed:.2f} resumes/s")
+    print(f"LLM client stats: {get_llm_client().stats()}")
+    print(f"ATS cache stats:  {ats_result_cache.stats()}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ATS scoring throughput offline.")
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0, help="Fraction of resumes that repeat earlier ones.")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the ATS result cache.")
+    args = parser.parse_args()
+
+    if args.no_cache:
+        ats_result_cache.enabled = False
+    run_benchmark(args.resumes, args.workers, args.duplicate_ratio)
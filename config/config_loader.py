@@ -28,19 +28,37 @@ class Config:
 
         # Database and API Keys
         self.DATABASE_URL = os.getenv("DATABASE_URL", self._config.get("database_url"))
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", self._config.get("db_pool_size", 10)))
+        self.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", self._config.get("db_max_overflow", 20)))
+        self.DB_BACKGROUND_POOL_SIZE = int(os.getenv("DB_BACKGROUND_POOL_SIZE", self._config.get("db_background_pool_size", 10)))
+        self.DB_BACKGROUND_MAX_OVERFLOW = int(os.getenv("DB_BACKGROUND_MAX_OVERFLOW", self._config.get("db_background_max_overflow", 10)))
+        self.DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", self._config.get("db_pool_timeout_seconds", 30)))
+        self.DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", self._config.get("db_pool_recycle_seconds", 1800)))
+        self.DB_POOL_PRE_PING = str(os.getenv("DB_POOL_PRE_PING", self._config.get("db_pool_pre_ping", True))).lower() in ("1", "true", "yes")
+        self.DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", self._config.get("database_replica_url")) or None
+        self.DB_REPLICA_HEALTH_CHECK_SECONDS = float(os.getenv("DB_REPLICA_HEALTH_CHECK_SECONDS", self._config.get("db_replica_health_check_seconds", 15)))
+        self.DB_REPLICA_PIN_SECONDS = float(os.getenv("DB_REPLICA_PIN_SECONDS", self._config.get("db_replica_pin_seconds", 5)))
         self.GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", self._config.get("gemini_api_key"))
         self.TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID", self._config.get("twilio_account_sid"))
         self.TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN", self._config.get("twilio_auth_token"))
         self.TWILIO_WHATSAPP_NUMBER = os.getenv("TWILIO_WHATSAPP_NUMBER", self._config.get("twilio_whatsapp_number"))
+        self.TWILIO_API_BASE_URL = os.getenv("TWILIO_API_BASE_URL", self._config.get("twilio_api_base_url")) or None
 
         # General App Settings
         self.APP_SECRET_KEY = os.getenv("APP_SECRET_KEY", self._config.get("app_secret_key", "super_secret_key_dev"))
         self.LOG_LEVEL = os.getenv("LOG_LEVEL", self._config.get("log_level", "INFO"))
+        self.NLP_AUTO_DOWNLOAD = str(os.getenv("NLP_AUTO_DOWNLOAD", self._config.get("nlp_auto_download", False))).lower() in ("1", "true", "yes")
         
         # File Upload Settings
         self.RESUME_UPLOAD_FOLDER = self._config.get("resume_upload_folder", "uploads/resumes")
         self.JD_UPLOAD_FOLDER = self._config.get("jd_upload_folder", "uploads/jds")
         self.TEMP_BULK_UPLOAD_FOLDER = self._config.get("temp_bulk_upload_folder", "uploads/temp_bulk")
+        self.MAX_UPLOAD_REQUEST_MB = float(os.getenv("MAX_UPLOAD_REQUEST_MB", self._config.get("max_upload_request_mb", 25)))
+        self.UPLOAD_CHUNK_MAX_MB = float(os.getenv("UPLOAD_CHUNK_MAX_MB", self._config.get("upload_chunk_max_mb", 8)))
+        self.UPLOAD_SESSION_IDLE_SECONDS = float(os.getenv("UPLOAD_SESSION_IDLE_SECONDS", self._config.get("upload_session_idle_seconds", 1800)))
+        self.ARCHIVE_MAX_MEMBERS = int(os.getenv("ARCHIVE_MAX_MEMBERS", self._config.get("archive_max_members", 5000)))
+        self.ARCHIVE_MAX_MEMBER_MB = float(os.getenv("ARCHIVE_MAX_MEMBER_MB", self._config.get("archive_max_member_mb", 10)))
+        self.ARCHIVE_MAX_TOTAL_MB = float(os.getenv("ARCHIVE_MAX_TOTAL_MB", self._config.get("archive_max_total_mb", 2048)))
 
         # ATS Settings
         self.ats_weights = self._config.get("ats_weights", {})
@@ -48,7 +66,63 @@ class Config:
         
         # Concurrency Settings
         self.MAX_WORKERS_RESUME_PROCESSING = int(os.getenv("MAX_WORKERS_RESUME_PROCESSING", self._config.get("max_workers_resume_processing", 8)))
+        extraction_workers = self._config.get("max_workers_text_extraction")
+        self.MAX_WORKERS_TEXT_EXTRACTION = int(os.getenv("MAX_WORKERS_TEXT_EXTRACTION", extraction_workers if extraction_workers is not None else (os.cpu_count() or 1)))
+        self.MAX_WORKERS_LLM_SCORING = int(os.getenv("MAX_WORKERS_LLM_SCORING", self._config.get("max_workers_llm_scoring") or self.MAX_WORKERS_RESUME_PROCESSING))
+        self.SCORING_QUEUE_SIZE = int(os.getenv("SCORING_QUEUE_SIZE", self._config.get("scoring_queue_size", 32)))
         self.MAX_WORKERS_WHATSAPP_SENDING = int(os.getenv("MAX_WORKERS_WHATSAPP_SENDING", self._config.get("max_workers_whatsapp_sending", 5)))
+        self.WHATSAPP_MESSAGES_PER_SECOND = float(os.getenv("WHATSAPP_MESSAGES_PER_SECOND", self._config.get("whatsapp_messages_per_second", 10)))
+        self.WHATSAPP_MAX_RETRIES = int(os.getenv("WHATSAPP_MAX_RETRIES", self._config.get("whatsapp_max_retries", 3)))
+        self.WHATSAPP_BACKOFF_BASE_SECONDS = float(os.getenv("WHATSAPP_BACKOFF_BASE_SECONDS", self._config.get("whatsapp_backoff_base_seconds", 1.0)))
+        self.WHATSAPP_BACKOFF_MAX_SECONDS = float(os.getenv("WHATSAPP_BACKOFF_MAX_SECONDS", self._config.get("whatsapp_backoff_max_seconds", 30.0)))
+        self.ATS_BATCH_SIZE = max(1, int(os.getenv("ATS_BATCH_SIZE", self._config.get("ats_batch_size", 1))))
+        self.CANDIDATE_INSERT_BATCH_SIZE = max(1, int(os.getenv("CANDIDATE_INSERT_BATCH_SIZE", self._config.get("candidate_insert_batch_size", 50))))
+        self.CANDIDATE_INSERT_FLUSH_SECONDS = float(os.getenv("CANDIDATE_INSERT_FLUSH_SECONDS", self._config.get("candidate_insert_flush_seconds", 5)))
+        self.PRESCREEN_MODE = os.getenv("PRESCREEN_MODE", self._config.get("prescreen_mode", "shadow"))
+        self.PRESCREEN_MIN_SCORE = float(os.getenv("PRESCREEN_MIN_SCORE", self._config.get("prescreen_min_score", 10.0)))
+
+        # Bulk Job Queue Settings
+        self.JOB_WORKER_ENABLED = str(os.getenv("JOB_WORKER_ENABLED", self._config.get("job_worker_enabled", True))).lower() in ("1", "true", "yes")
+        self.JOB_WORKER_POLL_SECONDS = float(os.getenv("JOB_WORKER_POLL_SECONDS", self._config.get("job_worker_poll_seconds", 2)))
+        self.JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", self._config.get("job_heartbeat_seconds", 10)))
+        self.JOB_STALE_AFTER_SECONDS = float(os.getenv("JOB_STALE_AFTER_SECONDS", self._config.get("job_stale_after_seconds", 60)))
+
+        # Notification Outbox Settings
+        self.OUTBOX_WORKER_ENABLED = str(os.getenv("OUTBOX_WORKER_ENABLED", self._config.get("outbox_worker_enabled", True))).lower() in ("1", "true", "yes")
+        self.OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", self._config.get("outbox_poll_seconds", 2)))
+        self.OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", self._config.get("outbox_batch_size", 50)))
+        self.OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", self._config.get("outbox_max_attempts", 6)))
+        self.OUTBOX_BACKOFF_BASE_SECONDS = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", self._config.get("outbox_backoff_base_seconds", 30)))
+        self.OUTBOX_BACKOFF_MAX_SECONDS = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", self._config.get("outbox_backoff_max_seconds", 3600)))
+        self.OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", self._config.get("outbox_lease_seconds", 300)))
+
+        # Shortlist Digest Settings
+        self.SHORTLIST_DIGEST_ENABLED = str(os.getenv("SHORTLIST_DIGEST_ENABLED", self._config.get("shortlist_digest_enabled", True))).lower() in ("1", "true", "yes")
+        self.SHORTLIST_DIGEST_INTERVAL_MINUTES = float(os.getenv("SHORTLIST_DIGEST_INTERVAL_MINUTES", self._config.get("shortlist_digest_interval_minutes", 15)))
+        self.SHORTLIST_DIGEST_MAX_ROWS = int(os.getenv("SHORTLIST_DIGEST_MAX_ROWS", self._config.get("shortlist_digest_max_rows", 200)))
+
+        # Dashboard Settings
+        self.DASHBOARD_STATS_TTL_SECONDS = float(os.getenv("DASHBOARD_STATS_TTL_SECONDS", self._config.get("dashboard_stats_ttl_seconds", 30)))
+        self.CANDIDATE_COUNT_CACHE_TTL_SECONDS = float(os.getenv("CANDIDATE_COUNT_CACHE_TTL_SECONDS", self._config.get("candidate_count_cache_ttl_seconds", 30)))
+        self.CANDIDATE_SEARCH_BACKEND = os.getenv("CANDIDATE_SEARCH_BACKEND", self._config.get("candidate_search_backend", "auto"))
+
+        # ATS Result Cache Settings
+        self.ATS_CACHE_ENABLED = str(os.getenv("ATS_CACHE_ENABLED", self._config.get("ats_cache_enabled", True))).lower() in ("1", "true", "yes")
+        self.ATS_CACHE_TTL_HOURS = float(os.getenv("ATS_CACHE_TTL_HOURS", self._config.get("ats_cache_ttl_hours", 720)))
+        self.ATS_CACHE_MAX_ENTRIES = int(os.getenv("ATS_CACHE_MAX_ENTRIES", self._config.get("ats_cache_max_entries", 50000)))
+
+        # LLM Client Settings
+        self.LLM_BACKEND = os.getenv("LLM_BACKEND", self._config.get("llm_backend", "gemini"))
+        self.GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", self._config.get("gemini_model_name", "models/gemini-2.5-flash"))
+        self.LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", self._config.get("llm_requests_per_minute", 60)))
+        self.LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", self._config.get("llm_tokens_per_minute", 1000000)))
+        self.LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", self._config.get("llm_max_concurrency", 8)))
+        self.LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", self._config.get("llm_min_concurrency", 1)))
+        self.LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", self._config.get("llm_max_retries", 5)))
+        self.LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", self._config.get("llm_backoff_base_seconds", 1.0)))
+        self.LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", self._config.get("llm_backoff_max_seconds", 60.0)))
+        self.FAKE_LLM_LATENCY_SECONDS = float(os.getenv("FAKE_LLM_LATENCY_SECONDS", self._config.get("fake_llm_latency_seconds", 0.5)))
+        self.FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", self._config.get("fake_llm_error_rate", 0.0)))
 
         # --- NEW: Email Notification (SMTP) Settings ---
         self.SMTP_SERVER = os.getenv("SMTP_SERVER", self._config.get("smtp_server"))
@@ -57,5 +131,10 @@ class Config:
         self.SMTP_USERNAME = os.getenv("SMTP_USERNAME", self._config.get("smtp_username"))
         self.SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", self._config.get("smtp_password"))
         self.HR_RECIPIENT_EMAIL = os.getenv("HR_RECIPIENT_EMAIL", self._config.get("hr_recipient_email"))
+        self.SMTP_USE_TLS = str(os.getenv("SMTP_USE_TLS", self._config.get("smtp_use_tls", True))).lower() in ("1", "true", "yes")
+        self.SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", self._config.get("smtp_pool_size", 4)))
+        self.SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", self._config.get("smtp_timeout_seconds", 30)))
+        self.SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", self._config.get("smtp_max_messages_per_connection", 100)))
+        self.SMTP_MAX_IDLE_SECONDS = float(os.getenv("SMTP_MAX_IDLE_SECONDS", self._config.get("smtp_max_idle_seconds", 60)))
 
 config = Config()
\ No newline at end of file
@@ -1,9 +1,16 @@
 # =============================================================================
 # HR-HIRE-AGENT/database/database.py
 # =============================================================================
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import DateTime, create_engine, event, func, inspect, literal, text, update
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
 from logger.logger import logger
 from config.config_loader import config
 from exception.custom_exception import DatabaseError
@@ -15,16 +22,160 @@ if not DATABASE_URL:
     logger.error("DATABASE_URL is not set in environment variables or config.yaml")
     raise ValueError("DATABASE_URL is not configured. Please set it in .env or config.yaml")
 
-# Create a SQLAlchemy engine
-try:
-    engine = create_engine(DATABASE_URL)
-    logger.info("SQLAlchemy engine created successfully.")
-except Exception as e:
-    logger.critical(f"Failed to create SQLAlchemy engine: {e}")
-    raise DatabaseError(f"Failed to initialize database connection: {e}")
+class PoolMetrics:
+    """
+    Checkout/checkin counters for one engine's connection pool, collected from SQLAlchemy pool events.
+    `snapshot` adds the pool's live state (size, checked out, overflow) so exhaustion shows up before requests time out.
+    """
+    def __init__(self, name: str, engine):
+        self.name = name
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._counters = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0, "max_checked_out": 0}
+        self._checked_out = 0
+        self._hold_seconds_total = 0.0
+        self._hold_seconds_max = 0.0
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._counters["connects"] += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.monotonic()
+        with self._lock:
+            self._counters["checkouts"] += 1
+            self._checked_out += 1
+            self._counters["max_checked_out"] = max(self._counters["max_checked_out"], self._checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        with self._lock:
+            self._counters["checkins"] += 1
+            self._checked_out = max(0, self._checked_out - 1)
+            if checked_out_at is not None:
+                held = time.monotonic() - checked_out_at
+                self._hold_seconds_total += held
+                self._hold_seconds_max = max(self._hold_seconds_max, held)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self._counters["invalidations"] += 1
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool
+        with self._lock:
+            stats = dict(self._counters)
+            stats["checked_out"] = self._checked_out
+            stats["avg_hold_seconds"] = round(self._hold_seconds_total / stats["checkins"], 4) if stats["checkins"] else 0.0
+            stats["max_hold_seconds"] = round(self._hold_seconds_max, 4)
+        stats["pool_class"] = type(pool).__name__
+        for attribute in ("size", "overflow", "checkedin"):
+            if hasattr(pool, attribute):
+                stats[f"pool_{attribute}"] = getattr(pool, attribute)()
+        stats["status"] = pool.status()
+        return stats
+
+
+def _create_engine(name: str, pool_size: int, max_overflow: int, url: str = DATABASE_URL):
+    """
+    Creates an engine with pre-ping (stale connections are replaced instead of failing with "server has gone away")
+    and recycling below the server's idle timeout. SQLite keeps SQLAlchemy's default pool, which has no size limits.
+    """
+    options = {"pool_pre_ping": config.DB_POOL_PRE_PING}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=config.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=config.DB_POOL_RECYCLE_SECONDS,
+        )
+    try:
+        new_engine = create_engine(url, **options)
+        logger.info(f"SQLAlchemy {name} engine created successfully (pool_size={pool_size}, max_overflow={max_overflow}).")
+        return new_engine
+    except Exception as e:
+        logger.critical(f"Failed to create SQLAlchemy {name} engine: {e}")
+        raise DatabaseError(f"Failed to initialize database connection: {e}")
+
+# Request handlers and background work (bulk jobs, the scoring threads' ATS cache) use separate pools,
+# so a long bulk import can never take the connections web requests need.
+engine = _create_engine("api", config.DB_POOL_SIZE, config.DB_MAX_OVERFLOW)
+background_engine = _create_engine("background", config.DB_BACKGROUND_POOL_SIZE, config.DB_BACKGROUND_MAX_OVERFLOW)
+pool_metrics = {"api": PoolMetrics("api", engine), "background": PoolMetrics("background", background_engine)}
+
+# Optional read replica for read-only API requests (dashboards, lists, counts, search).
+replica_engine = None
+if config.DATABASE_REPLICA_URL:
+    replica_engine = _create_engine("replica", config.DB_POOL_SIZE, config.DB_MAX_OVERFLOW, url=config.DATABASE_REPLICA_URL)
+    pool_metrics["replica"] = PoolMetrics("replica", replica_engine)
+
+
+class ReplicaHealth:
+    """
+    Tracks whether the replica is reachable, re-checking at most every `check_interval` seconds,
+    so read-only requests fall back to the primary while the replica is down instead of failing.
+    """
+    def __init__(self, replica, check_interval: float):
+        self.replica = replica
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._healthy = replica is not None
+        self._checked_at = 0.0
+
+    def available(self) -> bool:
+        if self.replica is None:
+            return False
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return self._healthy
+            self._checked_at = time.monotonic()
+            try:
+                with self.replica.connect() as connection:
+                    connection.exec_driver_sql("SELECT 1")
+                healthy = True
+            except Exception as e:
+                healthy = False
+                if self._healthy:
+                    logger.warning(f"Read replica is unreachable, routing reads to the primary: {e}")
+            if healthy and not self._healthy:
+                logger.info("Read replica is reachable again; routing read-only requests to it.")
+            self._healthy = healthy
+            return healthy
+
+    def status(self) -> dict:
+        with self._lock:
+            return {"configured": self.replica is not None, "healthy": self._healthy}
+
+
+replica_health = ReplicaHealth(replica_engine, config.DB_REPLICA_HEALTH_CHECK_SECONDS)
+
+
+class ReplicaRoutingSession(Session):
+    """
+    Session for read-only requests: queries go to the replica while it is healthy. As soon as the session
+    writes (a flush, an INSERT/UPDATE/DELETE statement or SELECT ... FOR UPDATE) it pins itself to the primary
+    for the rest of its life, so the request reads its own writes.
+    """
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not self.info.get("pinned_to_primary"):
+            writes = self._flushing or isinstance(clause, UpdateBase) or (
+                isinstance(clause, Select) and clause._for_update_arg is not None
+            )
+            if writes:
+                self.info["pinned_to_primary"] = True
+            elif replica_health.available():
+                return replica_engine
+        return engine
+
 
 # Create a SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+BackgroundSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=background_engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, class_=ReplicaRoutingSession) if replica_engine is not None else SessionLocal
 
 # Create a Base class for declarative models
 Base = declarative_base()
@@ -41,10 +192,98 @@ def get_db():
     finally:
         db.close()
 
+def _column_ddl(column, dialect) -> str:
+    """The column definition for ALTER TABLE ... ADD COLUMN, with the model's scalar default so existing rows get it."""
+    ddl = f"{dialect.identifier_preparer.quote(column.name)} {column.type.compile(dialect=dialect)}"
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if default is not None:
+        ddl += f" DEFAULT {literal(default, column.type).compile(dialect=dialect, compile_kwargs={'literal_binds': True})}"
+    return ddl
+
+
+def _sqlite_index_names(bind) -> set:
+    """SQLite reflection skips expression indexes such as lower(email), so their names are read from sqlite_master."""
+    query = text("SELECT name FROM sqlite_master WHERE type = 'index'")
+    if isinstance(bind, Connection):
+        return set(bind.execute(query).scalars())
+    with bind.connect() as connection:
+        return set(connection.execute(query).scalars())
+
+
+def missing_indexes(bind) -> list:
+    """Indexes declared in model.models that the live schema lacks (create_all does not add them to existing tables)."""
+    inspector = inspect(bind)
+    sqlite_names = _sqlite_index_names(bind) if bind.dialect.name == "sqlite" else set()
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)} | sqlite_names
+        for index in table.indexes:
+            dialect_filter = getattr(index, "_ddl_if", None)
+            if dialect_filter is not None and dialect_filter.dialect and bind.dialect.name != dialect_filter.dialect:
+                continue
+            if index.name not in existing:
+                missing.append(index)
+    return missing
+
+
+def upgrade_schema(bind) -> list[str]:
+    """
+    Brings an existing database up to the models. create_all only creates missing tables, so columns added
+    to a table that already exists (e.g. candidates.resume_sha256) are added here with ALTER TABLE, and
+    indexes declared since the table was created are added after them. Safe to run on every start: columns
+    and indexes that are already present are left alone.
+    :return: The "table.column" names and index names that were added.
+    """
+    inspector = inspect(bind)
+    added = []
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            new_columns = [column for column in table.columns if column.name not in existing and not column.primary_key]
+            for column in new_columns:
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {connection.dialect.identifier_preparer.quote(table.name)} ADD COLUMN {_column_ddl(column, connection.dialect)}"
+                )
+                added.append(f"{table.name}.{column.name}")
+        for index in missing_indexes(connection):
+            index.create(bind=connection, checkfirst=True)
+            added.append(index.name)
+        if connection.dialect.name == "sqlite":
+            _truncate_second_precision_datetimes(connection)
+    for name in added:
+        logger.warning(f"Schema upgrade: added {'column' if '.' in name else 'index'} {name}.")
+    return added
+
+
+def _truncate_second_precision_datetimes(connection):
+    """
+    SQLite keeps datetimes as text. Columns stored at second precision (model.models.SortableDateTime) are
+    compared as strings by keyset cursors, so values written with microseconds before the column switched
+    format ('... 10:00:00.123456') are cut back to 'YYYY-MM-DD HH:MM:SS' to compare equal to the cursor.
+    """
+    probe = datetime(2000, 1, 1, 0, 0, 0, 1)
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            impl = column.type.dialect_impl(connection.dialect)
+            process = impl.bind_processor(connection.dialect) if isinstance(impl, DateTime) else None
+            if not process or "." in process(probe):
+                continue
+            fixed = connection.execute(
+                update(table).where(func.length(column) > 19).values({column.name: func.substr(column, 1, 19)})
+            ).rowcount
+            if fixed:
+                logger.warning(f"Schema upgrade: truncated {fixed} {table.name}.{column.name} values to second precision.")
+
+
 def init_db():
-    """Initializes the database by creating all tables."""
+    """Initializes the database by creating all tables and adding columns and indexes that existing tables are missing."""
     try:
         Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
         logger.info("Database tables created/checked successfully.")
     except Exception as e:
         logger.critical(f"Failed to initialize database tables: {e}")
@@ -85,8 +85,8 @@ export function MessagesPage({ apiFetch, showToast, messageTemplates, statusConf
 
     const candidatesInGroup = groupedByStatus[activeStatus] || [];
     const sampleCandidate = allCandidates.find(c => selectedIds.has(c.id)) || candidatesInGroup[0] || { name: 'John Doe', job_title: 'Sample Role' };
-    const personalizedSubject = (subject || '').replace(/{candidate_name}/g, sampleCandidate.name).replace(/{job_title}/g, sampleCandidate.job_title);
-    const personalizedBody = (message || '').replace(/{candidate_name}/g, sampleCandidate.name).replace(/{job_title}/g, sampleCandidate.job_title);
+    const personalizedSubject = (subject || '').replace(/{candidate_name}/g, sampleCandidate.name).replace(/{job_title}/g, sampleCandidate.job_title).replace(/{{/g, '{').replace(/}}/g, '}');
+    const personalizedBody = (message || '').replace(/{candidate_name}/g, sampleCandidate.name).replace(/{job_title}/g, sampleCandidate.job_title).replace(/{{/g, '{').replace(/}}/g, '}');
 
 
     return (
@@ -138,7 +138,7 @@ export function MessagesPage({ apiFetch, showToast, messageTemplates, statusConf
                             </select>
                         </div>
                         {activeChannel === 'email' && <div><label className="text-sm font-medium text-slate-600 mb-1 block">Subject</label><input type="text" value={subject} onChange={e => setSubject(e.target.value)} className="w-full px-3 py-2 border border-slate-300 rounded-md focus:ring-2 focus:ring-primary-light focus:border-primary outline-none" /></div>}
-                        <div><label className="text-sm font-medium text-slate-600 mb-1 block">Message</label><textarea value={message} onChange={e => setMessage(e.target.value)} rows="8" className="w-full px-3 py-2 border border-slate-300 rounded-md focus:ring-2 focus:ring-primary-light focus:border-primary outline-none"></textarea><p className="text-xs text-slate-500 mt-1">Placeholders: {`{candidate_name}`}, {`{job_title}`}</p></div>
+                        <div><label className="text-sm font-medium text-slate-600 mb-1 block">Message</label><textarea value={message} onChange={e => setMessage(e.target.value)} rows="8" className="w-full px-3 py-2 border border-slate-300 rounded-md focus:ring-2 focus:ring-primary-light focus:border-primary outline-none"></textarea><p className="text-xs text-slate-500 mt-1">Placeholders: {`{candidate_name}`}, {`{job_title}`}. Write {`{{`} and {`}}`} for literal braces.</p></div>
                     </div>
                     <div className="p-4 border-t border-slate-200 flex justify-between items-center"><span className="text-sm font-medium text-slate-500">{selectedIds.size} candidate(s) selected</span><Button type="submit">Send Message</Button></div>
                 </form>
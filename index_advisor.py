@@ -0,0 +1,164 @@
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, or_, select
+
+from database.database import engine, get_db, init_db, missing_indexes
+from model.models import Candidate, JobDescription, StatusHistory, Interview, PipelineCounter
+from model.status_constants import StatusConstants
+from logger.logger import logger
+
+SEED_STATUSES = [
+    StatusConstants.ATS_SHORTLISTED_DESCR, StatusConstants.ATS_DISCARDED_DESCR,
+    StatusConstants.L1_INTERVIEW_SCHEDULED_DESCR, StatusConstants.L1_SELECTED_DESCR, StatusConstants.L1_REJECTED_DESCR,
+]
+
+
+def query_patterns(sample: dict) -> dict:
+    """
+    The hot queries issued by HiringService and the API, keyed by a short name.
+    Keep these in step with src/hiring_service.py when its filters or sort orders change.
+    """
+    newest_first = (Candidate.updated_at.desc(), Candidate.id.desc())
+    return {
+        "candidate list": select(Candidate.id).order_by(*newest_first).limit(21),
+        "candidate list by status": select(Candidate.id).filter(Candidate.current_status.in_([sample["status"]])).order_by(*newest_first).limit(21),
+        "candidate list by job": select(Candidate.id).filter(Candidate.job_description_id == sample["job_id"]).order_by(*newest_first).limit(21),
+        "candidate list next page (cursor)": select(Candidate.id).filter(or_(
+            Candidate.updated_at < sample["updated_at"],
+            (Candidate.updated_at == sample["updated_at"]) & (Candidate.id < sample["candidate_id"]),
+        )).order_by(*newest_first).limit(21),
+        "job pipeline counts": select(PipelineCounter.status, PipelineCounter.count).filter(PipelineCounter.job_description_id == sample["job_id"]),
+        "duplicate check (single)": select(Candidate.id).filter(
+            func.lower(Candidate.email) == sample["email"], Candidate.job_description_id == sample["job_id"]
+        ).limit(1),
+        "duplicate check (bulk chunk)": select(func.lower(Candidate.email), Candidate.job_description_id).filter(
+            func.lower(Candidate.email).in_([sample["email"], "nobody@example.com"])
+        ),
+        "resume re-upload check": select(Candidate.resume_sha256, Candidate.job_description_id).filter(
+            Candidate.resume_sha256.in_([sample["sha"]])
+        ),
+        "candidate status history": select(StatusHistory.id).filter(StatusHistory.candidate_id == sample["candidate_id"]).order_by(StatusHistory.changed_at),
+        "reschedule history lookup": select(StatusHistory.id).filter(
+            StatusHistory.candidate_id == sample["candidate_id"], StatusHistory.status_description == sample["status"]
+        ).order_by(StatusHistory.changed_at.desc()).limit(1),
+        "candidate interviews": select(Interview.id).filter(Interview.candidate_id == sample["candidate_id"]).order_by(Interview.round_number),
+        "job list": select(JobDescription.id).order_by(JobDescription.created_at.desc()),
+        "candidates of deleted jobs": select(Candidate.id).filter(Candidate.job_description_id.in_([sample["job_id"]])),
+    }
+
+
+def seed(db, candidates: int):
+    """Inserts synthetic jobs, candidates, history and interviews into the current (uncommitted) transaction."""
+    now = datetime.now().replace(microsecond=0)
+    job_count = max(1, candidates // 500)
+    first_job = (db.query(func.max(JobDescription.id)).scalar() or 0) + 1
+    db.execute(insert(JobDescription), [{
+        "id": first_job + i, "title": f"Seed job {i}", "description_text": "seed", "created_at": now - timedelta(days=i)
+    } for i in range(job_count)])
+
+    first_candidate = (db.query(func.max(Candidate.id)).scalar() or 0) + 1
+    for start in range(0, candidates, 5000):
+        batch = range(first_candidate + start, first_candidate + min(start + 5000, candidates))
+        db.execute(insert(Candidate), [{
+            "id": cid, "first_name": "Seed", "last_name": str(cid), "email": f"seed{cid}@example.com",
+            "resume_sha256": f"{cid:064x}", "job_description_id": first_job + cid % job_count,
+            "current_status": random.choice(SEED_STATUSES), "updated_at": now - timedelta(minutes=cid),
+        } for cid in batch])
+        db.execute(insert(StatusHistory), [{
+            "candidate_id": cid, "status_code": 0, "status_description": status, "changed_at": now - timedelta(minutes=cid)
+        } for cid in batch for status in SEED_STATUSES[:2]])
+        db.execute(insert(Interview), [{"candidate_id": cid, "round_number": 1} for cid in batch if cid % 5 == 0])
+    db.flush()
+    print(f"Seeded {candidates} candidates across {job_count} jobs (rolled back when the run ends).")
+
+
+def explain(connection, statement) -> list[str]:
+    """Returns the database's plan for a statement, one line per plan row."""
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    if connection.dialect.name == "sqlite":
+        return [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)]
+    rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", params).mappings().all()
+    return [f"table={row.get('table')} type={row.get('type')} key={row.get('key')} rows={row.get('rows')} extra={row.get('Extra')}" for row in rows]
+
+
+def problems(plan: list[str]) -> list[str]:
+    """Flags full table scans and sorts that an index could avoid."""
+    found = []
+    for line in plan:
+        upper = line.upper()
+        if (upper.startswith("SCAN ") and " USING " not in upper) or " TYPE=ALL " in f" {upper} ":
+            found.append(f"full scan: {line}")
+        elif "TEMP B-TREE FOR ORDER BY" in upper or "USING FILESORT" in upper:
+            found.append(f"sort without an index: {line}")
+    return found
+
+
+def run_advisor(seed_candidates: int, create_missing: bool) -> int:
+    """
+    A command-line tool that runs EXPLAIN on each hot HiringService query and flags full scans and
+    index-less sorts. Optionally seeds a synthetic dataset first (inside a transaction that is rolled back)
+    and creates indexes declared in model.models but missing from an existing database.
+    :return: The number of flagged queries (the exit code).
+    """
+    print("--- Index Advisor ---")
+
+    init_db()
+    missing = missing_indexes(engine)
+    for index in missing:
+        if create_missing:
+            index.create(bind=engine)
+            print(f"Created missing index {index.name} on {index.table.name}.")
+        else:
+            print(f"⚠️  Declared index {index.name} on {index.table.name} is missing; rerun with --create-missing to add it.")
+
+    db_session = next(get_db())
+    flagged = total = 0
+    try:
+        if seed_candidates:
+            seed(db_session, seed_candidates)
+        sample_row = db_session.query(Candidate.id, Candidate.email, Candidate.job_description_id, Candidate.resume_sha256,
+                                      Candidate.current_status, Candidate.updated_at).order_by(Candidate.id.desc()).first()
+        sample = {
+            "candidate_id": sample_row.id if sample_row else 1,
+            "email": (sample_row.email if sample_row else "someone@example.com").lower(),
+            "job_id": (sample_row.job_description_id if sample_row else None) or 1,
+            "sha": (sample_row.resume_sha256 if sample_row else None) or "0" * 64,
+            "status": (sample_row.current_status if sample_row else None) or StatusConstants.ATS_SHORTLISTED_DESCR,
+            "updated_at": (sample_row.updated_at if sample_row else None) or datetime.now().replace(microsecond=0),
+        }
+
+        connection = db_session.connection()
+        print(f"Dialect: {connection.dialect.name}\n")
+        for name, statement in query_patterns(sample).items():
+            total += 1
+            plan = explain(connection, statement)
+            issues = problems(plan)
+            flagged += bool(issues)
+            print(f"{'❌' if issues else '✅'} {name}")
+            for line in (issues or plan):
+                print(f"     {line}")
+    except Exception as e:
+        logger.error(f"Index advisor failed: {e}")
+        print(f"\n❌ An error occurred: {e}")
+        flagged = max(flagged, 1)
+    finally:
+        db_session.rollback()
+        db_session.close()
+
+    print(f"\n{flagged} of {total} queries flagged.")
+    return flagged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN the hot HiringService queries and flag full scans.")
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many synthetic candidates first; they are rolled back afterwards.")
+    parser.add_argument("--create-missing", action="store_true", help="Create indexes declared in the models but missing from the database.")
+    args = parser.parse_args()
+
+    sys.exit(1 if run_advisor(args.seed, args.create_missing) else 0)
@@ -1,7 +1,8 @@
 # =============================================================================
 # HR-HIRE-AGENT/model/models.py
 # =============================================================================
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Boolean, Index
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database.database import Base
@@ -10,6 +11,12 @@ from werkzeug.security import generate_password_hash, check_password_hash
 # --- Import StatusConstants for initial values/defaults ---
 from model.status_constants import StatusConstants
 
+# SQLite stores func.now() as 'YYYY-MM-DD HH:MM:SS'. Binding parameters in the same text format keeps
+# range comparisons on these columns (keyset pagination cursors) consistent with the stored values.
+SortableDateTime = DateTime().with_variant(
+    SQLITE_DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"), "sqlite"
+)
+
 class JobDescription(Base):
     __tablename__ = 'job_descriptions'
 
@@ -21,7 +28,7 @@ class JobDescription(Base):
     required_skills = Column(Text) # JSON string or comma-separated for easier search
     # min_experience_years = Column(Integer, default=0)
     min_experience_years = Column(String(50), default='0')
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=func.now(), index=True) # Job list order
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
      # relationship (one-to-many)
     candidates = relationship("Candidate", back_populates="job_description")
@@ -39,6 +46,7 @@ class Candidate(Base):
     phone_number = Column(String(50)) # For WhatsApp
     resume_path = Column(String(500)) # Path to uploaded resume file
     resume_text = Column(Text) # Extracted text from resume
+    resume_sha256 = Column(String(64), index=True) # SHA-256 of the uploaded resume file, used to skip re-uploads
     job_description_id = Column(Integer, ForeignKey('job_descriptions.id'))
     current_status = Column(String(100), default=StatusConstants.CANDIDATE_ENTERED_BY_SYSTEM_DESCR) # <-- Updated default status
     ats_score = Column(Float, default=0.0) # ATS score from Gemini
@@ -47,7 +55,7 @@ class Candidate(Base):
     ai_analysis = Column(Text)
     is_onboarded = Column(Boolean, default=False)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at = Column(SortableDateTime, default=func.now(), onupdate=func.now())
 
     # Relationships
     job_description = relationship("JobDescription", back_populates="candidates")
@@ -56,6 +64,15 @@ class Candidate(Base):
     verifications = relationship("Verification", back_populates="candidate")
     status_history = relationship("StatusHistory", back_populates="candidate", order_by="StatusHistory.changed_at") # <-- NEW relationship
 
+    __table_args__ = (
+        Index('ix_candidates_updated_at_id', 'updated_at', 'id'), # Keyset pagination order for the candidate list
+        # Candidate list filtered by status or by job, still in (updated_at, id) order without a sort
+        Index('ix_candidates_status_updated_at_id', 'current_status', 'updated_at', 'id'),
+        Index('ix_candidates_job_updated_at_id', 'job_description_id', 'updated_at', 'id'),
+        # Case-insensitive duplicate check on (lower(email), job); a plain index on email cannot serve lower(email)
+        Index('ix_candidates_lower_email_job', func.lower(email), job_description_id),
+    )
+
     def __repr__(self):
         return f"<Candidate(id={self.id}, name='{self.first_name} {self.last_name}', status='{self.current_status}')>"
 
@@ -75,6 +92,10 @@ class Interview(Base):
 
     candidate = relationship("Candidate", back_populates="interviews")
 
+    __table_args__ = (
+        Index('ix_interviews_candidate_round', 'candidate_id', 'round_number'), # A candidate's interviews, in round order
+    )
+
     def __repr__(self):
         return f"<Interview(id={self.id}, candidate_id={self.candidate_id}, round={self.round_number}, status='{self.status}')>"
 
@@ -82,7 +103,7 @@ class HRDiscussion(Base):
     __tablename__ = 'hr_discussions'
 
     id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey('candidates.id'))
+    candidate_id = Column(Integer, ForeignKey('candidates.id'), index=True)
     discussion_date = Column(DateTime)
     notes = Column(Text)
     documents_collected = Column(Text) # JSON string or comma-separated list of document names
@@ -99,7 +120,7 @@ class Verification(Base):
     __tablename__ = 'verifications'
 
     id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey('candidates.id'))
+    candidate_id = Column(Integer, ForeignKey('candidates.id'), index=True)
     type = Column(String(100)) # e.g., "Background Check", "Credential Check"
     status = Column(String(50), default="Pending") # Could use status constants here too
     details = Column(Text)
@@ -127,6 +148,10 @@ class StatusHistory(Base):
 
     candidate = relationship("Candidate", back_populates="status_history") # <-- NEW relationship
 
+    __table_args__ = (
+        Index('ix_status_history_candidate_changed_at', 'candidate_id', 'changed_at'), # A candidate's history, in order
+    )
+
     def __repr__(self):
         return f"<StatusHistory(id={self.id}, candidate_id={self.candidate_id}, status_code={self.status_code}, changed_at={self.changed_at})>"
     
@@ -154,4 +179,169 @@ class User(Base):
         return check_password_hash(self.password_hash, password)
 
     def __repr__(self):
-        return f"<User(id={self.id}, email='{self.email}')>"
\ No newline at end of file
+        return f"<User(id={self.id}, email='{self.email}')>"
+
+
+class ATSResultCache(Base):
+    __tablename__ = 'ats_result_cache'
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, index=True, nullable=False) # SHA-256 of normalized resume + JD + experience + prompt version
+    result_json = Column(Text, nullable=False) # Raw ATS JSON returned by the LLM
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=func.now())
+    last_accessed_at = Column(DateTime, default=func.now(), index=True) # Used for LRU eviction
+
+    def __repr__(self):
+        return f"<ATSResultCache(id={self.id}, key='{self.cache_key[:12]}...', hits={self.hit_count})>"
+
+
+class BulkJob(Base):
+    __tablename__ = 'bulk_jobs'
+
+    id = Column(String(36), primary_key=True) # Task ID handed to the frontend (UUID4)
+    job_description_id = Column(Integer, ForeignKey('job_descriptions.id'))
+    job_title = Column(String(255))
+    ats_threshold = Column(Float, nullable=False)
+    changed_by = Column(String(100), default="HR System")
+    temp_dir = Column(String(500)) # Upload folder removed once the job finishes
+    is_receiving = Column(Boolean, default=False) # True while files are still being uploaded; the worker waits for more
+    status = Column(String(20), default="pending", index=True) # pending, processing, completed, failed, cancelled
+    total = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    shortlisted = Column(Integer, default=0)
+    rejected = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    duplicate = Column(Integer, default=0)
+    deferred = Column(Integer, default=0) # Parked by the pre-screen; run later with /deferred/run
+    priority = Column(Integer, default=0) # Higher is claimed first; deferred re-runs are queued below normal jobs
+    skip_prescreen = Column(Boolean, default=False) # Set when deferred items are re-run, so they go straight to the LLM
+    error = Column(Text)
+    worker_id = Column(String(100)) # Worker process currently holding the job
+    heartbeat_at = Column(DateTime) # Refreshed while a worker holds the job; stale jobs are reclaimed
+    created_at = Column(DateTime, default=func.now())
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    items = relationship("BulkJobItem", back_populates="job", order_by="BulkJobItem.id")
+
+    def __repr__(self):
+        return f"<BulkJob(id={self.id}, status='{self.status}', processed={self.processed}/{self.total})>"
+
+class BulkJobItem(Base):
+    __tablename__ = 'bulk_job_items'
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(36), ForeignKey('bulk_jobs.id'), index=True, nullable=False)
+    file_path = Column(String(500), nullable=False)
+    status = Column(String(20), default="pending", index=True) # pending, shortlisted, rejected, failed, duplicate, deferred
+    error = Column(Text)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    job = relationship("BulkJob", back_populates="items")
+
+    def __repr__(self):
+        return f"<BulkJobItem(id={self.id}, job_id={self.job_id}, status='{self.status}')>"
+
+
+class PipelineCounter(Base):
+    __tablename__ = 'pipeline_counters'
+
+    job_description_id = Column(Integer, ForeignKey('job_descriptions.id'), primary_key=True)
+    status = Column(String(100), primary_key=True) # Candidate.current_status value
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<PipelineCounter(job_id={self.job_description_id}, status='{self.status}', count={self.count})>"
+
+class CandidateSearchDocument(Base):
+    __tablename__ = 'candidate_search_documents'
+
+    candidate_id = Column(Integer, ForeignKey('candidates.id'), primary_key=True)
+    job_description_id = Column(Integer, index=True)
+    full_name = Column(String(255))
+    email = Column(String(255))
+    job_title = Column(String(255))
+    skills = Column(Text) # ai_analysis.matched_skills, space separated
+    resume_text = Column(Text)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    # MySQL serves searches from these FULLTEXT indexes; SQLite uses the FTS5 table created by CandidateSearchIndex.
+    __table_args__ = (
+        Index('ft_candidate_search_all', 'full_name', 'email', 'job_title', 'skills', 'resume_text', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+        Index('ft_candidate_search_skills', 'skills', 'resume_text', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
+
+    def __repr__(self):
+        return f"<CandidateSearchDocument(candidate_id={self.candidate_id}, full_name='{self.full_name}')>"
+
+class CandidateTermVector(Base):
+    __tablename__ = 'candidate_term_vectors'
+
+    candidate_id = Column(Integer, ForeignKey('candidates.id'), primary_key=True)
+    job_description_id = Column(Integer, index=True) # The job the candidate applied to
+    terms = Column(Text) # JSON {term: weighted frequency}, from resume_text and ai_analysis.matched_skills
+    length = Column(Float, default=0.0) # Sum of the weighted frequencies, the BM25 document length
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CandidateTermVector(candidate_id={self.candidate_id}, length={self.length})>"
+
+class PrescreenOutcome(Base):
+    __tablename__ = 'prescreen_outcomes'
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_description_id = Column(Integer, ForeignKey('job_descriptions.id'), index=True)
+    file_name = Column(String(255))
+    prescreen_score = Column(Float, nullable=False) # Local lexical/experience score, 0-100
+    decision = Column(String(20), nullable=False) # passed, rejected or deferred by the pre-screen; observed in shadow mode
+    ats_score = Column(Float) # LLM score, when the resume was also sent to the LLM
+    ats_threshold = Column(Float) # Shortlist threshold in effect for that run
+    created_at = Column(DateTime, default=func.now())
+
+    def __repr__(self):
+        return f"<PrescreenOutcome(id={self.id}, prescreen_score={self.prescreen_score}, ats_score={self.ats_score}, decision='{self.decision}')>"
+
+class NotificationOutbox(Base):
+    __tablename__ = 'notification_outbox'
+
+    id = Column(Integer, primary_key=True, index=True)
+    channel = Column(String(20), nullable=False, default="email")
+    kind = Column(String(50)) # e.g. status_update, shortlist_alert; for filtering and stats
+    candidate_id = Column(Integer, ForeignKey('candidates.id'), index=True)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(500))
+    body = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False, default="pending") # pending, sending, sent, dead
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False) # UTC; failed messages are retried with backoff
+    last_error = Column(Text)
+    locked_by = Column(String(100)) # Delivery worker holding the message while status is 'sending'
+    locked_at = Column(DateTime) # UTC; 'sending' rows whose lease expired are claimed again
+    created_at = Column(DateTime, default=func.now()) # UTC, set on enqueue
+    sent_at = Column(DateTime) # UTC
+
+    __table_args__ = (
+        Index('ix_notification_outbox_status_next_attempt', 'status', 'next_attempt_at'), # The delivery worker's claim query
+    )
+
+    def __repr__(self):
+        return f"<NotificationOutbox(id={self.id}, kind='{self.kind}', status='{self.status}', attempts={self.attempts})>"
+
+class ShortlistDigestEntry(Base):
+    __tablename__ = 'shortlist_digest_entries'
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(String(36), nullable=False) # The bulk job whose digest this candidate goes into
+    job_description_id = Column(Integer, ForeignKey('job_descriptions.id'), nullable=False)
+    candidate_id = Column(Integer, ForeignKey('candidates.id'), nullable=False, index=True)
+    digest_id = Column(String(36)) # Set when a digest claims the entry; claimed entries are deleted with the same commit
+    created_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        Index('ix_shortlist_digest_entries_task_digest', 'task_id', 'digest_id'), # Pending entries of a task
+    )
+
+    def __repr__(self):
+        return f"<ShortlistDigestEntry(id={self.id}, task_id='{self.task_id}', candidate_id={self.candidate_id})>"
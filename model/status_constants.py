@@ -195,6 +195,33 @@ class StatusConstants:
             "detail_page_config": detail_page_config
         }
 
+    @classmethod
+    def get_dashboard_groups(cls):
+        """
+        Status groups behind the dashboard KPI cards and the candidate distribution chart.
+        Every dashboard count is a sum over one of these groups, so they can all be derived
+        from a single GROUP BY on current_status.
+        """
+        return {
+            "kpis": {
+                "candidates_interviewing": [cls.L1_INTERVIEW_SCHEDULED_DESCR, cls.L2_INTERVIEW_SCHEDULED_DESCR, cls.HR_SCHEDULED_DESCR],
+                "offers_extended": [cls.OFFER_LETTER_ISSUED_DESCR, cls.OFFER_ACCEPTED_DESCR],
+            },
+            "distribution": {
+                "ATS Shortlisted": [cls.ATS_SHORTLISTED_DESCR],
+                "Interviewing": [
+                    cls.L1_INTERVIEW_SCHEDULED_DESCR, cls.L2_INTERVIEW_SCHEDULED_DESCR, cls.HR_SCHEDULED_DESCR,
+                    cls.L1_SELECTED_DESCR, cls.L2_SELECTED_DESCR, cls.HR_ROUND_SELECTED_DESCR
+                ],
+                "Offers": [cls.OFFER_LETTER_ISSUED_DESCR, cls.OFFER_ACCEPTED_DESCR],
+                "Joined": [cls.CANDIDATE_JOINED_DESCR],
+                "Rejected": [
+                    cls.ATS_DISCARDED_DESCR, cls.L1_REJECTED_DESCR, cls.L2_REJECTED_DESCR,
+                    cls.HR_ROUND_REJECTED_DESCR, cls.OFFER_REJECTED_DESCR, cls.CANDIDATE_NOT_JOINED_DESCR
+                ],
+            },
+        }
+
     @classmethod
     def get_description(cls, code: int) -> str:
         for attr, value in cls.__dict__.items():
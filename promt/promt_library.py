@@ -5,6 +5,10 @@
 import json
 
 class Prompts:
+    # Bump this whenever ats_scoring_prompt changes so cached ATS results from older prompts are not reused.
+    ATS_SCORING_PROMPT_VERSION = "2"
+    ATS_BATCH_SCORING_PROMPT_VERSION = "batch-1"
+
     # Replace the ats_scoring_prompt function with this new version.
 
     # @staticmethod
@@ -104,6 +108,75 @@ class Prompts:
 
         Return ONLY the raw JSON object.
         """
+
+    @staticmethod
+    def ats_batch_scoring_prompt(resumes: list[tuple[str, str]], jd_text: str, experience_requirement: str) -> str:
+        """
+        Generates one prompt that scores several resumes against the same job description,
+        so the JD is only sent once per batch.
+        :param resumes: A list of (resume_id, resume_text) tuples.
+        """
+        exp_req_section = f"**Overall Experience Requirement:**\n---\n{experience_requirement} years\n---\n\n" if experience_requirement and experience_requirement != '0' else ""
+        resume_sections = "\n\n".join(
+            f"**Resume ID: {resume_id}**\n---\n{resume_text}\n---" for resume_id, resume_text in resumes
+        )
+
+        return f"""
+        Analyze EACH of the provided resumes independently against all the job requirements below. Return a JSON array. Do not include any text or markdown formatting outside the JSON array.
+
+        {exp_req_section}**Detailed Job Description:**
+        ---
+        {jd_text}
+        ---
+
+        **Resumes ({len(resumes)} total):**
+
+        {resume_sections}
+
+        **Task:**
+        For EVERY resume above, evaluate it on its own merits and calculate an ATS score that reflects how well that candidate matches the job description. Never mix information between resumes.
+
+        **Scoring Guidelines:**
+        - **Experience (30%)**: 
+        - If the candidate's total relevant experience is below the required experience, reduce the score proportionally.
+            Example: if 4 years are required and the candidate has 3 years, deduct 25% of the experience component.
+        - Experience equal to or greater than required should not be penalized.
+        - **Skills Match (30%)**: 
+        - Compare the candidate's skills with the skills required in the job description.
+        - Give higher weight to skills mentioned explicitly in both resume and JD.
+        - **Projects Related to JD Skills (20%)**: 
+        - Check if the resume lists any projects that directly use or demonstrate the required skills.
+        - Award higher points if multiple projects are relevant or recent.
+        - **Certifications Related to JD Skills (10%)**:
+        - Give higher weight if the candidate has completed certifications directly related to the job skills (e.g., AWS cert for a cloud engineer role).
+        - **Education & Other Factors (10%)**:
+        - Consider relevance of educational background or degree to the job field.
+
+        **Scoring Rule:**
+        - Final ATS score = weighted combination of all the above criteria.
+        - The score should be between 0 and 100 (float).
+        - The summary should clearly mention strong or weak areas (e.g., good projects but lacks certifications or experience).
+
+        **Response Format:**
+        A JSON array with exactly one object per resume, in any order:
+        [
+            {{
+                "resume_id": "Copy the Resume ID exactly as given above.",
+                "candidate_name": "Extract the candidate's full name from the resume text.",
+                "email": "Extract the candidate's primary email address.",
+                "phone_number": "Extract the candidate's primary phone number.",
+                "overall_ats_score": "Calculate a final ATS score from 0-100 based on the above criteria.",
+                "summary_reason": "Provide a concise 2-3 sentence summary explaining WHY the candidate is a good or poor fit, referencing experience, skills, projects, and certifications.",
+                "matched_skills": ["List up to 10 of the most relevant skills from the resume that match the job description."],
+                "relevant_projects": ["List up to 5 projects that are directly related to the required JD skills."],
+                "relevant_certifications": ["List any professional certifications found in the resume. If none, return an empty list []."],
+                "education_summary": "Briefly summarize the candidate's highest and most relevant education (e.g., 'B.Tech in Computer Science').",
+                "years_of_experience": "Estimate the total years of relevant work experience as a float or integer."
+            }}
+        ]
+
+        Return ONLY the raw JSON array.
+        """
     # --- Other prompts are preserved as they were ---
 
     @staticmethod
@@ -0,0 +1,27 @@
+from database.database import get_db, init_db
+from src.pipeline_counters import pipeline_counters
+from logger.logger import logger
+
+def rebuild_counters():
+    """
+    A command-line script to recompute the pipeline_counters table from the candidates table.
+    Run it after importing candidates outside the application, or if job/tab counts look wrong.
+    """
+    print("--- Rebuild Pipeline Counters ---")
+
+    init_db()
+    db_session = next(get_db())
+
+    try:
+        rows = pipeline_counters.rebuild(db_session)
+        print(f"\n✅ Rebuilt {rows} (job, status) counters.")
+        print("Running application processes refresh their dashboard snapshot within its TTL.")
+    except Exception as e:
+        db_session.rollback()
+        logger.error(f"Failed to rebuild pipeline counters: {e}")
+        print(f"\n❌ An error occurred: {e}")
+    finally:
+        db_session.close()
+
+if __name__ == "__main__":
+    rebuild_counters()
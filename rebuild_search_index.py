@@ -0,0 +1,31 @@
+from database.database import get_db, init_db
+from src.candidate_search import candidate_search_index
+from src.skill_matcher import skill_matcher
+from logger.logger import logger
+
+def rebuild_index():
+    """
+    A command-line script to rebuild the candidate full-text search index and the skill-matching term vectors
+    from the candidates table. Run it after importing candidates outside the application, or if searches and
+    job matches miss candidates they should find.
+    """
+    print("--- Rebuild Candidate Search Index ---")
+
+    init_db()
+    db_session = next(get_db())
+
+    try:
+        candidate_search_index.ensure_initialized(db_session)
+        documents = candidate_search_index.rebuild(db_session)
+        print(f"\n✅ Indexed {documents} candidates ({candidate_search_index.backend(db_session)} backend).")
+        vectors = skill_matcher.rebuild(db_session)
+        print(f"✅ Computed term vectors for {vectors} candidates.")
+    except Exception as e:
+        db_session.rollback()
+        logger.error(f"Failed to rebuild the candidate search index: {e}")
+        print(f"\n❌ An error occurred: {e}")
+    finally:
+        db_session.close()
+
+if __name__ == "__main__":
+    rebuild_index()
@@ -0,0 +1,89 @@
+import argparse
+import socketserver
+import threading
+from email import message_from_bytes
+
+received_count = 0
+received_lock = threading.Lock()
+
+
+class DebugSMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP (no TLS, no auth) to accept messages and print their headers."""
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        global received_count
+        self.reply("220 hr-hire-agent debug SMTP ready")
+        messages_on_connection = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.wfile.write(b"250-hr-hire-agent\r\n250-8BITMIME\r\n250 SMTPUTF8\r\n")
+            elif verb == "HELO":
+                self.reply("250 hr-hire-agent")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                msg = message_from_bytes(b"".join(lines))
+                with received_lock:
+                    received_count += 1
+                    count = received_count
+                if not self.server.quiet:
+                    print(f"[{count}] To: {msg['To']} | Subject: {msg['Subject']}")
+                self.reply("250 OK: queued")
+                messages_on_connection += 1
+                if self.server.drop_after and messages_on_connection >= self.server.drop_after:
+                    return  # Simulates a server that closes sessions, to exercise the sender's reconnects
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class DebugSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, quiet: bool = False, drop_after: int = 0):
+        super().__init__(address, DebugSMTPHandler)
+        self.quiet = quiet
+        self.drop_after = drop_after
+
+
+def run_server(host: str, port: int, quiet: bool, drop_after: int):
+    """
+    A local SMTP sink for development and tests: accepts every message and prints its recipient and subject
+    instead of delivering it. Point the app at it with SMTP_SERVER=localhost, SMTP_PORT=<port>,
+    SMTP_USE_TLS=false and an empty SMTP_PASSWORD.
+    """
+    with DebugSMTPServer((host, port), quiet=quiet, drop_after=drop_after) as server:
+        print(f"--- Debug SMTP server listening on {host}:{port} (Ctrl+C to stop) ---")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"\nReceived {received_count} messages.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local SMTP server that prints emails instead of sending them.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--quiet", action="store_true", help="Do not print each message.")
+    parser.add_argument("--drop-after", type=int, default=0, help="Close each connection after this many messages.")
+    args = parser.parse_args()
+
+    run_server(args.host, args.port, args.quiet, args.drop_after)
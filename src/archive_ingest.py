@@ -0,0 +1,146 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/archive_ingest.py
+# =============================================================================
+import io
+import os
+import tarfile
+import threading
+import zipfile
+from collections import OrderedDict
+
+from config.config_loader import config
+from exception.custom_exception import ValidationError
+from logger.logger import logger
+
+# Resumes inside an uploaded archive are referenced as "<archive path>::<member name>" instead of being
+# extracted to disk. Members are read into memory on demand by whichever process parses them.
+ARCHIVE_MEMBER_SEPARATOR = "::"
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz')
+RESUME_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
+
+_MAX_OPEN_ARCHIVES = 2
+_open_archives = OrderedDict()  # archive path -> (handle, {member name: member}, lock); per process
+_open_archives_lock = threading.Lock()
+
+
+def is_archive_file(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def is_archive_member(file_path: str) -> bool:
+    return ARCHIVE_MEMBER_SEPARATOR in (file_path or "")
+
+
+def member_file_name(file_path: str) -> str:
+    """Returns the file name shown to users: the member's base name for archive members, else the file's."""
+    if is_archive_member(file_path):
+        return os.path.basename(file_path.split(ARCHIVE_MEMBER_SEPARATOR, 1)[1])
+    return os.path.basename(file_path)
+
+
+def _is_resume_member(name: str) -> bool:
+    base = os.path.basename(name)
+    if not base or base.startswith('.') or name.startswith('__MACOSX/'):
+        return False
+    return '.' in base and base.rsplit('.', 1)[1].lower() in RESUME_EXTENSIONS
+
+
+def list_archive_members(archive_path: str) -> list[str]:
+    """
+    Lists the resumes inside an archive without extracting anything, enforcing the configured limits.
+    Only the zip central directory or the tar headers are read.
+    :return: Member references ("<archive path>::<member name>") for every supported resume file.
+    :raises ValidationError: If the archive is unreadable or exceeds a member-count or size limit.
+    """
+    max_member_bytes = int(config.ARCHIVE_MAX_MEMBER_MB * 1024 * 1024)
+    max_total_bytes = int(config.ARCHIVE_MAX_TOTAL_MB * 1024 * 1024)
+    archive_name = os.path.basename(archive_path)
+
+    try:
+        if archive_path.lower().endswith('.zip'):
+            with zipfile.ZipFile(archive_path) as archive:
+                entries = [(info.filename, info.file_size) for info in archive.infolist() if not info.is_dir()]
+        else:
+            with tarfile.open(archive_path, 'r:*') as archive:
+                entries = [(member.name, member.size) for member in archive if member.isfile()]
+    except (zipfile.BadZipFile, tarfile.TarError, OSError, EOFError) as e:
+        raise ValidationError(f"Could not read archive {archive_name}: {e}")
+
+    members, total_bytes = [], 0
+    for name, size in entries:
+        if not _is_resume_member(name):
+            continue
+        if size > max_member_bytes:
+            logger.warning(f"Skipping {name} in {archive_name}: larger than {config.ARCHIVE_MAX_MEMBER_MB} MB.")
+            continue
+        total_bytes += size
+        members.append(f"{archive_path}{ARCHIVE_MEMBER_SEPARATOR}{name}")
+        if len(members) > config.ARCHIVE_MAX_MEMBERS:
+            raise ValidationError(f"Archive {archive_name} contains more than {config.ARCHIVE_MAX_MEMBERS} resumes.")
+        if total_bytes > max_total_bytes:
+            raise ValidationError(f"Archive {archive_name} expands to more than {config.ARCHIVE_MAX_TOTAL_MB} MB.")
+
+    logger.info(f"Archive {archive_name} contains {len(members)} resumes.")
+    return members
+
+
+def _get_open_archive(archive_path: str):
+    """
+    Returns a cached open handle for an archive. Workers read members of the same archive in order,
+    so keeping it open avoids re-reading the zip directory (or re-decompressing a tar.gz) for every member.
+    """
+    with _open_archives_lock:
+        if archive_path in _open_archives:
+            _open_archives.move_to_end(archive_path)
+            return _open_archives[archive_path]
+
+        if archive_path.lower().endswith('.zip'):
+            handle = zipfile.ZipFile(archive_path)
+            members = {info.filename: info for info in handle.infolist()}
+        else:
+            handle = tarfile.open(archive_path, 'r:*')
+            members = {member.name: member for member in handle.getmembers()}
+        _open_archives[archive_path] = (handle, members, threading.Lock())
+
+        while len(_open_archives) > _MAX_OPEN_ARCHIVES:
+            _, (old_handle, _, _) = _open_archives.popitem(last=False)
+            old_handle.close()
+        return _open_archives[archive_path]
+
+
+def release_archives(directory: str):
+    """Closes cached handles for archives inside `directory`, e.g. before a finished job's upload folder is removed."""
+    prefix = os.path.join(os.path.abspath(directory), "")
+    with _open_archives_lock:
+        for archive_path in [path for path in _open_archives if os.path.abspath(path).startswith(prefix)]:
+            handle, _, _ = _open_archives.pop(archive_path)
+            handle.close()
+
+
+def read_archive_member(file_path: str) -> bytes:
+    """
+    Reads one archive member into memory. The read is capped at the per-member limit, so an entry whose
+    header under-reports its size (a zip bomb) cannot exhaust the worker's memory.
+    :raises ValidationError: If the member is missing or larger than allowed.
+    """
+    archive_path, name = file_path.split(ARCHIVE_MEMBER_SEPARATOR, 1)
+    max_member_bytes = int(config.ARCHIVE_MAX_MEMBER_MB * 1024 * 1024)
+    handle, members, lock = _get_open_archive(archive_path)
+    member = members.get(name)
+    if member is None:
+        raise ValidationError(f"{name} was not found in {os.path.basename(archive_path)}.")
+
+    with lock:  # tarfile handles are not safe to share between threads
+        stream = handle.open(member) if isinstance(handle, zipfile.ZipFile) else handle.extractfile(member)
+        with stream:
+            content = stream.read(max_member_bytes + 1)
+    if len(content) > max_member_bytes:
+        raise ValidationError(f"{name} is larger than {config.ARCHIVE_MAX_MEMBER_MB} MB.")
+    return content
+
+
+def open_resume_source(file_path: str):
+    """Opens a resume for reading, from disk or from an in-memory archive member buffer."""
+    if is_archive_member(file_path):
+        return io.BytesIO(read_archive_member(file_path))
+    return open(file_path, 'rb')
@@ -0,0 +1,232 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/ats_cache.py
+# =============================================================================
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, func
+
+from config.config_loader import config
+from database.database import BackgroundSessionLocal
+from logger.logger import logger
+from model.models import ATSResultCache
+
+
+class ATSResultCacheStore:
+    """
+    Persistent, content-addressed cache for ATS scoring results.
+    Entries are keyed by a SHA-256 of the normalized resume text, JD text,
+    experience requirement and prompt version, expire after a TTL and are
+    evicted least-recently-used once the table grows past `max_entries`.
+    Lookups are read-only: hit counts and access times are collected in memory and written
+    in one batch once TOUCH_FLUSH_EVERY_N_ENTRIES entries were hit or every TOUCH_FLUSH_SECONDS, and before pruning.
+    """
+    PRUNE_EVERY_N_WRITES = 100
+    TOUCH_FLUSH_EVERY_N_ENTRIES = 200
+    TOUCH_FLUSH_SECONDS = 60
+
+    def __init__(self, enabled: bool, ttl_hours: float, max_entries: int):
+        self.enabled = enabled
+        self.ttl = timedelta(hours=ttl_hours)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._in_flight = {}  # cache_key -> threading.Event, so concurrent duplicates share one LLM call
+        self._writes_since_prune = 0
+        self._touches = {}  # cache_key -> [hits since the last flush, last access time]
+        self._last_touch_flush = time.monotonic()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join((text or "").split())
+
+    @classmethod
+    def build_key(cls, resume_text: str, jd_text: str, experience_requirement: str, prompt_version: str) -> str:
+        """Builds the content hash used as the cache key."""
+        payload = "\x1f".join([
+            cls._normalize(resume_text),
+            cls._normalize(jd_text),
+            str(experience_requirement or "").strip(),
+            str(prompt_version),
+        ])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, stat: str, n: int = 1):
+        with self._lock:
+            self._stats[stat] += n
+
+    def get(self, cache_key: str):
+        """Returns the cached ATS result for a key, or None on a miss/expired entry."""
+        if not self.enabled:
+            return None
+        db = BackgroundSessionLocal()
+        try:
+            entry = db.query(ATSResultCache.id, ATSResultCache.result_json, ATSResultCache.created_at).filter(
+                ATSResultCache.cache_key == cache_key).first()
+            if not entry:
+                return None
+            if entry.created_at and entry.created_at < datetime.utcnow() - self.ttl:
+                db.query(ATSResultCache).filter(ATSResultCache.id == entry.id).delete(synchronize_session=False)
+                db.commit()
+                self._count("evictions")
+                return None
+            result = json.loads(entry.result_json)
+        except Exception as e:
+            db.rollback()
+            self._count("errors")
+            logger.error(f"ATS cache lookup failed for key {cache_key[:12]}: {e}")
+            return None
+        finally:
+            db.close()
+        self._touch(cache_key)
+        return result
+
+    def _touch(self, cache_key: str):
+        """Records a hit in memory, flushing the batch once it is big or old enough."""
+        with self._lock:
+            touch = self._touches.setdefault(cache_key, [0, None])
+            touch[0] += 1
+            touch[1] = datetime.utcnow()
+            due = (len(self._touches) >= self.TOUCH_FLUSH_EVERY_N_ENTRIES
+                   or time.monotonic() - self._last_touch_flush >= self.TOUCH_FLUSH_SECONDS)
+        if due:
+            self.flush_touches()
+
+    def flush_touches(self):
+        """Writes the pending hit counts and access times in one transaction."""
+        with self._lock:
+            touches, self._touches = self._touches, {}
+            self._last_touch_flush = time.monotonic()
+        if not touches:
+            return
+        table = ATSResultCache.__table__
+        db = BackgroundSessionLocal()
+        try:
+            db.execute(
+                table.update().where(table.c.cache_key == bindparam("key")).values(
+                    hit_count=func.coalesce(table.c.hit_count, 0) + bindparam("hits"), last_accessed_at=bindparam("accessed_at")),
+                [{"key": key, "hits": hits, "accessed_at": accessed_at} for key, (hits, accessed_at) in touches.items()],
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._count("errors")
+            logger.error(f"ATS cache access-time flush failed for {len(touches)} entries: {e}")
+        finally:
+            db.close()
+
+    def set(self, cache_key: str, result: dict):
+        """Stores an ATS result. Failures are logged and never propagated to the caller."""
+        if not self.enabled:
+            return
+        db = BackgroundSessionLocal()
+        try:
+            now = datetime.utcnow()
+            entry = db.query(ATSResultCache).filter(ATSResultCache.cache_key == cache_key).first()
+            if entry:
+                entry.result_json = json.dumps(result)
+                entry.created_at = now
+                entry.last_accessed_at = now
+            else:
+                db.add(ATSResultCache(cache_key=cache_key, result_json=json.dumps(result), created_at=now, last_accessed_at=now))
+            db.commit()
+            self._count("writes")
+        except Exception as e:
+            db.rollback()
+            self._count("errors")
+            logger.error(f"ATS cache write failed for key {cache_key[:12]}: {e}")
+            return
+        finally:
+            db.close()
+
+        with self._lock:
+            self._writes_since_prune += 1
+            should_prune = self._writes_since_prune >= self.PRUNE_EVERY_N_WRITES
+            if should_prune:
+                self._writes_since_prune = 0
+        if should_prune:
+            self.prune()
+
+    def prune(self):
+        """Deletes expired entries, then the least-recently-used ones above `max_entries`."""
+        self.flush_touches()  # So recently hit entries are not evicted as least-recently-used
+        db = BackgroundSessionLocal()
+        try:
+            evicted = db.query(ATSResultCache).filter(ATSResultCache.created_at < datetime.utcnow() - self.ttl).delete(synchronize_session=False)
+            overflow = db.query(ATSResultCache.id).count() - self.max_entries
+            if overflow > 0:
+                lru_ids = [row.id for row in db.query(ATSResultCache.id).order_by(ATSResultCache.last_accessed_at.asc()).limit(overflow).all()]
+                evicted += db.query(ATSResultCache).filter(ATSResultCache.id.in_(lru_ids)).delete(synchronize_session=False)
+            db.commit()
+            if evicted:
+                self._count("evictions", evicted)
+                logger.info(f"ATS cache pruned {evicted} entries.")
+        except Exception as e:
+            db.rollback()
+            self._count("errors")
+            logger.error(f"ATS cache prune failed: {e}")
+        finally:
+            db.close()
+
+    def lookup(self, cache_key: str):
+        """Like `get`, but also records the lookup in the hit/miss counters."""
+        if not self.enabled:
+            return None
+        cached = self.get(cache_key)
+        self._count("hits" if cached is not None else "misses")
+        return cached
+
+    def get_or_compute(self, cache_key: str, compute_fn):
+        """
+        Returns the cached result for `cache_key`, otherwise calls `compute_fn()` and stores its result.
+        Concurrent callers with the same key (e.g. duplicate resumes in one bulk upload) wait for the
+        first caller instead of each issuing their own LLM request.
+        """
+        if not self.enabled:
+            return compute_fn()
+
+        while True:
+            cached = self.get(cache_key)
+            if cached is not None:
+                self._count("hits")
+                return cached
+
+            with self._lock:
+                waiter = self._in_flight.get(cache_key)
+                if waiter is None:
+                    event = threading.Event()
+                    self._in_flight[cache_key] = event
+                    self._stats["misses"] += 1
+                    break
+                self._stats["coalesced"] += 1
+            waiter.wait()
+            # The leader has finished; loop to read its result (or become the new leader if it failed).
+
+        try:
+            result = compute_fn()
+            self.set(cache_key, result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(cache_key, None)
+            event.set()
+
+    def stats(self) -> dict:
+        """Returns the hit/miss counters for this process."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        return stats
+
+
+# Shared across all ATSService instances so counters and in-flight coalescing are process-wide.
+ats_result_cache = ATSResultCacheStore(
+    enabled=config.ATS_CACHE_ENABLED,
+    ttl_hours=config.ATS_CACHE_TTL_HOURS,
+    max_entries=config.ATS_CACHE_MAX_ENTRIES,
+)
@@ -1,42 +1,40 @@
 # =============================================================================
 # HR-HIRE-AGENT/src/ats_service.py
 # =============================================================================
-import google.generativeai as genai
 import json
 from config.config_loader import config
 from logger.logger import logger
 from exception.custom_exception import ATSProcessingError
 from promt.promt_library import Prompts
+from src.ats_cache import ats_result_cache
+from src.llm_client import get_llm_client
 
 class ATSService:
     def __init__(self):
-        self.gemini_api_key = config.GEMINI_API_KEY
-        if not self.gemini_api_key:
-            logger.error("GEMINI_API_KEY is not set.")
-            raise ValueError("Google Gemini API key not configured.")
-        genai.configure(api_key=self.gemini_api_key)
-        self.model = genai.GenerativeModel('models/gemini-2.5-flash')
+        # The LLM client is shared process-wide so all threads respect the same RPM/TPM quotas.
+        self.llm_client = get_llm_client()
         self.ats_weights = config.ats_weights # Weights from config.yaml
+        self.cache = ats_result_cache
 
     def generate_ats_score(self, resume_text: str, structured_resume_data: dict, jd_text: str, experience_requirement: str) -> dict:
         if not resume_text or not jd_text:
             raise ATSProcessingError("Resume text or Job Description text cannot be empty for ATS scoring.")
 
+        # Identical resume/JD/requirement/prompt combinations are served from the cache instead of Gemini.
+        cache_key = self.cache.build_key(resume_text, jd_text, experience_requirement, Prompts.ATS_SCORING_PROMPT_VERSION)
+        return self.cache.get_or_compute(
+            cache_key,
+            lambda: self._score_with_llm(resume_text, jd_text, experience_requirement)
+        )
+
+    def _score_with_llm(self, resume_text: str, jd_text: str, experience_requirement: str) -> dict:
         # Note: structured_resume_data and ats_weights are no longer used in the new prompt, but we'll leave them for now.
         prompt = Prompts.ats_scoring_prompt(resume_text, jd_text, experience_requirement)
-        
-        generation_config = genai.GenerationConfig(
-            response_mime_type="application/json"
-        )
+        raw_response_text = ""
         
         try:
-            logger.info("Sending ATS scoring request to Google Gemini (forcing JSON)...")
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config
-            )
-            
-            raw_response_text = response.text
+            logger.info("Sending ATS scoring request to the LLM (forcing JSON)...")
+            raw_response_text = self.llm_client.generate_json(prompt)
             ats_result = json.loads(raw_response_text)
             logger.info(f"ATS scoring successful. Extracted name: {ats_result.get('candidate_name')}, Email: {ats_result.get('email')}")
             return ats_result
@@ -46,4 +44,93 @@ class ATSService:
             raise ATSProcessingError(f"Invalid JSON response from LLM: {e}")
         except Exception as e:
             logger.error(f"Error calling Google Gemini for ATS scoring: {e}")
-            raise ATSProcessingError(f"LLM service error during ATS scoring: {e}")
\ No newline at end of file
+            raise ATSProcessingError(f"LLM service error during ATS scoring: {e}")
+
+    def generate_ats_scores_batch(self, resumes: dict, jd_text: str, experience_requirement: str) -> dict:
+        """
+        Scores several resumes against one JD, sending the JD once per LLM request.
+        Cached results are reused; only cache misses go to the LLM.
+        :param resumes: A mapping of resume_id -> resume text.
+        :return: A mapping of resume_id -> ATS result dict, or the ATSProcessingError raised for that resume.
+        """
+        if not jd_text:
+            raise ATSProcessingError("Job Description text cannot be empty for ATS scoring.")
+
+        results, pending, cache_keys = {}, {}, {}
+        for resume_id, resume_text in resumes.items():
+            if not resume_text:
+                results[resume_id] = ATSProcessingError("Resume text cannot be empty for ATS scoring.")
+                continue
+            cache_key = self.cache.build_key(resume_text, jd_text, experience_requirement, Prompts.ATS_BATCH_SCORING_PROMPT_VERSION)
+            cached = self.cache.lookup(cache_key)
+            if cached is not None:
+                results[resume_id] = cached
+            else:
+                pending[resume_id] = resume_text
+                cache_keys[resume_id] = cache_key
+
+        if pending:
+            for resume_id, outcome in self._score_batch_with_llm(pending, jd_text, experience_requirement).items():
+                results[resume_id] = outcome
+                if not isinstance(outcome, Exception):
+                    self.cache.set(cache_keys[resume_id], outcome)
+        return results
+
+    @staticmethod
+    def _is_valid_ats_result(item) -> bool:
+        if not isinstance(item, dict):
+            return False
+        try:
+            float(item.get("overall_ats_score"))
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    def _score_batch_with_llm(self, resumes: dict, jd_text: str, experience_requirement: str) -> dict:
+        """
+        Sends one batched request. If the response is not a JSON array, or some items are missing or
+        malformed, the affected resumes are split in half and retried; a single leftover resume falls
+        back to the regular one-resume prompt.
+        """
+        if len(resumes) == 1:
+            (resume_id, resume_text), = resumes.items()
+            try:
+                return {resume_id: self._score_with_llm(resume_text, jd_text, experience_requirement)}
+            except ATSProcessingError as e:
+                return {resume_id: e}
+
+        prompt = Prompts.ats_batch_scoring_prompt(list(resumes.items()), jd_text, experience_requirement)
+        parsed_items = []
+        try:
+            logger.info(f"Sending batched ATS scoring request for {len(resumes)} resumes to the LLM...")
+            parsed = json.loads(self.llm_client.generate_json(prompt))
+            if isinstance(parsed, dict):
+                # Some responses wrap the array in an object, e.g. {"results": [...]}
+                parsed = next((v for v in parsed.values() if isinstance(v, list)), [])
+            if isinstance(parsed, list):
+                parsed_items = parsed
+        except ValueError as e:
+            logger.warning(f"Batched ATS response was not valid JSON, splitting the batch: {e}")
+        except Exception as e:
+            logger.error(f"Error calling the LLM for batched ATS scoring: {e}")
+            return {resume_id: ATSProcessingError(f"LLM service error during ATS scoring: {e}") for resume_id in resumes}
+
+        results = {}
+        for item in parsed_items:
+            resume_id = str(item.get("resume_id")) if isinstance(item, dict) else None
+            if resume_id in resumes and resume_id not in results and self._is_valid_ats_result(item):
+                item.pop("resume_id", None)
+                results[resume_id] = item
+
+        missing = {resume_id: text for resume_id, text in resumes.items() if resume_id not in results}
+        if missing:
+            logger.warning(f"Batched ATS response was missing or malformed for {len(missing)} of {len(resumes)} resumes; retrying them.")
+            if len(missing) == len(resumes):
+                ids = list(missing)
+                half = len(ids) // 2
+                for chunk in (ids[:half], ids[half:]):
+                    results.update(self._score_batch_with_llm({rid: missing[rid] for rid in chunk}, jd_text, experience_requirement))
+            else:
+                results.update(self._score_batch_with_llm(missing, jd_text, experience_requirement))
+        logger.info(f"Batched ATS scoring finished for {len(resumes)} resumes.")
+        return results
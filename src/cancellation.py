@@ -0,0 +1,19 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/cancellation.py
+# =============================================================================
+import threading
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag shared between a long-running job and the code that may stop it.
+    Long-running loops call `is_cancelled()` before starting each new unit of work.
+    """
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
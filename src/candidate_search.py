@@ -0,0 +1,292 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/candidate_search.py
+# =============================================================================
+import json
+import re
+
+from sqlalchemy import and_, case, column, func, insert, literal, literal_column, or_, select, table, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import OperationalError
+
+from config.config_loader import config
+from logger.logger import logger
+from model.models import Candidate, CandidateSearchDocument, JobDescription
+
+_FTS_TOKEN_RE = re.compile(r"[\w+#]+")  # Mirrors the FTS5 tokenizer below, which keeps '+' and '#' so "c++" and "c#" stay searchable
+_WORD_RE = re.compile(r"\w+")           # Mirrors the MySQL FULLTEXT parser
+MYSQL_MIN_TOKEN_SIZE = 3                # innodb_ft_min_token_size default; shorter words are not in a FULLTEXT index
+MAX_SEARCH_PHRASES = 16
+_INDEX_BATCH_SIZE = 500
+
+
+class CandidateSearchIndex:
+    """
+    Full-text search over candidate names, email, job title, matched skills and resume text.
+    One row per candidate lives in `candidate_search_documents`, written in the same transaction as the
+    candidate itself. Searches use MySQL FULLTEXT indexes (boolean mode), an SQLite FTS5 table kept in sync
+    by triggers, or LIKE scans on the document table for any other database.
+    """
+    FIELDS = ('full_name', 'email', 'job_title', 'skills', 'resume_text')
+    SKILL_FIELDS = ('skills', 'resume_text')
+    FTS_TABLE = 'candidate_search_fts'
+    # bm25 weight per column, in FIELDS order: a hit in the name or skills counts more than one in the resume body.
+    FTS_WEIGHTS = (5.0, 3.0, 2.0, 4.0, 1.0)
+
+    def __init__(self, backend_setting: str = 'auto'):
+        self.backend_setting = (backend_setting or 'auto').lower()
+        self._has_fts_table = None  # Looked up once per process on SQLite
+
+    # --- Schema ---
+
+    def backend(self, db) -> str:
+        """Returns 'fulltext', 'fts5' or 'like' for the database behind this session."""
+        if self.backend_setting == 'like':
+            return 'like'
+        dialect = db.get_bind().dialect.name
+        if dialect in ('mysql', 'mariadb'):
+            return 'fulltext'
+        if dialect == 'sqlite':
+            if self._has_fts_table is None:
+                self._has_fts_table = db.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": self.FTS_TABLE}
+                ).first() is not None
+            return 'fts5' if self._has_fts_table else 'like'
+        return 'like'
+
+    def _fts_command(self, db, command: str):
+        """Runs an FTS5 special command such as 'rebuild' or 'delete-all'."""
+        db.execute(text(f"INSERT INTO {self.FTS_TABLE}({self.FTS_TABLE}) VALUES (:command)"), {"command": command})
+
+    def _create_fts_triggers(self, db):
+        fts, cols = self.FTS_TABLE, ", ".join(self.FIELDS)
+        new_cols = ", ".join(f"new.{field}" for field in self.FIELDS)
+        old_cols = ", ".join(f"old.{field}" for field in self.FIELDS)
+        db.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON candidate_search_documents BEGIN "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.candidate_id, {new_cols}); END"
+        ))
+        db.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON candidate_search_documents BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.candidate_id, {old_cols}); END"
+        ))
+        db.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON candidate_search_documents BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.candidate_id, {old_cols}); "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.candidate_id, {new_cols}); END"
+        ))
+
+    def _drop_fts_triggers(self, db):
+        for suffix in ('ai', 'ad', 'au'):
+            db.execute(text(f"DROP TRIGGER IF EXISTS {self.FTS_TABLE}_{suffix}"))
+
+    def _ensure_fts_table(self, db):
+        """
+        Creates the SQLite FTS5 table over candidate_search_documents and the triggers that keep it in sync.
+        A table created over existing documents is filled with an FTS 'rebuild'; the triggers' 'delete' commands
+        corrupt the index if they ever remove a row it does not hold.
+        """
+        if self.backend_setting == 'like' or db.get_bind().dialect.name != 'sqlite':
+            return
+        fts, cols = self.FTS_TABLE, ", ".join(self.FIELDS)
+        existed = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+        ).first() is not None
+        try:
+            db.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='candidate_search_documents', "
+                f"content_rowid='candidate_id', tokenize=\"unicode61 tokenchars '+#'\", prefix='2 3')"
+            ))
+        except OperationalError as e:
+            db.rollback()
+            self._has_fts_table = False
+            logger.warning(f"SQLite FTS5 is not available ({e}); candidate search will use LIKE scans.")
+            return
+        self._create_fts_triggers(db)
+        if not existed:
+            self._fts_command(db, 'rebuild')
+        db.commit()
+        self._has_fts_table = True
+
+    def ensure_initialized(self, db):
+        """Creates backend-specific structures and builds the index on first start after an upgrade."""
+        self._ensure_fts_table(db)
+        if db.query(CandidateSearchDocument.candidate_id).first() is None and db.query(Candidate.id).first() is not None:
+            logger.info("Candidate search index is empty; building it from existing candidates.")
+            self.rebuild(db)
+
+    # --- Writes (within the caller's transaction) ---
+
+    @staticmethod
+    def _skills_text(ai_analysis: str) -> str:
+        try:
+            skills = json.loads(ai_analysis or "{}").get("matched_skills") or []
+        except (ValueError, AttributeError):
+            return ""
+        return "; ".join(str(skill) for skill in skills)
+
+    def _documents(self, db, candidate_ids: list[int]) -> list[dict]:
+        rows = db.query(
+            Candidate.id, Candidate.job_description_id, Candidate.first_name, Candidate.last_name,
+            Candidate.email, Candidate.ai_analysis, Candidate.resume_text, JobDescription.title
+        ).outerjoin(JobDescription, Candidate.job_description_id == JobDescription.id).filter(Candidate.id.in_(candidate_ids)).all()
+        return [{
+            "candidate_id": row.id,
+            "job_description_id": row.job_description_id,
+            "full_name": f"{row.first_name or ''} {row.last_name or ''}".strip(),
+            "email": row.email,
+            "job_title": row.title,
+            "skills": self._skills_text(row.ai_analysis),
+            "resume_text": row.resume_text,
+        } for row in rows]
+
+    def index_candidates(self, db, candidate_ids: list[int]):
+        """(Re)indexes the given candidates; the caller commits."""
+        ids = sorted(set(candidate_ids))
+        for start in range(0, len(ids), _INDEX_BATCH_SIZE):
+            batch = ids[start:start + _INDEX_BATCH_SIZE]
+            db.query(CandidateSearchDocument).filter(CandidateSearchDocument.candidate_id.in_(batch)).delete(synchronize_session=False)
+            documents = self._documents(db, batch)
+            if documents:
+                db.execute(insert(CandidateSearchDocument), documents)
+
+    def remove_candidates(self, db, candidate_ids: list[int]):
+        """Drops candidates from the index; must run before the candidate rows are deleted."""
+        db.query(CandidateSearchDocument).filter(CandidateSearchDocument.candidate_id.in_(candidate_ids)).delete(synchronize_session=False)
+
+    def update_job_title(self, db, job_id: int, title: str):
+        db.query(CandidateSearchDocument).filter(CandidateSearchDocument.job_description_id == job_id).update(
+            {CandidateSearchDocument.job_title: title}, synchronize_session=False
+        )
+
+    def rebuild(self, db) -> int:
+        """
+        Re-indexes every candidate in one transaction. On SQLite FTS5 the sync triggers are dropped for the
+        duration and the FTS table is rebuilt from the new documents in one pass, so a full-text index that
+        had drifted from the documents is repaired instead of tripping over it row by row.
+        :return: The number of documents written.
+        """
+        use_fts = self.backend(db) == 'fts5'
+        if use_fts:
+            self._drop_fts_triggers(db)
+            self._fts_command(db, 'delete-all')
+        db.query(CandidateSearchDocument).delete(synchronize_session=False)
+        total, last_id = 0, 0
+        while True:
+            ids = [row.id for row in db.query(Candidate.id).filter(Candidate.id > last_id).order_by(Candidate.id).limit(_INDEX_BATCH_SIZE).all()]
+            if not ids:
+                break
+            documents = self._documents(db, ids)
+            if documents:
+                db.execute(insert(CandidateSearchDocument), documents)
+            total += len(documents)
+            last_id = ids[-1]
+        if use_fts:
+            self._fts_command(db, 'rebuild')
+            self._create_fts_triggers(db)
+        db.commit()
+        logger.info(f"Rebuilt candidate search index: {total} documents.")
+        return total
+
+    # --- Queries ---
+
+    @staticmethod
+    def _phrases(terms: list[str]) -> list[str]:
+        phrases = []
+        for term in terms:
+            phrase = " ".join((term or "").lower().split())
+            if phrase and _FTS_TOKEN_RE.search(phrase) and phrase not in phrases:
+                phrases.append(phrase)
+        return phrases[:MAX_SEARCH_PHRASES]
+
+    def _fts_select(self, phrases, fields, prefix, match_all):
+        terms = []
+        for phrase in phrases:
+            quoted = '"' + " ".join(_FTS_TOKEN_RE.findall(phrase)) + '"'
+            terms.append(quoted + ("*" if prefix else ""))
+        expression = (" AND " if match_all else " OR ").join(terms)
+        if fields != self.FIELDS:
+            expression = "{" + " ".join(fields) + "} : (" + expression + ")"
+        fts = table(self.FTS_TABLE, column('rowid'))
+        score = -func.bm25(literal_column(self.FTS_TABLE), *[literal(w) for w in self.FTS_WEIGHTS])
+        return select(fts.c.rowid.label('candidate_id'), score.label('score')).where(
+            text(f"{self.FTS_TABLE} MATCH :fts_query").bindparams(fts_query=expression)
+        )
+
+    def _like_condition(self, phrase, fields):
+        return or_(*[func.lower(getattr(CandidateSearchDocument, field)).contains(phrase, autoescape=True) for field in fields])
+
+    def _document_select(self, phrases, fields, prefix, match_all, use_fulltext):
+        """MySQL FULLTEXT for words the index holds, LIKE for short words and every phrase on other databases."""
+        indexed, scanned = [], []
+        for phrase in phrases:
+            words = _WORD_RE.findall(phrase)
+            if use_fulltext and words and all(len(word) >= MYSQL_MIN_TOKEN_SIZE for word in words):
+                indexed.append(words)
+            else:
+                scanned.append(phrase)
+
+        conditions, score = [], literal(0.0)
+        if indexed:
+            against = " ".join(
+                ("+" if match_all else "") + (f"{words[0]}*" if prefix and len(words) == 1 else '"' + " ".join(words) + '"')
+                for words in indexed
+            )
+            relevance = match(*[getattr(CandidateSearchDocument, field) for field in fields], against=against).in_boolean_mode()
+            conditions.append(relevance)
+            score = score + relevance
+        for phrase in scanned:
+            condition = self._like_condition(phrase, fields)
+            conditions.append(condition)
+            score = score + case((condition, 1.0), else_=0.0)
+
+        return select(CandidateSearchDocument.candidate_id.label('candidate_id'), score.label('score')).where(
+            and_(*conditions) if match_all else or_(*conditions)
+        )
+
+    def _search_select(self, db, phrases, fields, prefix, match_all):
+        backend = self.backend(db)
+        if backend == 'fts5':
+            return self._fts_select(phrases, fields, prefix, match_all)
+        return self._document_select(phrases, fields, prefix, match_all, use_fulltext=(backend == 'fulltext'))
+
+    def filter_ids(self, db, search_query: str):
+        """
+        Returns a SELECT of candidate ids matching every word of `search_query` as a prefix, for use in
+        `Candidate.id.in_(...)`, or None if the query contains nothing searchable.
+        """
+        phrases = self._phrases((search_query or "").split())
+        if not phrases:
+            return None
+        ids = self._search_select(db, phrases, self.FIELDS, prefix=True, match_all=True).subquery()
+        return select(ids.c.candidate_id)
+
+    def _ranked(self, db, phrases, fields, prefix, match_all, job_id, limit) -> list[tuple[int, float]]:
+        if not phrases:
+            return []
+        stmt = self._search_select(db, phrases, fields, prefix, match_all).subquery()
+        query = select(stmt.c.candidate_id, stmt.c.score)
+        if job_id:
+            query = query.where(stmt.c.candidate_id.in_(
+                select(CandidateSearchDocument.candidate_id).where(CandidateSearchDocument.job_description_id == job_id)
+            ))
+        query = query.order_by(stmt.c.score.desc(), stmt.c.candidate_id.desc()).limit(limit)
+        return [(row.candidate_id, float(row.score or 0.0)) for row in db.execute(query)]
+
+    def search(self, db, search_query: str, job_id: int = None, limit: int = 50) -> list[tuple[int, float]]:
+        """
+        Ranked search across all indexed fields; every word must match, as a prefix.
+        :return: [(candidate_id, score)], best match first.
+        """
+        return self._ranked(db, self._phrases((search_query or "").split()), self.FIELDS, True, True, job_id, limit)
+
+    def search_skills(self, db, skills: list[str], job_id: int = None, match_all: bool = False, limit: int = 50) -> list[tuple[int, float]]:
+        """
+        Ranked search of matched skills and resume text. Each skill is matched as a whole word or phrase
+        ("java" does not match "javascript"); candidates matching more of the skills rank higher.
+        :param match_all: If True, only candidates matching every skill are returned.
+        :return: [(candidate_id, score)], best match first.
+        """
+        return self._ranked(db, self._phrases(skills), self.SKILL_FIELDS, False, match_all, job_id, limit)
+
+
+candidate_search_index = CandidateSearchIndex(backend_setting=config.CANDIDATE_SEARCH_BACKEND)
@@ -0,0 +1,95 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/dashboard_stats.py
+# =============================================================================
+import threading
+import time
+
+from sqlalchemy import func
+
+from config.config_loader import config
+from logger.logger import logger
+from model.models import JobDescription
+from model.status_constants import StatusConstants
+from src.pipeline_counters import pipeline_counters
+
+
+class DashboardStatsCache:
+    """
+    In-process snapshot of candidate counts per status, summed from the pipeline_counters table.
+    The dashboard KPIs, the distribution chart and the pipeline-tab counts are all derived from
+    the same snapshot through StatusConstants groups. The snapshot expires after a short TTL and is
+    dropped immediately when this process commits a status change or a bulk import.
+    """
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot = None
+        self._generation = 0  # Bumped on every invalidation, so a refresh that raced with one is not stored
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+
+    def _is_fresh(self, snapshot) -> bool:
+        return snapshot is not None and time.monotonic() - snapshot["computed_at"] < self.ttl_seconds
+
+    def get_snapshot(self, db) -> dict:
+        """
+        Returns {"status_counts", "total_candidates", "total_jobs", "computed_at"}, recomputing it at most
+        once per TTL. Concurrent requests on an expired snapshot wait for a single refresh.
+        """
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+
+        with self._refresh_lock:
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                return snapshot
+            with self._lock:
+                generation = self._generation
+
+            status_counts = pipeline_counters.status_totals(db)
+            snapshot = {
+                "status_counts": status_counts,
+                "total_candidates": sum(status_counts.values()),
+                "total_jobs": db.query(func.count(JobDescription.id)).scalar() or 0,
+                "computed_at": time.monotonic(),
+            }
+            with self._lock:
+                if generation == self._generation:
+                    self._snapshot = snapshot
+            logger.debug(f"Dashboard stats snapshot refreshed ({snapshot['total_candidates']} candidates).")
+            return snapshot
+
+    @staticmethod
+    def _sum_statuses(status_counts: dict, statuses: list[str]) -> int:
+        return sum(status_counts.get(status, 0) for status in statuses)
+
+    def dashboard_kpis(self, db) -> dict:
+        snapshot = self.get_snapshot(db)
+        kpi_groups = StatusConstants.get_dashboard_groups()["kpis"]
+        return {
+            "active_jobs": snapshot["total_jobs"],
+            "total_candidates_shortlisted": snapshot["total_candidates"],
+            "candidates_interviewing": self._sum_statuses(snapshot["status_counts"], kpi_groups["candidates_interviewing"]),
+            "offers_extended": self._sum_statuses(snapshot["status_counts"], kpi_groups["offers_extended"]),
+        }
+
+    def status_distribution(self, db) -> dict:
+        """Returns the non-empty distribution buckets, in chart order."""
+        status_counts = self.get_snapshot(db)["status_counts"]
+        distribution = {
+            label: self._sum_statuses(status_counts, statuses)
+            for label, statuses in StatusConstants.get_dashboard_groups()["distribution"].items()
+        }
+        return {label: count for label, count in distribution.items() if count > 0}
+
+    def tab_counts(self, db, tab_status_groups: dict) -> dict:
+        status_counts = self.get_snapshot(db)["status_counts"]
+        return {tab_key: self._sum_statuses(status_counts, statuses) for tab_key, statuses in tab_status_groups.items()}
+
+
+dashboard_stats_cache = DashboardStatsCache(ttl_seconds=config.DASHBOARD_STATS_TTL_SECONDS)
@@ -2,58 +2,19 @@
 # HR-HIRE-AGENT/src/helpers.py
 # =============================================================================
 import os
+import hashlib
 import secrets
 import shutil
+import tempfile
 from werkzeug.utils import secure_filename
 from config.config_loader import config
 from logger.logger import logger
+from src.archive_ingest import is_archive_member, member_file_name, open_resume_source
 import json
 
-# Libraries for resume parsing
-import PyPDF2
-import docx
-from pyresparser import ResumeParser
-
-# --- CRITICAL: NLTK/SpaCy Initialization ---
-import nltk
-import spacy
-
-def _initialize_nlp_resources():
-    """Ensures NLTK stopwords and SpaCy model are downloaded and loaded."""
-    # NLTK Stopwords
-    try:
-        nltk.data.find('corpora/stopwords')
-        logger.info("NLTK 'stopwords' already downloaded.")
-    except LookupError:
-        logger.info("NLTK 'stopwords' not found, downloading...")
-        nltk.download('stopwords')
-        logger.info("NLTK 'stopwords' downloaded successfully.")
-
-    # SpaCy English Model
-    try:
-        spacy.load('en_core_web_sm')
-        logger.info("SpaCy 'en_core_web_sm' model already loaded.")
-    except OSError:
-        logger.warning("SpaCy 'en_core_web_sm' model not found, attempting download and load. This can take a moment...")
-        # Fallback for systems where direct `spacy.load` might fail path resolution
-        try:
-            spacy.cli.download('en_core_web_sm')
-            logger.info("SpaCy 'en_core_web_sm' downloaded successfully.")
-            spacy.load('en_core_web_sm') # Try loading again after download
-        except Exception as e:
-            logger.critical(f"CRITICAL ERROR: Failed to download or load SpaCy 'en_core_web_sm' model. ATS parsing will likely fail. Error: {e}", exc_info=True)
-            raise # Re-raise to prevent application from starting with broken ATS
-
-# Call this initialization once when helpers module is loaded
-_initialize_nlp_resources()
-# --- END CRITICAL INITIALIZATION ---
-
-
-# Global SpaCy NLP object for pyresparser (if ResumeParser needs it explicitly, though it usually loads its own)
-# This part is more for robustness, pyresparser typically handles this internally.
-# But having a global nlp might prevent some issues if pyresparser's internal load is flaky.
-# It's less about directly using 'nlp' in our code, more about ensuring the model is loaded in the interpreter.
-# However, for pyresparser, it often loads its own instance. Let's rely on the above _initialize_nlp_resources to ensure existence.
+# PyPDF2, python-docx and pyresparser (with spaCy/NLTK) are imported on first use, not when this module loads,
+# so web workers boot without them; see src/nlp_resources.py for the once-per-process model loading.
+from src.nlp_resources import get_resume_parser_class
 
 
 def save_uploaded_file(file, folder: str):
@@ -81,36 +42,42 @@ def save_uploaded_file(file, folder: str):
         logger.error(f"Error saving file {filename}: {e}")
         return None
 
+def compute_file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Returns the hex SHA-256 digest of a file's (or archive member's) bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open_resume_source(file_path) as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def extract_raw_text_from_file(file_path: str) -> str:
-    """Helper to extract raw text content from PDF/DOCX/TXT."""
-    if not os.path.exists(file_path):
+    """Helper to extract raw text content from PDF/DOCX/TXT, on disk or inside an uploaded archive."""
+    if not is_archive_member(file_path) and not os.path.exists(file_path):
         logger.warning(f"File not found for raw text extraction: {file_path}")
         return ""
 
-    _, file_extension = os.path.splitext(file_path)
+    _, file_extension = os.path.splitext(member_file_name(file_path))
     text_content = ""
 
     try:
-        if file_extension.lower() == '.pdf':
-            with open(file_path, 'rb') as f:
+        with open_resume_source(file_path) as f:
+            if file_extension.lower() == '.pdf':
+                import PyPDF2
                 reader = PyPDF2.PdfReader(f)
-                for page_num in range(len(reader.pages)):
-                    text_content += reader.pages[page_num].extract_text() or ""
-        elif file_extension.lower() == '.docx':
-            document = docx.Document(file_path)
-            for paragraph in document.paragraphs:
-                text_content += paragraph.text + "\n"
-        elif file_extension.lower() in ['.txt', '.md']:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text_content = f.read()
-        else:
-            logger.warning(f"Unsupported file type for raw text extraction: {file_extension}. Attempting simple read.")
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text_content = f.read()
-            except UnicodeDecodeError:
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    text_content = f.read()
+                text_content = "".join(page.extract_text() or "" for page in reader.pages)
+            elif file_extension.lower() == '.docx':
+                import docx
+                document = docx.Document(f)
+                text_content = "".join(paragraph.text + "\n" for paragraph in document.paragraphs)
+            elif file_extension.lower() in ['.txt', '.md']:
+                text_content = f.read().decode('utf-8')
+            else:
+                logger.warning(f"Unsupported file type for raw text extraction: {file_extension}. Attempting simple read.")
+                raw_bytes = f.read()
+                try:
+                    text_content = raw_bytes.decode('utf-8')
+                except UnicodeDecodeError:
+                    text_content = raw_bytes.decode('latin-1')
 
         return text_content.strip()
     except Exception as e:
@@ -160,7 +127,7 @@ def parse_resume(file_path: str) -> tuple[str, dict]:
     Parses a resume file. It first attempts fast text extraction. If that fails,
     it uses pyresparser as a complete fallback.
     """
-    if not os.path.exists(file_path):
+    if not is_archive_member(file_path) and not os.path.exists(file_path):
         logger.warning(f"Resume file not found for parsing: {file_path}")
         return "", {}
 
@@ -178,8 +145,20 @@ def parse_resume(file_path: str) -> tuple[str, dict]:
     # Step 3: If we are here, it means raw_text is empty. Use pyresparser as a fallback.
     logger.warning(f"Primary text extraction failed for {file_path}. Falling back to pyresparser.")
     try:
-        parser = ResumeParser(file_path)
-        data = parser.get_extracted_data()
+        ResumeParser = get_resume_parser_class()
+        if is_archive_member(file_path):
+            # pyresparser only reads from disk, so archive members are written out just for this fallback.
+            _, file_extension = os.path.splitext(member_file_name(file_path))
+            with tempfile.NamedTemporaryFile(suffix=file_extension, delete=False) as tmp:
+                with open_resume_source(file_path) as source:
+                    shutil.copyfileobj(source, tmp)
+            try:
+                data = ResumeParser(tmp.name).get_extracted_data()
+            finally:
+                os.remove(tmp.name)
+        else:
+            parser = ResumeParser(file_path)
+            data = parser.get_extracted_data()
 
         if data:
             structured_data = {k: (v if v is not None else ([] if isinstance(data.get(k), list) else '')) 
@@ -1,22 +1,36 @@
-from sqlalchemy.orm import Session, aliased, joinedload
-from sqlalchemy import func, or_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, or_, insert
 import shutil
+import time
 import uuid
 import os
 import re
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import all relevant models for operations, especially for deletions
-from model.models import Candidate, JobDescription, StatusHistory, Interview, HRDiscussion, Verification
+from model.models import Candidate, JobDescription, StatusHistory, Interview, HRDiscussion, Verification, PipelineCounter, PrescreenOutcome
 from model.status_constants import StatusConstants
 from src.ats_service import ATSService
 from src.whatsapp_service import WhatsAppService
 from src.notification_service import NotificationService
-from src.helpers import parse_resume
+from src.notification_outbox import notification_outbox
+from src.shortlist_digest import shortlist_digest
+from src.message_templates import compile_template, load_recipients
+from src.helpers import compute_file_sha256
+from src.archive_ingest import is_archive_member, member_file_name, read_archive_member
+from src.resume_pipeline import ResumePipeline
+from src.dashboard_stats import dashboard_stats_cache
+from src.pipeline_counters import pipeline_counters
+from src.candidate_search import candidate_search_index
+from src.skill_matcher import skill_matcher
+from src.prescreen import PreScreener
+from src.pagination import encode_cursor, decode_cursor, TTLCountCache
 from logger.logger import logger
 from config.config_loader import config
-from exception.custom_exception import NotFoundError, ValidationError, DatabaseError, APIError
+from exception.custom_exception import NotFoundError, ValidationError, DatabaseError
+
+# Shared across requests so repeated searches reuse the same total for a short while.
+_candidate_count_cache = TTLCountCache(ttl_seconds=config.CANDIDATE_COUNT_CACHE_TTL_SECONDS)
 
 class HiringService:
     """
@@ -33,7 +47,12 @@ class HiringService:
         self.ats_service = ATSService()
         self.whatsapp_service = WhatsAppService()
         self.notification_service = NotificationService()
-        self.max_workers_resume_processing = config.MAX_WORKERS_RESUME_PROCESSING
+        self.max_workers_text_extraction = config.MAX_WORKERS_TEXT_EXTRACTION
+        self.max_workers_llm_scoring = config.MAX_WORKERS_LLM_SCORING
+        self.scoring_queue_size = config.SCORING_QUEUE_SIZE
+        self.ats_batch_size = config.ATS_BATCH_SIZE
+        self.candidate_insert_batch_size = config.CANDIDATE_INSERT_BATCH_SIZE
+        self.candidate_insert_flush_seconds = config.CANDIDATE_INSERT_FLUSH_SECONDS
         # Load the status configs once
         self.status_configs = StatusConstants.get_all_configs()
 
@@ -106,6 +125,7 @@ class HiringService:
             )
             self.db.add(jd)
             self.db.commit()
+            dashboard_stats_cache.invalidate()
             self.db.refresh(jd)
             return jd
         except Exception as e:
@@ -147,126 +167,408 @@ class HiringService:
             raise NotFoundError(f"Candidate with ID {candidate_id} not found.")
         return candidate
         
-    def _process_single_resume_task(self, file_path: str, jd_description_text: str,min_experience_req: str) -> dict:
+    def _build_processed_result(self, file_path: str, resume_text: str, structured_data: dict, ats_result: dict, resume_sha256: str = None) -> dict:
+        """
+        Merges the ATS result with parser output into the dictionary used to create a candidate.
+        """
+        name = ats_result.get('candidate_name', '').strip() or structured_data.get('name', '').strip()
+        email = ats_result.get('email', '').strip() or structured_data.get('email', '').strip()
+        phone = ats_result.get('phone_number', '').strip() or structured_data.get('mobile_number', '')
+        
+        parts = name.split() if name else []
+        first, last = (parts[0], ' '.join(parts[1:])) if parts else ("Candidate", f"({member_file_name(file_path)})")
+        
+        return {
+            "first_name": first, "last_name": last, "email": email, "phone_number": phone, 
+            "ats_score": ats_result.get("overall_ats_score", 0.0), 
+            "full_analysis": ats_result, "error": None,
+            "file_name": member_file_name(file_path),
+            "original_path": file_path,
+            "resume_text": resume_text, "resume_sha256": resume_sha256
+        }
+
+    def _score_extracted_resumes(self, extracted: list[dict], jd_description_text: str, min_experience_req: str) -> list[dict]:
         """
-        A single unit of work for processing one resume against a job description.
+        LLM stage of the bulk pipeline: scores already-extracted resumes against a job description.
+        A single resume uses the regular prompt; several are sent in one batched request (the JD is sent once).
         This function is designed to be run in a separate thread.
-        :param file_path: The path to the resume file.
-        :param jd_description_text: The text of the job description.
-        :return: A dictionary containing the processed data or an error.
+        :param extracted: Extracted-resume dicts produced by the text extraction stage.
+        :return: A list of processed-data or error dictionaries, one per resume.
         """
+        if len(extracted) == 1:
+            item = extracted[0]
+            try:
+                # The ATS service is expected to return a full analysis, including work history
+                ats_result = self.ats_service.generate_ats_score(item["resume_text"], item["structured_data"], jd_description_text, min_experience_req)
+                return [self._build_processed_result(item["file_path"], item["resume_text"], item["structured_data"], ats_result, item["resume_sha256"])]
+            except Exception as e:
+                return [{"file_name": member_file_name(item["file_path"]), "error": str(e), "original_path": item["file_path"]}]
+
+        # Positional ids keep the prompt short and avoid leaking file names to the LLM.
+        id_to_item = {str(i): item for i, item in enumerate(extracted, start=1)}
         try:
-            resume_text, structured_data = parse_resume(file_path)
-            if not resume_text and not structured_data:
-                raise APIError("Failed to extract content from resume.")
-            
-            # The ATS service is expected to return a full analysis, including work history
-            ats_result = self.ats_service.generate_ats_score(resume_text, structured_data, jd_description_text,min_experience_req)
-            
-            name = ats_result.get('candidate_name', '').strip() or structured_data.get('name', '').strip()
-            email = ats_result.get('email', '').strip() or structured_data.get('email', '').strip()
-            phone = ats_result.get('phone_number', '').strip() or structured_data.get('mobile_number', '')
-            
-            parts = name.split() if name else []
-            first, last = (parts[0], ' '.join(parts[1:])) if parts else ("Candidate", f"({os.path.basename(file_path)})")
-            
-            return {
-                "first_name": first, "last_name": last, "email": email, "phone_number": phone, 
-                "ats_score": ats_result.get("overall_ats_score", 0.0), 
-                "full_analysis": ats_result, "error": None,
-                "original_path": file_path
-            }
+            ats_results = self.ats_service.generate_ats_scores_batch(
+                {resume_id: item["resume_text"] for resume_id, item in id_to_item.items()},
+                jd_description_text, min_experience_req
+            )
         except Exception as e:
-            return {"file_name": os.path.basename(file_path), "error": str(e), "original_path": file_path}
+            ats_results = {resume_id: e for resume_id in id_to_item}
 
-    def bulk_process_and_shortlist_resumes(self, resume_file_paths: list[str], jd_id: int, ats_threshold: float, changed_by: str, progress_callback=None):
+        results = []
+        for resume_id, item in id_to_item.items():
+            ats_result = ats_results.get(resume_id)
+            if ats_result is None or isinstance(ats_result, Exception):
+                results.append({"file_name": member_file_name(item["file_path"]), "error": str(ats_result or "No ATS result returned."), "original_path": item["file_path"]})
+            else:
+                results.append(self._build_processed_result(item["file_path"], item["resume_text"], item["structured_data"], ats_result, item["resume_sha256"]))
+        return results
+
+    def _prescreen_and_score(self, extracted: list[dict], screener: PreScreener, jd_description_text: str, min_experience_req: str) -> list[dict]:
+        """
+        Scoring-stage wrapper that runs the local pre-screen first and sends only the resumes it passes to the LLM.
+        Resumes below the cut-off come back as ATS-rejected results (reject mode) or as deferred markers (defer mode).
+        Every result carries its pre-screen score so it can be compared with the LLM score later.
         """
-        Processes a batch of resumes in parallel using a thread pool and reports progress.
+        if not screener.enabled:
+            return self._score_extracted_resumes(extracted, jd_description_text, min_experience_req)
+
+        to_score, results = [], []
+        for item in extracted:
+            prescreen = screener.score(item["resume_text"], item["structured_data"])
+            if screener.passes(prescreen):
+                to_score.append((item, prescreen))
+            elif screener.mode == 'defer':
+                results.append({"file_name": member_file_name(item["file_path"]), "original_path": item["file_path"], "error": None,
+                                "deferred": True, "prescreen": prescreen, "prescreen_decision": 'deferred'})
+            else:
+                result = self._build_processed_result(item["file_path"], item["resume_text"], item["structured_data"],
+                                                      screener.rejection_result(prescreen), item["resume_sha256"])
+                results.append(dict(result, prescreen=prescreen, prescreen_decision='rejected'))
+
+        if to_score:
+            decision = 'passed' if screener.gates else 'observed'
+            scored = self._score_extracted_resumes([item for item, _ in to_score], jd_description_text, min_experience_req)
+            for (_, prescreen), result in zip(to_score, scored):
+                results.append(dict(result, prescreen=prescreen, prescreen_decision=decision))
+        return results
+
+    def _record_prescreen_outcomes(self, rows: list[dict]):
+        """Saves pre-screen scores next to the LLM scores for the precision/recall report. Never fails the import."""
+        if not rows:
+            return
+        try:
+            self.db.execute(insert(PrescreenOutcome), rows)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to record {len(rows)} pre-screen outcomes: {e}")
+
+    def bulk_process_and_shortlist_resumes(self, resume_file_paths: list[str], jd_id: int, ats_threshold: float, changed_by: str, progress_callback=None, cancel_token=None, prescreen: bool = True, digest_task_id: str = None):
+        """
+        Processes a batch of resumes through a two-stage pipeline and reports progress.
+        Text extraction runs in a process pool; LLM scoring runs in a separate thread pool fed by a bounded queue.
+        When `ats_batch_size` is greater than 1, resumes are scored several per LLM request.
+        Depending on `prescreen_mode`, a local keyword/experience pre-screen runs before the LLM and can reject
+        or defer clearly irrelevant resumes without an LLM call.
         :param resume_file_paths: A list of paths to the uploaded resume files.
         :param jd_id: The ID of the job description to screen against.
         :param ats_threshold: The minimum ATS score required to be shortlisted.
         :param changed_by: Identifier for who initiated this bulk process.
-        :param progress_callback: A function to call after each resume is processed to report status.
+        :param progress_callback: Called after each resume is processed as
+                                  progress_callback(result_type, file_path, error=None), where result_type is
+                                  'shortlisted', 'rejected', 'failed', 'duplicate' or 'deferred'.
+        :param cancel_token: Optional CancellationToken. Once cancelled, no new files are extracted or scored;
+                             resumes already scored are still saved, and the rest get no callback so they can be resumed.
+        :param prescreen: If False (deferred resumes being re-run), the pre-screen only observes and every resume goes to the LLM.
+        :param digest_task_id: When set (and shortlist digests are enabled), shortlisted candidates are recorded for this
+                               task's HR digest instead of each queuing its own alert; the caller flushes the digest.
         """
         jd = self.get_job_description(jd_id)
+        unique_resumes = self._dedupe_resume_files(resume_file_paths, jd.id, progress_callback)
+        jd_text, min_experience = jd.description_text, jd.min_experience_years
+        screener = PreScreener(jd.title, jd_text, min_experience,
+                               mode=None if prescreen or config.PRESCREEN_MODE.lower() == 'off' else 'shadow')
+
+        pipeline = ResumePipeline(
+            extraction_workers=self.max_workers_text_extraction,
+            scoring_workers=self.max_workers_llm_scoring,
+            queue_size=self.scoring_queue_size,
+            batch_size=self.ats_batch_size,
+        )
         
-        # Use a thread pool to process resumes concurrently based on the config setting.
-        with ThreadPoolExecutor(max_workers=self.max_workers_resume_processing) as executor:
-            # Schedule each resume processing task and get a "future" object for it.
-            future_to_resume = {
-                executor.submit(self._process_single_resume_task, rp, jd.description_text, jd.min_experience_years): rp 
-                for rp in resume_file_paths
-            }
-            
-            # As each task completes, process its result.
-            for future in as_completed(future_to_resume):
-                try:
-                    data = future.result()
-                    if data.get("error"):
-                        logger.error(f"Failed to process resume {data.get('file_name')}: {data.get('error')}")
-                        if progress_callback:
-                            progress_callback('failed')
-                        continue
-                    
-                    is_shortlisted = data.get('ats_score', 0.0) >= ats_threshold
-                    self._create_candidate_from_processed_data(data, jd, changed_by, is_shortlisted)
-                    self.db.commit()  # Commit after each successful candidate creation
-                    
-                    if progress_callback:
-                        progress_callback('shortlisted' if is_shortlisted else 'rejected')
-
-                except Exception as e:
-                    self.db.rollback() # Rollback if candidate creation fails
-                    logger.error(f"Critical error creating candidate from processed data: {e}", exc_info=True)
-                    if progress_callback:
-                        progress_callback('failed')
-
-
-    def _create_candidate_from_processed_data(self, data: dict, jd: JobDescription, changed_by: str, is_shortlisted: bool):
+        # Results arrive on this thread as each resume is scored, so the DB session is never shared across threads.
+        # Successful results are buffered and written a chunk at a time; failures are reported straight away.
+        chunk, chunk_started, prescreen_rows = [], None, []
+        score_fn = lambda batch: self._prescreen_and_score(batch, screener, jd_text, min_experience)
+        for data in pipeline.run(unique_resumes, score_fn, cancel_token):
+            if data.get("prescreen") and not data.get("error"):
+                prescreen_rows.append({
+                    "job_description_id": jd.id, "file_name": data.get('file_name'),
+                    "prescreen_score": data["prescreen"]["score"], "decision": data["prescreen_decision"],
+                    "ats_score": data.get('ats_score') if data["prescreen_decision"] in ('passed', 'observed') else None,
+                    "ats_threshold": ats_threshold,
+                })
+
+            if data.get("error"):
+                logger.error(f"Failed to process resume {data.get('file_name')}: {data.get('error')}")
+                if progress_callback:
+                    progress_callback('failed', data.get('original_path'), data.get('error'))
+            elif data.get("deferred"):
+                logger.info(f"Deferred {data.get('file_name')} (pre-screen score {data['prescreen']['score']}).")
+                if progress_callback:
+                    progress_callback('deferred', data.get('original_path'))
+            else:
+                chunk.append(data)
+                chunk_started = chunk_started or time.monotonic()
+
+            if chunk and (len(chunk) >= self.candidate_insert_batch_size or time.monotonic() - chunk_started >= self.candidate_insert_flush_seconds):
+                self._persist_processed_chunk(chunk, jd, ats_threshold, changed_by, progress_callback, digest_task_id)
+                chunk, chunk_started = [], None
+                self._record_prescreen_outcomes(prescreen_rows)
+                prescreen_rows = []
+
+        if chunk:
+            self._persist_processed_chunk(chunk, jd, ats_threshold, changed_by, progress_callback, digest_task_id)
+        self._record_prescreen_outcomes(prescreen_rows)
+
+        if cancel_token and cancel_token.is_cancelled():
+            logger.info(f"Bulk processing for job {jd_id} stopped early because it was cancelled.")
+
+
+    def _dedupe_resume_files(self, resume_file_paths: list[str], jd_id: int, progress_callback=None) -> list[tuple]:
         """
-        Helper function to create and save a single candidate record from processed data.
+        Dedup stage run ahead of parsing. Files are keyed by their SHA-256 so that byte-identical
+        uploads are only screened once, both within this batch and against earlier batches.
+        :param resume_file_paths: A list of paths to the uploaded resume files.
+        :param jd_id: The ID of the job description being screened against.
+        :param progress_callback: Called with 'duplicate' for every file that is skipped.
+        :return: A list of (file_path, sha256, known_resume_text) tuples that still need processing.
+        """
+        hashed_files = []
+        seen_hashes = set()
+        for rp in resume_file_paths:
+            try:
+                sha = compute_file_sha256(rp)
+            except Exception as e:
+                logger.error(f"Could not hash resume {member_file_name(rp)}, processing it without dedup: {e}")
+                hashed_files.append((rp, None))
+                continue
+            if sha in seen_hashes:
+                logger.info(f"Skipping duplicate upload within batch: {member_file_name(rp)}")
+                if progress_callback:
+                    progress_callback('duplicate', rp)
+                continue
+            seen_hashes.add(sha)
+            hashed_files.append((rp, sha))
+
+        # Reuse what earlier batches already stored for the same file contents.
+        already_screened, known_texts = set(), {}
+        if seen_hashes:
+            rows = self.db.query(Candidate.resume_sha256, Candidate.job_description_id, Candidate.resume_text).filter(
+                Candidate.resume_sha256.in_(seen_hashes)
+            ).all()
+            for sha, row_jd_id, resume_text in rows:
+                if row_jd_id == jd_id:
+                    already_screened.add(sha)
+                if resume_text:
+                    known_texts.setdefault(sha, resume_text)
+
+        unique_resumes = []
+        for rp, sha in hashed_files:
+            if sha in already_screened:
+                logger.info(f"Skipping resume already screened for job {jd_id}: {member_file_name(rp)}")
+                if progress_callback:
+                    progress_callback('duplicate', rp)
+                continue
+            unique_resumes.append((rp, sha, known_texts.get(sha)))
+        return unique_resumes
+
+    def _persist_processed_chunk(self, chunk: list[dict], jd: JobDescription, ats_threshold: float, changed_by: str, progress_callback=None, digest_task_id: str = None):
         """
+        Saves a chunk of scored resumes with one duplicate-check query, bulk inserts for the Candidate
+        and StatusHistory rows, and a single commit. If the bulk write fails, the chunk is retried one
+        candidate at a time so a single bad row cannot discard the whole chunk.
+        :param chunk: Processed-data dictionaries from the scoring stage.
+        :param progress_callback: Called once per item, exactly as in the per-candidate path.
+        :param digest_task_id: Bulk task whose HR digest collects the shortlisted candidates, if any.
+        """
+        for data in chunk:
+            data['email'] = self._candidate_email(data)
+
+        # One round trip finds every email in the chunk that is already registered (emails are unique across jobs).
+        existing_jobs = dict(
+            self.db.query(func.lower(Candidate.email), Candidate.job_description_id)
+            .filter(func.lower(Candidate.email).in_({data['email'].lower() for data in chunk}))
+            .all()
+        )
+
+        to_insert, outcomes = [], []
+        for data in chunk:
+            email_key = data['email'].lower()
+            if email_key in existing_jobs:
+                if existing_jobs[email_key] == jd.id:
+                    logger.warning(f"Duplicate candidate skipped: {data['email']} for job {jd.id}")
+                    outcomes.append(('duplicate', data, None))
+                else:
+                    outcomes.append(('failed', data, f"Email {data['email']} is already registered for another job."))
+                continue
+            existing_jobs[email_key] = jd.id  # Also catches repeats within this chunk
+            to_insert.append(data)
+
+        if to_insert:
+            try:
+                candidate_rows = [self._candidate_row(data, jd, data['ats_score'] >= ats_threshold) for data in to_insert]
+                self.db.execute(insert(Candidate), candidate_rows)
+                ids_by_email = dict(self.db.query(Candidate.email, Candidate.id).filter(Candidate.email.in_([row['email'] for row in candidate_rows])).all())
+                self.db.execute(insert(StatusHistory), [{
+                    "candidate_id": ids_by_email[row['email']],
+                    "status_code": StatusConstants.get_code(row['current_status']),
+                    "status_description": row['current_status'],
+                    "comments": f"ATS Score: {row['ats_score']}",
+                    "changed_by": changed_by,
+                } for row in candidate_rows])
+                pipeline_counters.record_created(self.db, jd.id, [row['current_status'] for row in candidate_rows])
+                candidate_search_index.index_candidates(self.db, list(ids_by_email.values()))
+                skill_matcher.record_candidates(self.db, list(ids_by_email.values()))
+                shortlisted_ids = [ids_by_email[row['email']] for row in candidate_rows
+                                   if row['current_status'] == StatusConstants.ATS_SHORTLISTED_DESCR]
+                if shortlisted_ids and digest_task_id and shortlist_digest.enabled:
+                    shortlist_digest.record(self.db, digest_task_id, jd.id, shortlisted_ids)
+                elif shortlisted_ids:
+                    # HR alerts are queued in the same transaction and sent by the outbox worker, not by this thread.
+                    for candidate in self.db.query(Candidate).filter(Candidate.id.in_(shortlisted_ids)).all():
+                        self.notification_service.queue_new_candidate_shortlisted(self.db, candidate, jd)
+                self.db.commit()
+                for data, row in zip(to_insert, candidate_rows):
+                    is_shortlisted = row['current_status'] == StatusConstants.ATS_SHORTLISTED_DESCR
+                    outcomes.append(('shortlisted' if is_shortlisted else 'rejected', data, None))
+                logger.info(f"Saved {len(candidate_rows)} candidates for job {jd.id} in one batch.")
+            except Exception as e:
+                self.db.rollback()
+                logger.error(f"Batched insert of {len(to_insert)} candidates failed, saving them one at a time: {e}")
+                for data in to_insert:
+                    is_shortlisted = data['ats_score'] >= ats_threshold
+                    try:
+                        self._create_candidate_from_processed_data(data, jd, changed_by, is_shortlisted, digest_task_id)
+                        self.db.commit()
+                        outcomes.append(('shortlisted' if is_shortlisted else 'rejected', data, None))
+                    except Exception as item_error:
+                        self.db.rollback()
+                        logger.error(f"Critical error creating candidate from processed data: {item_error}", exc_info=True)
+                        outcomes.append(('failed', data, str(item_error)))
+
+        if to_insert:
+            dashboard_stats_cache.invalidate()
+
+        if progress_callback:
+            for result_type, data, error in outcomes:
+                progress_callback(result_type, data.get('original_path'), error)
+
+    @staticmethod
+    def _candidate_email(data: dict) -> str:
+        """Returns the parsed email, or a unique placeholder derived from the file name when none was found."""
+        if data.get('email'):
+            return data['email']
         sanitized_filename = re.sub(r'[^\w.-]', '_', os.path.splitext(data.get('file_name', ''))[0])
-        email = data.get('email') or f"{sanitized_filename}_{uuid.uuid4().hex[:6]}@placeholder.email"
-        
-        # Prevent creating duplicate candidates for the same job
-        if self.db.query(Candidate).filter(func.lower(Candidate.email) == email.lower(), Candidate.job_description_id == jd.id).first():
-            logger.warning(f"Duplicate candidate skipped: {email} for job {jd.id}")
-            return
+        return f"{sanitized_filename}_{uuid.uuid4().hex[:6]}@placeholder.email"
 
+    @staticmethod
+    def _store_resume_file(data: dict):
+        """
+        Moves the uploaded resume into content-addressed permanent storage (`<sha256><ext>`) with a single
+        rename, and remembers the result on `data` so a retry of the same item never moves it twice.
+        Identical files share one stored copy, so the temp file is simply dropped when the content is already stored.
+        :return: The permanent resume path, or None if there was nothing to store.
+        """
+        if 'resume_path' in data:
+            return data['resume_path']
         permanent_resume_path = None
         temp_path = data.get('original_path')
 
-        if temp_path and os.path.exists(temp_path):
+        if temp_path and (is_archive_member(temp_path) or os.path.exists(temp_path)):
             try:
-                _, file_extension = os.path.splitext(temp_path)
-                unique_filename = f"{uuid.uuid4().hex}{file_extension}"
-                destination_path = os.path.join(config.RESUME_UPLOAD_FOLDER, unique_filename)
-                
-                shutil.copy(temp_path, destination_path)
-                permanent_resume_path = os.path.join(config.RESUME_UPLOAD_FOLDER, unique_filename).replace('\\', '/')
-                logger.info(f"Copied resume from {temp_path} to {destination_path}")
+                _, file_extension = os.path.splitext(member_file_name(temp_path))
+                sha = data.get('resume_sha256') or compute_file_sha256(temp_path)
+                destination_path = os.path.join(config.RESUME_UPLOAD_FOLDER, f"{sha}{file_extension.lower()}")
+
+                if is_archive_member(temp_path):
+                    # Archive members were only ever held in memory; this is their one and only write to disk.
+                    if not os.path.exists(destination_path):
+                        with open(f"{destination_path}.part", 'wb') as f:
+                            f.write(read_archive_member(temp_path))
+                        os.replace(f"{destination_path}.part", destination_path)
+                    logger.info(f"Stored archived resume {member_file_name(temp_path)} as {destination_path}")
+                elif os.path.exists(destination_path):
+                    os.remove(temp_path)
+                    logger.info(f"Resume {os.path.basename(temp_path)} is already stored as {destination_path}")
+                else:
+                    try:
+                        os.replace(temp_path, destination_path)
+                    except OSError:
+                        # Temp and permanent folders are on different filesystems; fall back to a copying move.
+                        shutil.move(temp_path, destination_path)
+                    logger.info(f"Moved resume from {temp_path} to {destination_path}")
+                permanent_resume_path = destination_path.replace('\\', '/')
             except Exception as e:
-                logger.error(f"Failed to copy resume file {temp_path}: {e}")
+                logger.error(f"Failed to store resume file {temp_path}: {e}")
+        data['resume_path'] = permanent_resume_path
+        return permanent_resume_path
 
+    def _candidate_row(self, data: dict, jd: JobDescription, is_shortlisted: bool) -> dict:
+        """Builds the Candidate column values for a processed resume."""
         status = StatusConstants.ATS_SHORTLISTED_DESCR if is_shortlisted else StatusConstants.ATS_DISCARDED_DESCR
-        new_candidate = Candidate(
-            first_name=data['first_name'], 
-            last_name=data['last_name'], 
-            email=email, 
-            phone_number=self._format_whatsapp_phone_number(data.get('phone_number')), 
-            job_description_id=jd.id, 
-            current_status=status, 
-            ats_score=data['ats_score'], 
-            ai_analysis=json.dumps(data.get('full_analysis', {})),
-            resume_path=permanent_resume_path
-        )
+        return {
+            "first_name": data['first_name'],
+            "last_name": data['last_name'],
+            "email": self._candidate_email(data),
+            "phone_number": self._format_whatsapp_phone_number(data.get('phone_number')),
+            "job_description_id": jd.id,
+            "current_status": status,
+            "ats_score": data['ats_score'],
+            "ai_analysis": json.dumps(data.get('full_analysis', {})),
+            "resume_path": self._store_resume_file(data),
+            "resume_text": data.get('resume_text'),
+            "resume_sha256": data.get('resume_sha256'),
+        }
+
+    def _create_candidate_from_processed_data(self, data: dict, jd: JobDescription, changed_by: str, is_shortlisted: bool, digest_task_id: str = None):
+        """
+        Helper function to create and save a single candidate record from processed data.
+        """
+        email = self._candidate_email(data)
+        
+        # Prevent creating duplicate candidates for the same job
+        if self.db.query(Candidate).filter(func.lower(Candidate.email) == email.lower(), Candidate.job_description_id == jd.id).first():
+            logger.warning(f"Duplicate candidate skipped: {email} for job {jd.id}")
+            return
+
+        new_candidate = Candidate(**self._candidate_row(dict(data, email=email), jd, is_shortlisted))
+        status = new_candidate.current_status
         self.db.add(new_candidate)
         self.db.flush() # Flush to get the new_candidate.id for the history record
         self._record_status_change(new_candidate.id, status, f"ATS Score: {new_candidate.ats_score}", changed_by)
+        pipeline_counters.record_created(self.db, jd.id, [status])
+        candidate_search_index.index_candidates(self.db, [new_candidate.id])
+        skill_matcher.record_candidates(self.db, [new_candidate.id])
         
-        if is_shortlisted:
-            self.notification_service.notify_new_candidate_shortlisted(new_candidate, jd)
+        if is_shortlisted and digest_task_id and shortlist_digest.enabled:
+            shortlist_digest.record(self.db, digest_task_id, jd.id, [new_candidate.id])
+        elif is_shortlisted:
+            self.notification_service.queue_new_candidate_shortlisted(self.db, new_candidate, jd)
+
+    def _filtered_candidates_query(self, status: list[str] = None, job_id: int = None, search_query: str = None):
+        """Builds the candidate query for the given filters, without ordering."""
+        q = self.db.query(Candidate)
+        if status:
+            q = q.filter(Candidate.current_status.in_(status))
+        if job_id:
+            q = q.filter(Candidate.job_description_id == job_id)
+        if search_query:
+            # Served by the full-text index: each word matches a prefix of a name, email, job title, skill or resume word.
+            matching_ids = candidate_search_index.filter_ids(self.db, search_query)
+            if matching_ids is not None:
+                q = q.filter(Candidate.id.in_(matching_ids))
+        return q
 
     def get_candidates(self, status: str = None, job_id: int = None, search_query: str = None, paginated: bool = False):
         """
@@ -277,29 +579,103 @@ class HiringService:
         :param paginated: If True, returns a tuple of (query, total_count). Otherwise, returns a list of results.
         :return: Either a tuple (query, total_count) or a list of Candidate objects.
         """
-        q = self.db.query(Candidate)
-        if status:
-            q = q.filter(Candidate.current_status.in_(status))
-        if job_id:
-            q = q.filter(Candidate.job_description_id == job_id)
-        if search_query:
-            term = f"%{search_query.lower()}%"
-            jd_alias = aliased(JobDescription)
-            q = q.join(jd_alias, Candidate.job_description_id == jd_alias.id).filter(
-                or_(
-                    func.lower(Candidate.first_name).like(term),
-                    func.lower(Candidate.last_name).like(term),
-                    func.lower(Candidate.email).like(term),
-                    func.lower(jd_alias.title).like(term)
-                )
-            )
-        
+        q = self._filtered_candidates_query(status, job_id, search_query)
         if paginated:
-            total_count = q.count()
-            ordered_query = q.order_by(Candidate.updated_at.desc())
+            total_count = self.count_candidates(status, job_id, search_query)
+            ordered_query = q.order_by(Candidate.updated_at.desc(), Candidate.id.desc())
             return ordered_query, total_count
         else:
-            return q.order_by(Candidate.updated_at.desc()).all()
+            return q.order_by(Candidate.updated_at.desc(), Candidate.id.desc()).all()
+
+    def count_candidates(self, status: list[str] = None, job_id: int = None, search_query: str = None) -> int:
+        """
+        Returns the number of candidates matching the filters.
+        Without a search term the total is summed from the pipeline counters (a few rows per job);
+        with one, the COUNT is cached briefly so paging through results does not repeat it.
+        """
+        if not search_query:
+            totals = pipeline_counters.status_totals(self.db) if not job_id else {
+                row.status: row.count for row in self.db.query(PipelineCounter).filter(PipelineCounter.job_description_id == job_id).all()
+            }
+            return sum(n for s, n in totals.items() if not status or s in status)
+
+        cache_key = (tuple(sorted(status or [])), job_id, search_query.lower())
+        return _candidate_count_cache.get_or_compute(
+            cache_key, lambda: self._filtered_candidates_query(status, job_id, search_query).count()
+        )
+
+    def get_candidates_page(self, status: list[str] = None, job_id: int = None, search_query: str = None,
+                            limit: int = 10, cursor: str = None, page: int = None, include_total: bool = True) -> dict:
+        """
+        Returns one page of candidates ordered by (updated_at, id), newest first.
+        With a cursor, the page starts right after the row the cursor points to (keyset pagination), so every
+        page costs the same no matter how deep it is. Without one, `page` falls back to OFFSET paging.
+        :param cursor: The `next_cursor` returned with the previous page.
+        :param page: 1-based page number, used only when no cursor is given.
+        :param include_total: If False, the total is not computed and is returned as None.
+        :return: {"candidates": [Candidate], "next_cursor": str or None, "total": int or None}
+        """
+        q = self._filtered_candidates_query(status, job_id, search_query).options(joinedload(Candidate.job_description))
+        if cursor:
+            updated_at, last_id = decode_cursor(cursor)
+            q = q.filter(or_(
+                Candidate.updated_at < updated_at,
+                (Candidate.updated_at == updated_at) & (Candidate.id < last_id)
+            ))
+        q = q.order_by(Candidate.updated_at.desc(), Candidate.id.desc())
+        if not cursor and page and page > 1:
+            q = q.offset((page - 1) * limit)
+
+        # One extra row tells us whether there is a next page without counting.
+        rows = q.limit(limit + 1).all()
+        candidates = rows[:limit]
+        next_cursor = encode_cursor(candidates[-1].updated_at, candidates[-1].id) if len(rows) > limit else None
+        total = self.count_candidates(status, job_id, search_query) if include_total else None
+        return {"candidates": candidates, "next_cursor": next_cursor, "total": total}
+
+    def _load_ranked_candidates(self, ranked: list[tuple[int, float]]) -> list[tuple[Candidate, float]]:
+        if not ranked:
+            return []
+        by_id = {c.id: c for c in self.db.query(Candidate).options(joinedload(Candidate.job_description)).filter(
+            Candidate.id.in_([candidate_id for candidate_id, _ in ranked])
+        ).all()}
+        return [(by_id[candidate_id], score) for candidate_id, score in ranked if candidate_id in by_id]
+
+    def search_candidates(self, search_query: str, job_id: int = None, limit: int = 50) -> list[tuple[Candidate, float]]:
+        """
+        Full-text search over names, email, job title, skills and resume text, best match first.
+        :return: A list of (Candidate, relevance score) tuples.
+        """
+        return self._load_ranked_candidates(candidate_search_index.search(self.db, search_query, job_id=job_id, limit=limit))
+
+    def search_candidates_by_skills(self, skills: list[str], job_id: int = None, match_all: bool = False, limit: int = 50) -> list[tuple[Candidate, float]]:
+        """
+        Finds candidates whose matched skills or resume text mention the given skills, best match first.
+        :param match_all: If True, a candidate must mention every skill.
+        :return: A list of (Candidate, relevance score) tuples.
+        """
+        if not skills:
+            raise ValidationError("At least one skill is required.")
+        return self._load_ranked_candidates(candidate_search_index.search_skills(self.db, skills, job_id=job_id, match_all=match_all, limit=limit))
+
+    def match_candidates_to_job(self, job_id: int, limit: int = 20, method: str = 'bm25', include_applicants: bool = False) -> list[dict]:
+        """
+        Ranks all existing candidates against a job description with the local skill matcher (no LLM calls).
+        :param method: 'bm25' or 'cosine'.
+        :param include_applicants: If False, candidates who already applied to this job are left out.
+        :return: [{"candidate": Candidate, "score": float, "matched_terms": [str]}], best match first.
+        :raises NotFoundError: If the job does not exist.
+        :raises ValidationError: If the method is not supported.
+        """
+        jd = self.get_job_description(job_id)
+        if method not in skill_matcher.METHODS:
+            raise ValidationError(f"Unsupported match method '{method}'. Use one of: {', '.join(skill_matcher.METHODS)}.")
+        matches = skill_matcher.rank(self.db, jd.title, jd.description_text, limit=limit, method=method,
+                                     exclude_job_id=None if include_applicants else jd.id)
+        by_id = {c.id: c for c in self.db.query(Candidate).options(joinedload(Candidate.job_description)).filter(
+            Candidate.id.in_([m["candidate_id"] for m in matches])
+        ).all()} if matches else {}
+        return [dict(match, candidate=by_id[match["candidate_id"]]) for match in matches if match["candidate_id"] in by_id]
 
     def bulk_delete_candidates(self, c_ids: list[int]):
         """
@@ -310,7 +686,19 @@ class HiringService:
         try:
             # Step 1: Find the candidates to get their resume paths BEFORE deleting them.
             candidates_to_delete = self.db.query(Candidate).filter(Candidate.id.in_(c_ids)).all()
-            resume_paths_to_delete = [c.resume_path for c in candidates_to_delete if c.resume_path]
+            resume_paths = {c.resume_path for c in candidates_to_delete if c.resume_path}
+            # Resumes are content-addressed, so a file may also belong to a candidate that is not being deleted.
+            still_referenced = {
+                row.resume_path for row in self.db.query(Candidate.resume_path).filter(
+                    Candidate.resume_path.in_(resume_paths), ~Candidate.id.in_(c_ids)
+                ).all()
+            } if resume_paths else set()
+            resume_paths_to_delete = resume_paths - still_referenced
+            pipeline_counters.record_deleted(self.db, candidates_to_delete)
+            candidate_search_index.remove_candidates(self.db, c_ids)
+            skill_matcher.remove_candidates(self.db, c_ids)
+            notification_outbox.remove_candidates(self.db, c_ids)
+            shortlist_digest.remove_candidates(self.db, c_ids)
 
             # Step 2: Delete all database child records first.
             self.db.query(Interview).filter(Interview.candidate_id.in_(c_ids)).delete(synchronize_session=False)
@@ -351,9 +739,12 @@ class HiringService:
                 self.bulk_delete_candidates(candidate_ids_to_delete)
 
             # Now, it's safe to delete the jobs themselves
+            pipeline_counters.delete_jobs(self.db, j_ids)
+            self.db.query(PrescreenOutcome).filter(PrescreenOutcome.job_description_id.in_(j_ids)).delete(synchronize_session=False)
             self.db.query(JobDescription).filter(JobDescription.id.in_(j_ids)).delete(synchronize_session=False)
             
             self.db.commit()
+            dashboard_stats_cache.invalidate()
             logger.info(f"Successfully deleted {len(j_ids)} jobs and their related candidates.")
         except Exception as e:
             self.db.rollback()
@@ -373,17 +764,15 @@ class HiringService:
         if new_status not in self.status_configs["all_status_options"]:
             raise ValidationError(f"Invalid status: '{new_status}'")
             
+        pipeline_counters.record_status_change(self.db, candidate.job_description_id, candidate.current_status, new_status)
         candidate.current_status = new_status
         self._record_status_change(candidate.id, new_status, comments, changed_by)
+        # The email is committed with the status change and delivered by the outbox worker, so a slow or
+        # unreachable mail server never delays this request.
+        self.notification_service.queue_candidate_status_update(self.db, [candidate.id], new_status)
         self.db.commit()
+        dashboard_stats_cache.invalidate()
         self.db.refresh(candidate)
-        
-        try:
-            self.notification_service.send_candidate_status_update(candidate, new_status)
-        except Exception as e:
-            logger.error(f"Failed to send email for status update to {c_id}: {e}")
-            # Do not re-raise, the status update itself was successful
-            
         return candidate
 
     def reschedule_interview(self, candidate_id: int, comments: str, changed_by: str) -> Candidate:
@@ -418,10 +807,12 @@ class HiringService:
         if last_history_entry:
             last_history_entry.comments = (last_history_entry.comments or '') + f" [Reschedule reason: {comments}]"
             
+        pipeline_counters.record_status_change(self.db, candidate.job_description_id, current_status, new_status)
         candidate.current_status = new_status
         self._record_status_change(candidate.id, new_status, "Awaiting new interview time.", changed_by)
         
         self.db.commit()
+        dashboard_stats_cache.invalidate()
         self.db.refresh(candidate)
         logger.info(f"Candidate {candidate_id} rescheduled from '{current_status}' to '{new_status}'.")
         return candidate
@@ -434,32 +825,43 @@ class HiringService:
         :param subject: The subject of the message (for email).
         :param message: The body of the message.
         :param changed_by: Identifier for who sent the notification.
-        :return: A summary dictionary of success and fail counts.
-        """
-        summary = {"success": 0, "failed": 0}
-        candidates = self.db.query(Candidate).filter(Candidate.id.in_(candidate_ids)).all()
-        
+        :return: A summary dictionary of success and fail counts, plus "results": {candidate_id: {"status", "error", ...}}.
+        :raises ValidationError: If the subject or message uses an unknown or malformed placeholder; nothing is sent.
+        """
+        summary = {"success": 0, "failed": 0, "results": {}}
+        # Both templates are compiled (and their placeholders checked) before any candidate is loaded or messaged.
+        if channel == 'email':
+            subject_template = compile_template(subject or "", "subject")
+            body_template = compile_template(message.replace('\n', '<br>'), "message")
+        else:
+            body_template = compile_template(message, "message")
+        candidates = load_recipients(self.db, candidate_ids)
+        contexts = [c.context for c in candidates]
+
+        # Messages go out concurrently (pooled SMTP connections / the rate-limited WhatsApp dispatcher);
+        # each candidate's outcome is recorded below.
+        if channel == 'email':
+            errors = self.notification_service.send_emails(list(zip(
+                [c.email for c in candidates], subject_template.render_batch(contexts), body_template.render_batch(contexts)
+            )))
+            results = {c.id: {"status": "failed" if error else "sent", "error": str(error) if error else None}
+                       for c, error in zip(candidates, errors)}
+        elif channel == 'whatsapp':
+            results = self.whatsapp_service.send_bulk({
+                c.id: (c.phone_number, body) for c, body in zip(candidates, body_template.render_batch(contexts)) if c.phone_number
+            })
+        else:
+            results = {}
+
         for c in candidates:
-            try:
-                name = f"{c.first_name} {c.last_name}".strip()
-                job = c.job_description.title if c.job_description else "the role"
-                
-                # Personalize message with placeholders
-                p_subject = subject.replace("{candidate_name}", name).replace("{job_title}", job) if subject else None
-                p_message = message.replace("{candidate_name}", name).replace("{job_title}", job)
-
-                if channel == 'email':
-                    self.notification_service.send_email(c.email, p_subject, p_message.replace('\n', '<br>'))
-                elif channel == 'whatsapp' and c.phone_number:
-                    self.whatsapp_service.send_whatsapp_message(c.phone_number, p_message)
-                else:
-                    raise ValueError(f"Channel '{channel}' not supported or phone missing.")
-                
+            result = results.get(c.id) or {"status": "failed", "error": f"Channel '{channel}' not supported or phone missing."}
+            summary["results"][c.id] = result
+            if result["status"] == "sent":
                 self._record_status_change(c.id, f"Bulk {channel.capitalize()} Sent", changed_by=changed_by)
                 summary["success"] += 1
-            except Exception as e:
-                logger.error(f"Failed to send {channel} to candidate {c.id}: {e}")
-                self._record_status_change(c.id, f"Bulk {channel.capitalize()} Failed", comments=str(e), changed_by="System")
+            else:
+                logger.error(f"Failed to send {channel} to candidate {c.id}: {result['error']}")
+                self._record_status_change(c.id, f"Bulk {channel.capitalize()} Failed", comments=result["error"], changed_by="System")
                 summary["failed"] += 1
         
         self.db.commit()
@@ -486,6 +888,8 @@ class HiringService:
         # Use the corrected parameter name 'job_id' here
         jd = self.get_job_description(job_id) 
         try:
+            if jd.title != title:
+                candidate_search_index.update_job_title(self.db, jd.id, title)
             jd.title = title
             jd.description_text = desc
             jd.location = location
@@ -0,0 +1,476 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/job_queue.py
+# =============================================================================
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, or_, and_
+
+from config.config_loader import config
+from database.database import SessionLocal, BackgroundSessionLocal
+from logger.logger import logger
+from model.models import BulkJob, BulkJobItem
+from src.helpers import cleanup_directory
+from src.archive_ingest import release_archives
+from src.cancellation import CancellationToken
+from src.shortlist_digest import shortlist_digest
+
+ITEM_RESULT_TYPES = ('shortlisted', 'rejected', 'failed', 'duplicate', 'deferred')
+DEFERRED_RUN_PRIORITY = -1  # Deferred resumes are only picked up when no normal job is waiting
+ACTIVE_JOB_STATUSES = ('pending', 'processing')
+
+
+class JobCancellationToken(CancellationToken):
+    """
+    Cancellation token backed by the job row, so a cancel request made through any worker process
+    reaches the process running the job. The DB is polled at most once every `check_interval` seconds.
+    """
+    def __init__(self, job_queue, job_id: str, check_interval: float = 2.0):
+        super().__init__()
+        self.job_queue = job_queue
+        self.job_id = job_id
+        self.check_interval = check_interval
+        self._last_check = 0.0
+        self._check_lock = threading.Lock()
+
+    def is_cancelled(self) -> bool:
+        if super().is_cancelled():
+            return True
+        with self._check_lock:
+            now = time.monotonic()
+            if now - self._last_check >= self.check_interval:
+                self._last_check = now
+                if self.job_queue.is_cancel_requested(self.job_id):
+                    self.cancel()
+        return super().is_cancelled()
+
+
+class BulkJobQueue:
+    """
+    Durable, DB-backed queue for bulk resume processing jobs.
+    Every job stores one item per uploaded file, so progress is visible to any worker process
+    and unfinished items can be picked up again after a crash or restart.
+    Calls made by the worker use the background connection pool; calls made from API requests use the API pool.
+    """
+    def __init__(self):
+        self.stale_after = timedelta(seconds=config.JOB_STALE_AFTER_SECONDS)
+
+    def enqueue(self, db, task_id: str, jd_id: int, job_title: str, ats_threshold: float, changed_by: str, temp_dir: str, file_paths: list[str], receiving: bool = False) -> BulkJob:
+        """
+        Creates a pending job and one pending item per file in a single transaction.
+        :param receiving: True if more files will be added with `add_items`; the worker keeps the job open
+                          and processes files as they arrive until `complete_upload` is called.
+        :return: The newly created BulkJob.
+        """
+        job = BulkJob(
+            id=task_id,
+            job_description_id=jd_id,
+            job_title=job_title,
+            ats_threshold=ats_threshold,
+            changed_by=changed_by,
+            temp_dir=temp_dir,
+            status='pending',
+            total=len(file_paths),
+            is_receiving=receiving,
+        )
+        db.add(job)
+        db.add_all([BulkJobItem(job_id=task_id, file_path=fp, status='pending') for fp in file_paths])
+        db.commit()
+        logger.info(f"Queued bulk job {task_id} with {len(file_paths)} files.")
+        return job
+
+    def get_receiving_upload_dir(self, job_id: str):
+        """Returns the upload folder of a job that is still accepting files, or None otherwise."""
+        db = SessionLocal()
+        try:
+            row = db.query(BulkJob.temp_dir).filter(
+                BulkJob.id == job_id, BulkJob.is_receiving.is_(True), BulkJob.status.in_(ACTIVE_JOB_STATUSES)
+            ).first()
+            return row.temp_dir if row else None
+        finally:
+            db.close()
+
+    def add_items(self, job_id: str, file_paths: list[str]) -> bool:
+        """
+        Adds newly uploaded files (or archive members) to a job that is still receiving files,
+        so the worker picks them up right away.
+        :return: False if the job is no longer accepting files.
+        """
+        db = SessionLocal()
+        try:
+            updated = db.query(BulkJob).filter(
+                BulkJob.id == job_id, BulkJob.is_receiving.is_(True), BulkJob.status.in_(ACTIVE_JOB_STATUSES)
+            ).update({BulkJob.total: BulkJob.total + len(file_paths)}, synchronize_session=False)
+            if updated:
+                db.add_all([BulkJobItem(job_id=job_id, file_path=fp, status='pending') for fp in file_paths])
+            db.commit()
+            return bool(updated)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to add {len(file_paths)} files to bulk job {job_id}: {e}")
+            return False
+        finally:
+            db.close()
+
+    def is_receiving(self, job_id: str) -> bool:
+        db = BackgroundSessionLocal()
+        try:
+            row = db.query(BulkJob.is_receiving).filter(BulkJob.id == job_id).first()
+            return bool(row and row.is_receiving)
+        finally:
+            db.close()
+
+    def complete_upload(self, job_id: str) -> bool:
+        """
+        Marks a job as fully uploaded; the worker finishes it once every received file is processed.
+        :return: True if the job was still receiving files.
+        """
+        db = SessionLocal()
+        try:
+            updated = db.query(BulkJob).filter(BulkJob.id == job_id, BulkJob.is_receiving.is_(True)).update(
+                {"is_receiving": False}, synchronize_session=False
+            )
+            db.commit()
+            return bool(updated)
+        finally:
+            db.close()
+
+    def claim_next_job(self, worker_id: str):
+        """
+        Atomically claims the oldest pending job of the highest priority, or a processing job whose worker stopped heart-beating.
+        :return: The claimed job ID, or None if there is nothing to do.
+        """
+        db = BackgroundSessionLocal()
+        try:
+            stale_before = datetime.utcnow() - self.stale_after
+            claimable = or_(
+                BulkJob.status == 'pending',
+                and_(BulkJob.status == 'processing', or_(BulkJob.heartbeat_at.is_(None), BulkJob.heartbeat_at < stale_before)),
+            )
+            candidates = db.query(BulkJob.id).filter(claimable).order_by(BulkJob.priority.desc(), BulkJob.created_at.asc()).limit(5).all()
+            for (job_id,) in candidates:
+                now = datetime.utcnow()
+                # The conditional UPDATE is the lock: only one worker can move a job out of the claimable state.
+                claimed = db.query(BulkJob).filter(BulkJob.id == job_id, claimable).update(
+                    {"status": 'processing', "worker_id": worker_id, "heartbeat_at": now, "started_at": now},
+                    synchronize_session=False
+                )
+                db.commit()
+                if claimed:
+                    logger.info(f"Worker {worker_id} claimed bulk job {job_id}.")
+                    return job_id
+            return None
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to claim a bulk job: {e}")
+            return None
+        finally:
+            db.close()
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Refreshes the lease on a job. Returns False if the job is no longer held by this worker."""
+        db = BackgroundSessionLocal()
+        try:
+            updated = db.query(BulkJob).filter(BulkJob.id == job_id, BulkJob.worker_id == worker_id).update(
+                {"heartbeat_at": datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+            return bool(updated)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Heartbeat failed for bulk job {job_id}: {e}")
+            return True
+        finally:
+            db.close()
+
+    def get_pending_file_paths(self, job_id: str) -> list[str]:
+        db = BackgroundSessionLocal()
+        try:
+            rows = db.query(BulkJobItem.file_path).filter(BulkJobItem.job_id == job_id, BulkJobItem.status == 'pending').order_by(BulkJobItem.id).all()
+            return [row.file_path for row in rows]
+        finally:
+            db.close()
+
+    def record_item_outcome(self, job_id: str, file_path: str, result_type: str, error: str = None):
+        """Marks one item as finished and bumps the job's counters in the same transaction."""
+        if result_type not in ITEM_RESULT_TYPES:
+            result_type = 'failed'
+        db = BackgroundSessionLocal()
+        try:
+            updated = db.query(BulkJobItem).filter(
+                BulkJobItem.job_id == job_id, BulkJobItem.file_path == file_path, BulkJobItem.status == 'pending'
+            ).update({"status": result_type, "error": error}, synchronize_session=False)
+            if updated:
+                db.query(BulkJob).filter(BulkJob.id == job_id).update({
+                    BulkJob.processed: BulkJob.processed + 1,
+                    getattr(BulkJob, result_type): getattr(BulkJob, result_type) + 1,
+                    BulkJob.heartbeat_at: datetime.utcnow(),
+                }, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to record outcome for {file_path} in bulk job {job_id}: {e}")
+        finally:
+            db.close()
+
+    def finish_job(self, job_id: str, worker_id: str, status: str, error: str = None) -> bool:
+        """
+        Moves a job to a terminal state, unless it was cancelled in the meantime.
+        A job that still has pending items is marked failed rather than completed, and its uploaded
+        files are kept so it can be resumed; the upload folder is only removed once nothing is pending.
+        The update is conditional on `worker_id` still holding the job, so a worker that lost its lease
+        can never overwrite the new holder's state or delete its files.
+        :return: True if the job was finished by this worker.
+        """
+        db = BackgroundSessionLocal()
+        try:
+            job = db.query(BulkJob).filter(BulkJob.id == job_id, BulkJob.worker_id == worker_id).first()
+            if not job:
+                logger.warning(f"Bulk job {job_id} is no longer held by worker {worker_id}; leaving its state untouched.")
+                return False
+            pending_count = db.query(BulkJobItem.id).filter(BulkJobItem.job_id == job_id, BulkJobItem.status == 'pending').count()
+            deferred_count = db.query(BulkJobItem.id).filter(BulkJobItem.job_id == job_id, BulkJobItem.status == 'deferred').count()
+            if status == 'completed' and pending_count:
+                status, error = 'failed', f"{pending_count} files were not processed; the task can be resumed."
+            finished = db.query(BulkJob).filter(BulkJob.id == job_id, BulkJob.worker_id == worker_id).update({
+                "is_receiving": False,
+                # A cancel request that lands while the job finishes still wins.
+                "status": case((BulkJob.status == 'cancelled', 'cancelled'), else_=status),
+                "error": error,
+                "finished_at": datetime.utcnow(),
+                "worker_id": None,
+            }, synchronize_session=False)
+            temp_dir = job.temp_dir if finished and not pending_count and not deferred_count else None  # Deferred files are run later
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to finish bulk job {job_id}: {e}")
+            return False
+        finally:
+            db.close()
+        if temp_dir:
+            release_archives(temp_dir)
+            cleanup_directory(temp_dir)
+        return bool(finished)
+
+    def _released(self):
+        """Jobs no worker is running: finished ones, or ones whose worker stopped heart-beating (e.g. it crashed)."""
+        return or_(BulkJob.worker_id.is_(None), BulkJob.heartbeat_at < datetime.utcnow() - self.stale_after)
+
+    def resume_job(self, job_id: str) -> bool:
+        """
+        Re-queues a cancelled or failed job so a worker processes its remaining pending items.
+        Items that already have an outcome are never processed again. A cancelled job is only re-queued once
+        the worker running it has stopped, so two workers never process the same job.
+        :return: True if the job was re-queued.
+        """
+        db = SessionLocal()
+        try:
+            has_pending = db.query(BulkJobItem.id).filter(BulkJobItem.job_id == job_id, BulkJobItem.status == 'pending').first() is not None
+            if not has_pending:
+                return False
+            resumed = db.query(BulkJob).filter(BulkJob.id == job_id, BulkJob.status.in_(('cancelled', 'failed')), self._released()).update(
+                {"status": 'pending', "error": None, "finished_at": None, "worker_id": None, "heartbeat_at": None},
+                synchronize_session=False
+            )
+            db.commit()
+            if resumed:
+                logger.info(f"Bulk job {job_id} re-queued to resume its pending items.")
+            return bool(resumed)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to resume bulk job {job_id}: {e}")
+            return False
+        finally:
+            db.close()
+
+    def run_deferred(self, job_id: str) -> int:
+        """
+        Sends the resumes a job's pre-screen deferred to the LLM: they become pending again and the job is
+        re-queued below normal priority, with the pre-screen set to observe only.
+        :return: The number of re-queued items (0 if there were none or the job is still active).
+        """
+        db = SessionLocal()
+        try:
+            job = db.query(BulkJob).filter(BulkJob.id == job_id, BulkJob.status.notin_(ACTIVE_JOB_STATUSES), self._released()).first()
+            if not job:
+                return 0
+            requeued = db.query(BulkJobItem).filter(BulkJobItem.job_id == job_id, BulkJobItem.status == 'deferred').update(
+                {"status": 'pending', "error": None}, synchronize_session=False
+            )
+            if requeued:
+                job.processed = BulkJob.processed - requeued
+                job.deferred = BulkJob.deferred - requeued
+                job.status, job.error, job.finished_at, job.worker_id, job.heartbeat_at = 'pending', None, None, None, None
+                job.priority, job.skip_prescreen = DEFERRED_RUN_PRIORITY, True
+            db.commit()
+            if requeued:
+                logger.info(f"Bulk job {job_id} re-queued {requeued} deferred resumes at low priority.")
+            return requeued
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to re-queue deferred items of bulk job {job_id}: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def get_status(self, job_id: str):
+        """Returns the job's current status, or None if the job does not exist."""
+        db = SessionLocal()
+        try:
+            row = db.query(BulkJob.status).filter(BulkJob.id == job_id).first()
+            return row.status if row else None
+        finally:
+            db.close()
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        """The worker's cancellation poll; reads through the background pool so it never waits on API traffic."""
+        db = BackgroundSessionLocal()
+        try:
+            row = db.query(BulkJob.status).filter(BulkJob.id == job_id).first()
+            return row is not None and row.status == 'cancelled'
+        finally:
+            db.close()
+
+    def request_cancel(self, job_id: str):
+        """
+        Flags an active job as cancelled.
+        :return: The job's status after the request, or None if the job does not exist.
+        """
+        db = SessionLocal()
+        try:
+            job = db.query(BulkJob).filter(BulkJob.id == job_id).first()
+            if not job:
+                return None
+            if job.status in ACTIVE_JOB_STATUSES:
+                job.status = 'cancelled'
+                db.commit()
+                logger.info(f"User requested cancellation for task {job_id}")
+            return job.status
+        finally:
+            db.close()
+
+    @staticmethod
+    def to_progress_dict(job: BulkJob) -> dict:
+        return {
+            "status": job.status, "total": job.total, "processed": job.processed,
+            "shortlisted": job.shortlisted, "rejected": job.rejected, "failed": job.failed, "duplicate": job.duplicate,
+            "deferred": job.deferred or 0,
+            "job_title": job.job_title, "started_at": (job.started_at or job.created_at).isoformat() if (job.started_at or job.created_at) else None,
+        }
+
+    def get_active_jobs(self, db) -> dict:
+        """Returns progress for every pending or processing job, keyed by task ID."""
+        jobs = db.query(BulkJob).filter(BulkJob.status.in_(ACTIVE_JOB_STATUSES)).order_by(BulkJob.created_at.asc()).all()
+        return {job.id: self.to_progress_dict(job) for job in jobs}
+
+
+class BulkJobWorker(threading.Thread):
+    """
+    Background worker that claims queued bulk jobs and runs them through HiringService.
+    One worker runs in every application process; the claim protocol ensures each job is processed by one at a time.
+    """
+    def __init__(self, job_queue: BulkJobQueue):
+        super().__init__(name="bulk-job-worker", daemon=True)
+        self.queue = job_queue
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.poll_seconds = config.JOB_WORKER_POLL_SECONDS
+        self.heartbeat_seconds = config.JOB_HEARTBEAT_SECONDS
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        logger.info(f"Bulk job worker {self.worker_id} started.")
+        while not self._stop_event.is_set():
+            job_id = self.queue.claim_next_job(self.worker_id)
+            if not job_id:
+                self._stop_event.wait(self.poll_seconds)
+                continue
+            self._process_job(job_id)
+
+    def _heartbeat_loop(self, job_id: str, done: threading.Event, cancel_token: CancellationToken):
+        last_digest = time.monotonic()
+        while not done.wait(self.heartbeat_seconds):
+            if not self.queue.heartbeat(job_id, self.worker_id):
+                # Another worker reclaimed the job; stop spending LLM quota on it here.
+                logger.warning(f"Worker {self.worker_id} lost its lease on bulk job {job_id}; stopping.")
+                cancel_token.cancel()
+                return
+            # Long tasks send HR an interim digest every interval rather than making them wait for the end.
+            if shortlist_digest.enabled and shortlist_digest.interval_seconds and time.monotonic() - last_digest >= shortlist_digest.interval_seconds:
+                shortlist_digest.flush(job_id, final=False)
+                last_digest = time.monotonic()
+
+    def _process_job(self, job_id: str):
+        # Imported here to avoid loading the AI/notification stack until a job actually runs.
+        from src.hiring_service import HiringService
+
+        done = threading.Event()
+        cancel_token = JobCancellationToken(self.queue, job_id)
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(job_id, done, cancel_token), daemon=True)
+        heartbeat.start()
+
+        db = BackgroundSessionLocal()
+        send_digest = True
+        try:
+            job = db.query(BulkJob).filter(BulkJob.id == job_id).first()
+            jd_id, ats_threshold, changed_by = job.job_description_id, job.ats_threshold, job.changed_by
+            skip_prescreen = bool(job.skip_prescreen)
+            hiring_service = HiringService(db)
+
+            def progress_callback(result_type: str, file_path: str, error: str = None):
+                self.queue.record_item_outcome(job_id, file_path, result_type, error)
+
+            # Files can keep arriving while the job runs (chunked uploads), so work in rounds: process whatever
+            # is pending, then look again until the upload is complete and nothing new has landed.
+            attempted, last_activity = set(), time.monotonic()
+            while not cancel_token.is_cancelled():
+                receiving = self.queue.is_receiving(job_id)
+                pending_paths = [fp for fp in self.queue.get_pending_file_paths(job_id) if fp not in attempted]
+                if not pending_paths:
+                    if not receiving:
+                        break
+                    if time.monotonic() - last_activity > config.UPLOAD_SESSION_IDLE_SECONDS:
+                        logger.warning(f"Upload for task {job_id} went idle; finishing with the files received so far.")
+                        break
+                    self._stop_event.wait(self.poll_seconds)
+                    continue
+
+                attempted.update(pending_paths)
+                last_activity = time.monotonic()
+                logger.info(f"Starting background processing for task {job_id} ({len(pending_paths)} pending files).")
+                hiring_service.bulk_process_and_shortlist_resumes(
+                    resume_file_paths=pending_paths,
+                    jd_id=jd_id,
+                    ats_threshold=ats_threshold,
+                    changed_by=changed_by,
+                    progress_callback=progress_callback,
+                    cancel_token=cancel_token,
+                    prescreen=not skip_prescreen,
+                    digest_task_id=job_id
+                )
+
+            # If another worker took the job over, it sends the digest, including whatever this worker recorded.
+            cancelled = cancel_token.is_cancelled()
+            send_digest = self.queue.finish_job(job_id, self.worker_id, 'cancelled' if cancelled else 'completed')
+            if send_digest:
+                logger.info(f"Background processing for task {job_id} {'stopped after cancellation' if cancelled else 'completed'}.")
+        except Exception as e:
+            logger.error(f"Background processing for task {job_id} failed critically: {e}", exc_info=True)
+            send_digest = self.queue.finish_job(job_id, self.worker_id, 'failed', str(e))
+        finally:
+            done.set()
+            db.close()
+            if send_digest and shortlist_digest.enabled:
+                # Sent however the task ended: candidates shortlisted before a cancel or failure are still saved.
+                heartbeat.join()
+                shortlist_digest.flush(job_id)
+
+
+bulk_job_queue = BulkJobQueue()
@@ -0,0 +1,189 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/llm_client.py
+# =============================================================================
+import abc
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+from config.config_loader import config
+from logger.logger import logger
+from src.rate_limiter import TokenBucket, AdaptiveConcurrencyLimiter
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TransientLLMError(Exception):
+    """Raised by the fake backend to simulate a throttled or failed upstream request."""
+    def __init__(self, message: str, code: int = 429):
+        super().__init__(message)
+        self.code = code
+
+
+def _status_code_of(error: Exception):
+    """Best-effort extraction of an HTTP status code from a google-api-core or fake-backend error."""
+    code = getattr(error, "code", None)
+    if callable(code):  # grpc errors expose code() instead of an int attribute
+        code = None
+    if isinstance(code, int):
+        return code
+    match = re.match(r"^\s*(\d{3})\b", str(error))
+    return int(match.group(1)) if match else None
+
+
+class RateLimitedLLMClient(abc.ABC):
+    """
+    Base client that wraps every request with a requests/min and tokens/min token bucket,
+    an adaptive concurrency limiter, and exponential backoff with jitter on 429/5xx responses.
+    Subclasses implement `_send(prompt)`, returning the raw response text.
+    """
+    def __init__(self):
+        self.request_bucket = TokenBucket(config.LLM_REQUESTS_PER_MINUTE)
+        self.token_bucket = TokenBucket(config.LLM_TOKENS_PER_MINUTE)
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial=config.LLM_MAX_CONCURRENCY,
+            minimum=config.LLM_MIN_CONCURRENCY,
+            maximum=config.LLM_MAX_CONCURRENCY,
+        )
+        self.max_retries = config.LLM_MAX_RETRIES
+        self.backoff_base = config.LLM_BACKOFF_BASE_SECONDS
+        self.backoff_max = config.LLM_BACKOFF_MAX_SECONDS
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "succeeded": 0, "failed": 0, "retries": 0, "throttled": 0, "rate_limit_wait_seconds": 0.0}
+
+    @staticmethod
+    def estimate_tokens(prompt: str, expected_output_tokens: int = 800) -> int:
+        # Roughly 4 characters per token for English text; good enough for quota pacing.
+        return len(prompt) // 4 + expected_output_tokens
+
+    def _count(self, stat: str, n=1):
+        with self._stats_lock:
+            self._stats[stat] += n
+
+    @abc.abstractmethod
+    def _send(self, prompt: str) -> str:
+        """Sends one request to the backend and returns the raw response text."""
+
+    def generate_json(self, prompt: str) -> str:
+        """
+        Sends a prompt that must be answered with JSON and returns the raw response text.
+        Retries retryable errors with exponential backoff and jitter, re-raising the last error when out of retries.
+        """
+        estimated_tokens = self.estimate_tokens(prompt)
+        attempt = 0
+        while True:
+            waited = self.request_bucket.acquire(1) + self.token_bucket.acquire(estimated_tokens)
+            self._count("requests")
+            if waited:
+                self._count("rate_limit_wait_seconds", waited)
+            try:
+                with self.concurrency.slot():
+                    response_text = self._send(prompt)
+                self.concurrency.record_success()
+                self._count("succeeded")
+                return response_text
+            except Exception as e:
+                status_code = _status_code_of(e)
+                if status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                    self._count("failed")
+                    raise
+                if status_code == 429:
+                    self._count("throttled")
+                    self.concurrency.record_throttle()
+                attempt += 1
+                self._count("retries")
+                # Full jitter: sleep a random amount up to the capped exponential delay.
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+                logger.warning(f"LLM request failed with status {status_code} (attempt {attempt}/{self.max_retries}); retrying in {delay:.1f}s.")
+                time.sleep(delay)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["rate_limit_wait_seconds"] = round(stats["rate_limit_wait_seconds"], 3)
+        stats["concurrency"] = self.concurrency.snapshot()
+        return stats
+
+
+class GeminiClient(RateLimitedLLMClient):
+    """Google Gemini backend, forcing JSON responses."""
+    def __init__(self):
+        super().__init__()
+        import google.generativeai as genai
+        if not config.GEMINI_API_KEY:
+            logger.error("GEMINI_API_KEY is not set.")
+            raise ValueError("Google Gemini API key not configured.")
+        genai.configure(api_key=config.GEMINI_API_KEY)
+        self.model = genai.GenerativeModel(config.GEMINI_MODEL_NAME)
+        self.generation_config = genai.GenerationConfig(response_mime_type="application/json")
+
+    def _send(self, prompt: str) -> str:
+        response = self.model.generate_content(prompt, generation_config=self.generation_config)
+        return response.text
+
+
+class FakeLLMClient(RateLimitedLLMClient):
+    """
+    Offline stand-in for Gemini used to benchmark throughput without network access or quota.
+    Sleeps for a configurable latency, optionally fails with a simulated 429, and returns a
+    deterministic ATS-shaped JSON object derived from a hash of the prompt.
+    """
+    def __init__(self, latency_seconds: float = None, error_rate: float = None):
+        super().__init__()
+        self.latency_seconds = config.FAKE_LLM_LATENCY_SECONDS if latency_seconds is None else latency_seconds
+        self.error_rate = config.FAKE_LLM_ERROR_RATE if error_rate is None else error_rate
+
+    def _send(self, prompt: str) -> str:
+        time.sleep(self.latency_seconds)
+        if self.error_rate and random.random() < self.error_rate:
+            raise TransientLLMError("429 Resource has been exhausted (fake backend).", code=429)
+        # Batched ATS prompts carry one "**Resume ID: <id>**" header per resume and expect a JSON array back.
+        sections = re.split(r"\*\*Resume ID: (\S+?)\*\*", prompt)
+        if len(sections) > 1:
+            return json.dumps([
+                dict(self._fake_ats_result(resume_text), resume_id=resume_id)
+                for resume_id, resume_text in zip(sections[1::2], sections[2::2])
+            ])
+        return json.dumps(self._fake_ats_result(prompt))
+
+    @staticmethod
+    def _fake_ats_result(text: str) -> dict:
+        seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+        email = re.search(r"[\w.+-]+@[\w-]+\.[\w.]+", text)
+        return {
+            "candidate_name": f"Fake Candidate {seed % 10000}",
+            "email": email.group(0) if email else f"fake.candidate.{seed % 10000}@example.com",
+            "phone_number": "",
+            "overall_ats_score": float(seed % 101),
+            "summary_reason": "Generated by the offline fake LLM backend.",
+            "matched_skills": [],
+            "relevant_projects": [],
+            "relevant_certifications": [],
+            "education_summary": "",
+            "years_of_experience": seed % 15,
+        }
+
+
+_llm_client = None
+_llm_client_lock = threading.Lock()
+
+def get_llm_client() -> RateLimitedLLMClient:
+    """
+    Returns the process-wide LLM client for the configured backend ('gemini' or 'fake').
+    A single instance is shared so every worker thread draws from the same quota buckets.
+    """
+    global _llm_client
+    with _llm_client_lock:
+        if _llm_client is None:
+            backend = (config.LLM_BACKEND or "gemini").lower()
+            if backend == "fake":
+                logger.warning("Using the fake LLM backend. ATS scores are NOT real.")
+                _llm_client = FakeLLMClient()
+            elif backend == "gemini":
+                _llm_client = GeminiClient()
+            else:
+                raise ValueError(f"Unsupported llm_backend '{backend}'. Use 'gemini' or 'fake'.")
+        return _llm_client
@@ -0,0 +1,82 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/message_templates.py
+# =============================================================================
+from collections import namedtuple
+from functools import lru_cache
+from string import Formatter
+
+from model.models import Candidate, JobDescription
+from exception.custom_exception import ValidationError
+
+# Placeholders a candidate message may use, e.g. "Dear {candidate_name}". Literal braces are written {{ and }}.
+TEMPLATE_PLACEHOLDERS = ("candidate_name", "job_title")
+DEFAULT_JOB_TITLE = "the role"
+
+# One candidate as seen by a message: contact details plus the placeholder values (see template_context).
+Recipient = namedtuple("Recipient", ["id", "email", "phone_number", "context"])
+
+
+class MessageTemplate:
+    """
+    A message template parsed once into literal text and placeholder slots, so rendering a batch is
+    string joins only. Placeholders are checked when the template is compiled, so a bad template is
+    rejected before anything is sent rather than part-way through a batch.
+    """
+    def __init__(self, source: str, name: str = "message"):
+        self.source = source
+        self.name = name
+        try:
+            parsed = list(Formatter().parse(source))
+        except ValueError as e:
+            raise ValidationError(f"The {name} template is malformed ({e}). Write literal braces as '{{{{' and '}}}}'.")
+
+        unknown = sorted({field for _, field, _, _ in parsed if field is not None and field not in TEMPLATE_PLACEHOLDERS})
+        if unknown:
+            raise ValidationError(
+                f"The {name} template uses unknown placeholder(s) {', '.join('{' + f + '}' for f in unknown)}. "
+                f"Available placeholders: {', '.join('{' + p + '}' for p in TEMPLATE_PLACEHOLDERS)}."
+            )
+        if any(spec or conversion for _, field, spec, conversion in parsed if field is not None):
+            raise ValidationError(f"The {name} template's placeholders cannot carry format specs or conversions.")
+
+        # Alternating literal text and placeholder names (None where a literal has no placeholder after it).
+        self._parts = [(literal, field) for literal, field, _, _ in parsed]
+        self.placeholders = frozenset(field for _, field in self._parts if field is not None)
+
+    def render(self, context: dict) -> str:
+        return "".join(literal + (context[field] if field is not None else "") for literal, field in self._parts)
+
+    def render_batch(self, contexts: list[dict]) -> list[str]:
+        """Renders the template once per context, in order."""
+        return [self.render(context) for context in contexts]
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str, name: str = "message") -> MessageTemplate:
+    """Returns the compiled template for `source`, compiling it only the first time it is seen."""
+    return MessageTemplate(source, name)
+
+
+def template_context(first_name: str, last_name: str, job_title: str = None) -> dict:
+    """The placeholder values for one candidate."""
+    return {
+        "candidate_name": f"{first_name or ''} {last_name or ''}".strip(),
+        "job_title": job_title or DEFAULT_JOB_TITLE,
+    }
+
+
+def load_recipients(db, candidate_ids: list[int]) -> list:
+    """
+    Fetches what a candidate message needs (contact details, name and job title) for many candidates in one
+    query, instead of loading full Candidate objects and lazy-loading each one's job description.
+    :return: Recipient tuples, ordered by candidate ID.
+    """
+    rows = db.query(
+        Candidate.id, Candidate.first_name, Candidate.last_name, Candidate.email, Candidate.phone_number,
+        JobDescription.title.label("job_title"),
+    ).outerjoin(JobDescription, Candidate.job_description_id == JobDescription.id).filter(
+        Candidate.id.in_(candidate_ids)
+    ).order_by(Candidate.id).all()
+    return [Recipient(row.id, row.email, row.phone_number, template_context(row.first_name, row.last_name, row.job_title))
+            for row in rows]
+
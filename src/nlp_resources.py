@@ -0,0 +1,85 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/nlp_resources.py
+# =============================================================================
+import importlib
+import threading
+import time
+
+from config.config_loader import config
+from logger.logger import logger
+
+# Heavy NLP dependencies (spaCy, NLTK, pyresparser) are imported and loaded on first use, once per process,
+# so app workers that never hit the pyresparser fallback never pay for them.
+_lock = threading.RLock()
+_spacy_models = {}
+_nltk_ready = False
+_resume_parser_class = None
+
+
+def _load_spacy_model(name, **kwargs):
+    """Memoized spacy.load: every caller in this process shares one instance per model name/path."""
+    key = (str(name), tuple(sorted(kwargs.items())))
+    with _lock:
+        if key not in _spacy_models:
+            import spacy
+            started = time.perf_counter()
+            try:
+                _spacy_models[key] = spacy.load(name, **kwargs)
+            except OSError:
+                if not config.NLP_AUTO_DOWNLOAD or name != 'en_core_web_sm':
+                    logger.critical(f"SpaCy model '{name}' is not installed. Run `python -m spacy download {name}` (done in the Docker image).")
+                    raise
+                logger.warning(f"SpaCy model '{name}' not found; downloading it because nlp_auto_download is enabled.")
+                spacy.cli.download(name)
+                _spacy_models[key] = spacy.load(name, **kwargs)
+            logger.info(f"Loaded spaCy model '{name}' in {time.perf_counter() - started:.2f}s.")
+        return _spacy_models[key]
+
+
+class _MemoizedSpacy:
+    """Stands in for the `spacy` module inside pyresparser so each ResumeParser reuses the loaded models."""
+    def __getattr__(self, name):
+        return getattr(importlib.import_module('spacy'), name)
+
+    @staticmethod
+    def load(name, **kwargs):
+        return _load_spacy_model(name, **kwargs)
+
+
+def get_spacy_model(name: str = 'en_core_web_sm'):
+    return _load_spacy_model(name)
+
+
+def ensure_nltk_stopwords():
+    """Checks for the NLTK stopwords corpus once per process, downloading it only if nlp_auto_download is enabled."""
+    global _nltk_ready
+    with _lock:
+        if _nltk_ready:
+            return
+        import nltk
+        try:
+            nltk.data.find('corpora/stopwords')
+        except LookupError:
+            if not config.NLP_AUTO_DOWNLOAD:
+                logger.critical("NLTK 'stopwords' corpus is missing. Run `python -m nltk.downloader stopwords` (done in the Docker image).")
+                raise
+            logger.warning("NLTK 'stopwords' not found; downloading it because nlp_auto_download is enabled.")
+            nltk.download('stopwords')
+        _nltk_ready = True
+
+
+def get_resume_parser_class():
+    """
+    Returns pyresparser's ResumeParser, importing it on first use with its spaCy loads memoized,
+    so repeated fallbacks in the same process do not reload the models for every resume.
+    """
+    global _resume_parser_class
+    with _lock:
+        if _resume_parser_class is None:
+            started = time.perf_counter()
+            ensure_nltk_stopwords()
+            resume_parser_module = importlib.import_module('pyresparser.resume_parser')
+            resume_parser_module.spacy = _MemoizedSpacy()
+            _resume_parser_class = resume_parser_module.ResumeParser
+            logger.info(f"pyresparser initialised in {time.perf_counter() - started:.2f}s.")
+        return _resume_parser_class
@@ -0,0 +1,178 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/notification_outbox.py
+# =============================================================================
+import os
+import random
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, or_
+
+from config.config_loader import config
+from database.database import BackgroundSessionLocal
+from logger.logger import logger
+from model.models import NotificationOutbox
+
+OUTBOX_STATUSES = ('pending', 'sending', 'sent', 'dead')
+
+
+class NotificationOutboxStore:
+    """
+    Transactional outbox for outgoing emails. Callers add a message to their own session, so it is committed
+    (or rolled back) together with the change that triggered it, and never sent for a change that did not happen.
+    Delivery happens later on a background worker: messages are claimed in batches with a lease, sent over the
+    pooled SMTP sender, retried with exponential backoff, and dead-lettered after `outbox_max_attempts` failures.
+    """
+    def __init__(self):
+        self.max_attempts = config.OUTBOX_MAX_ATTEMPTS
+        self.backoff_base = config.OUTBOX_BACKOFF_BASE_SECONDS
+        self.backoff_max = config.OUTBOX_BACKOFF_MAX_SECONDS
+        self.lease = timedelta(seconds=config.OUTBOX_LEASE_SECONDS)
+
+    # --- Writes (within the caller's transaction) ---
+
+    def enqueue_email(self, db, recipient: str, subject: str, html_body: str, kind: str = None, candidate_id: int = None) -> NotificationOutbox:
+        """Adds an email to the outbox in the caller's session; it is delivered after the caller commits."""
+        message = NotificationOutbox(
+            channel="email", kind=kind, candidate_id=candidate_id, recipient=recipient, subject=subject,
+            body=html_body, status="pending", attempts=0, next_attempt_at=datetime.utcnow(), created_at=datetime.utcnow(),
+        )
+        db.add(message)
+        return message
+
+    def remove_candidates(self, db, candidate_ids: list[int]):
+        """Drops candidates' outbox rows; must run before the candidate rows are deleted."""
+        db.query(NotificationOutbox).filter(NotificationOutbox.candidate_id.in_(candidate_ids)).delete(synchronize_session=False)
+
+    # --- Delivery ---
+
+    def _claimable(self, now: datetime):
+        return or_(
+            and_(NotificationOutbox.status == 'pending', NotificationOutbox.next_attempt_at <= now),
+            and_(NotificationOutbox.status == 'sending', NotificationOutbox.locked_at < now - self.lease),
+        )
+
+    def claim_batch(self, db, worker_id: str, limit: int) -> list[NotificationOutbox]:
+        """
+        Leases up to `limit` due messages to this worker. The conditional UPDATE is the lock, so concurrent
+        workers in other processes never claim the same message.
+        """
+        now = datetime.utcnow()
+        ids = [row.id for row in db.query(NotificationOutbox.id).filter(self._claimable(now)).order_by(
+            NotificationOutbox.next_attempt_at, NotificationOutbox.id).limit(limit).all()]
+        if not ids:
+            return []
+        db.query(NotificationOutbox).filter(NotificationOutbox.id.in_(ids), self._claimable(now)).update(
+            {"status": 'sending', "locked_by": worker_id, "locked_at": now}, synchronize_session=False
+        )
+        db.commit()
+        return db.query(NotificationOutbox).filter(
+            NotificationOutbox.id.in_(ids), NotificationOutbox.status == 'sending', NotificationOutbox.locked_by == worker_id
+        ).order_by(NotificationOutbox.id).all()
+
+    def _retry_delay(self, attempts: int) -> float:
+        # Exponential backoff with a little jitter, so a failed batch does not come back all at once.
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.8, 1.0)
+
+    def deliver_batch(self, worker_id: str, limit: int = None) -> int:
+        """
+        Claims and sends one batch of due messages, recording each outcome.
+        :return: The number of messages attempted (0 when the outbox has nothing due).
+        """
+        # Imported here so the outbox can be used without loading the SMTP stack until something is sent.
+        from src.notification_service import NotificationService
+
+        db = BackgroundSessionLocal()
+        try:
+            messages = self.claim_batch(db, worker_id, limit or config.OUTBOX_BATCH_SIZE)
+            if not messages:
+                return 0
+            errors = NotificationService().send_emails([(m.recipient, m.subject, m.body) for m in messages])
+
+            now = datetime.utcnow()
+            sent_ids = [m.id for m, error in zip(messages, errors) if error is None]
+            if sent_ids:
+                db.query(NotificationOutbox).filter(NotificationOutbox.id.in_(sent_ids), NotificationOutbox.locked_by == worker_id).update(
+                    {"status": 'sent', "sent_at": now, "attempts": NotificationOutbox.attempts + 1, "locked_by": None, "last_error": None},
+                    synchronize_session=False
+                )
+            dead = 0
+            for message, error in zip(messages, errors):
+                if error is None:
+                    continue
+                attempts = (message.attempts or 0) + 1
+                give_up = attempts >= self.max_attempts
+                dead += give_up
+                db.query(NotificationOutbox).filter(NotificationOutbox.id == message.id, NotificationOutbox.locked_by == worker_id).update({
+                    "status": 'dead' if give_up else 'pending',
+                    "attempts": attempts,
+                    "next_attempt_at": now if give_up else now + timedelta(seconds=self._retry_delay(attempts)),
+                    "last_error": str(error)[:2000],
+                    "locked_by": None,
+                }, synchronize_session=False)
+            db.commit()
+
+            failed = len(messages) - len(sent_ids)
+            if failed:
+                logger.warning(f"Outbox delivery: {len(sent_ids)} sent, {failed} failed ({dead} dead-lettered).")
+            else:
+                logger.info(f"Outbox delivery: {len(sent_ids)} sent.")
+            return len(messages)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Outbox delivery batch failed: {e}", exc_info=True)
+            return 0
+        finally:
+            db.close()
+
+    # --- Operations ---
+
+    def requeue_dead(self, db, message_ids: list[int] = None) -> int:
+        """
+        Moves dead-lettered messages (all, or the given IDs) back to pending with a fresh attempt budget.
+        :return: The number of messages requeued.
+        """
+        q = db.query(NotificationOutbox).filter(NotificationOutbox.status == 'dead')
+        if message_ids:
+            q = q.filter(NotificationOutbox.id.in_(message_ids))
+        requeued = q.update({"status": 'pending', "attempts": 0, "next_attempt_at": datetime.utcnow(), "last_error": None},
+                            synchronize_session=False)
+        db.commit()
+        return requeued
+
+    def stats(self, db) -> dict:
+        """Message counts per status, plus the age in seconds of the oldest message still waiting to be sent."""
+        counts = dict(db.query(NotificationOutbox.status, func.count(NotificationOutbox.id)).group_by(NotificationOutbox.status).all())
+        oldest = db.query(func.min(NotificationOutbox.created_at)).filter(NotificationOutbox.status.in_(('pending', 'sending'))).scalar()
+        return {
+            **{status: counts.get(status, 0) for status in OUTBOX_STATUSES},
+            "oldest_unsent_age_seconds": round((datetime.utcnow() - oldest).total_seconds(), 1) if oldest else None,
+        }
+
+
+class OutboxDeliveryWorker(threading.Thread):
+    """
+    Background worker that drains the notification outbox. One runs in every application process;
+    leases make sure each message is sent by one worker at a time.
+    """
+    def __init__(self, outbox: NotificationOutboxStore):
+        super().__init__(name="outbox-delivery-worker", daemon=True)
+        self.outbox = outbox
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.poll_seconds = config.OUTBOX_POLL_SECONDS
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        logger.info(f"Outbox delivery worker {self.worker_id} started.")
+        while not self._stop_event.is_set():
+            if not self.outbox.deliver_batch(self.worker_id):
+                self._stop_event.wait(self.poll_seconds)
+
+
+notification_outbox = NotificationOutboxStore()
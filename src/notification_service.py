@@ -1,65 +1,96 @@
-import smtplib
+import html
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from config.config_loader import config
 from logger.logger import logger
 from src.email_templates import EMAIL_TEMPLATES # <--- THIS IS THE ONLY CHANGE
+from src.smtp_pool import get_smtp_pool
+from src.notification_outbox import notification_outbox
+from src.message_templates import compile_template, load_recipients
+
+# Compiled (and placeholder-checked) once at import, so a broken template fails at startup rather than mid-send.
+STATUS_EMAIL_TEMPLATES = {
+    status: (compile_template(template["subject"], f"'{status}' subject"), compile_template(template["body"], f"'{status}' body"))
+    for status, template in EMAIL_TEMPLATES.items()
+}
 
 class NotificationService:
     def __init__(self):
         self.config = config
-        if not all([self.config.SMTP_SERVER, self.config.SMTP_SENDER_EMAIL, self.config.SMTP_PASSWORD]):
+        # Without TLS no password is needed, so a local debugging server (smtp_debug_server.py) can stand in.
+        if not all([self.config.SMTP_SERVER, self.config.SMTP_SENDER_EMAIL, self.config.SMTP_PASSWORD or not self.config.SMTP_USE_TLS]):
             logger.warning("SMTP settings are not fully configured. Email notifications will be disabled.")
             self.enabled = False
         else:
             self.enabled = True
             logger.info("NotificationService initialized and enabled.")
 
-    def send_email(self, to_email, subject, html_body):
-        if not self.enabled:
-            logger.info(f"Email notifications disabled. Suppressing email to {to_email}.")
-            return
-
+    def _build_message(self, to_email, subject, html_body):
         msg = MIMEMultipart('alternative')
         msg['From'] = self.config.SMTP_SENDER_EMAIL
         msg['To'] = to_email
         msg['Subject'] = subject
         msg.attach(MIMEText(html_body, 'html'))
+        return msg
+
+    def send_email(self, to_email, subject, html_body, raise_on_error: bool = False) -> bool:
+        """
+        Sends one HTML email over a pooled SMTP connection.
+        :param raise_on_error: Re-raise send failures instead of only logging them.
+        :return: True if the server accepted the message.
+        """
+        if not self.enabled:
+            logger.info(f"Email notifications disabled. Suppressing email to {to_email}.")
+            return False
 
         try:
-            with smtplib.SMTP(self.config.SMTP_SERVER, self.config.SMTP_PORT) as server:
-                server.starttls()
-                server.login(self.config.SMTP_USERNAME, self.config.SMTP_PASSWORD)
-                server.send_message(msg)
-                logger.info(f"Successfully sent email to {to_email} with subject '{subject}'")
+            get_smtp_pool().send_message(self._build_message(to_email, subject, html_body))
+            logger.info(f"Successfully sent email to {to_email} with subject '{subject}'")
+            return True
         except Exception as e:
             logger.error(f"Failed to send email to {to_email}: {e}", exc_info=True)
+            if raise_on_error:
+                raise
+            return False
 
-    def send_candidate_status_update(self, candidate, new_status: str):
+    def send_emails(self, messages: list[tuple]) -> list:
         """
-        Looks up a template for the new status and sends a personalized email.
+        Sends many emails in parallel, one thread per pooled SMTP connection.
+        :param messages: (to_email, subject, html_body) tuples.
+        :return: One entry per message, in order: None if it was sent, otherwise the exception it failed with.
         """
-        template = EMAIL_TEMPLATES.get(new_status)
-        if not template:
-            logger.warning(f"No email template found for status '{new_status}'. Skipping email.")
-            return
-
-        candidate_name = f"{candidate.first_name} {candidate.last_name}".strip()
-        job_title = candidate.job_description.title if candidate.job_description else "the role"
+        if not self.enabled:
+            logger.info(f"Email notifications disabled. Suppressing {len(messages)} emails.")
+            return [RuntimeError("Email notifications are disabled.")] * len(messages)
 
-        subject = template["subject"].format(job_title=job_title)
-        body = template["body"].format(candidate_name=candidate_name, job_title=job_title)
+        def send(message):
+            try:
+                self.send_email(*message, raise_on_error=True)
+                return None
+            except Exception as e:
+                return e
 
-        self.send_email(candidate.email, subject, body)
+        with ThreadPoolExecutor(max_workers=min(self.config.SMTP_POOL_SIZE, len(messages)) or 1, thread_name_prefix="smtp") as executor:
+            return list(executor.map(send, messages))
 
-    def notify_new_candidate_shortlisted(self, candidate, job):
+    @staticmethod
+    def _candidate_status_emails(recipients: list, new_status: str) -> list:
         """
-        Sends an internal notification to the HR team.
+        Renders the status template, if there is one, for a batch of recipients (see message_templates.load_recipients).
+        :return: One (to_email, subject, html_body) tuple per recipient, or an empty list when the status has no template.
         """
-        if not self.config.HR_RECIPIENT_EMAIL:
-            logger.warning("HR_RECIPIENT_EMAIL is not configured. Cannot send internal alert.")
-            return
+        template = STATUS_EMAIL_TEMPLATES.get(new_status)
+        if not template:
+            logger.warning(f"No email template found for status '{new_status}'. Skipping email.")
+            return []
+        subject_template, body_template = template
+        contexts = [r.context for r in recipients]
+        return list(zip([r.email for r in recipients], subject_template.render_batch(contexts), body_template.render_batch(contexts)))
 
+    @staticmethod
+    def _shortlist_alert_email(candidate, job):
+        """:return: (subject, html_body) of the HR alert for an automatically shortlisted candidate."""
         subject = f"New Candidate Shortlisted: {candidate.first_name} {candidate.last_name} for {job.title}"
         html_body = f"""
         <html><body>
@@ -74,4 +105,68 @@ class NotificationService:
         <p>Please log in to the HR Agent portal to review their profile.</p>
         </body></html>
         """
-        self.send_email(self.config.HR_RECIPIENT_EMAIL, subject, html_body)
\ No newline at end of file
+        return subject, html_body
+
+    @staticmethod
+    def _shortlist_digest_email(job, task_id: str, candidates: list, total: int, final: bool):
+        """
+        :param candidates: (first_name, last_name, email, ats_score) rows, best score first.
+        :param total: How many candidates the digest covers; rows beyond `candidates` are only counted.
+        :param final: False for the interim digests of a task that is still running.
+        :return: (subject, html_body) of the HR digest for one bulk task.
+        """
+        subject = f"{total} Candidate{'s' if total != 1 else ''} Shortlisted for {job.title}" + ("" if final else " (bulk run in progress)")
+        rows = "".join(
+            f"<tr><td>{rank}</td><td>{html.escape(' '.join(filter(None, (first_name, last_name))))}</td>"
+            f"<td>{html.escape(email or '')}</td><td>{(ats_score or 0):.2f}%</td></tr>"
+            for rank, (first_name, last_name, email, ats_score) in enumerate(candidates, start=1)
+        )
+        more = total - len(candidates)
+        html_body = f"""
+        <html><body>
+        <h2>Shortlist Digest: {html.escape(job.title)}</h2>
+        <p>{'The bulk run has finished' if final else 'The bulk run is still in progress'}. These candidates were
+        automatically shortlisted by the HR Agent{'' if final else ' since the last digest'}, ranked by ATS score.</p>
+        <table border="1" cellpadding="4" cellspacing="0">
+            <tr><th>#</th><th>Name</th><th>Email</th><th>ATS Score</th></tr>
+            {rows}
+        </table>
+        {f'<p>...and {more} more.</p>' if more > 0 else ''}
+        <p>Task ID: {task_id}. Please log in to the HR Agent portal to review their profiles.</p>
+        </body></html>
+        """
+        return subject, html_body
+
+    # --- Outbox: queued in the caller's transaction, delivered by the background outbox worker ---
+
+    def queue_candidate_status_update(self, db, candidate_ids: list[int], new_status: str):
+        """Queues the status-update email for each candidate; they are sent only if the caller's transaction commits."""
+        if not self.enabled:
+            logger.info(f"Email notifications disabled. Suppressing status emails to {len(candidate_ids)} candidate(s).")
+            return
+        recipients = load_recipients(db, candidate_ids)
+        for recipient, email in zip(recipients, self._candidate_status_emails(recipients, new_status)):
+            notification_outbox.enqueue_email(db, *email, kind="status_update", candidate_id=recipient.id)
+
+    def queue_new_candidate_shortlisted(self, db, candidate, job):
+        """Queues the HR alert for an automatically shortlisted candidate in the caller's transaction."""
+        if not self.config.HR_RECIPIENT_EMAIL:
+            logger.warning("HR_RECIPIENT_EMAIL is not configured. Cannot send internal alert.")
+            return
+        if not self.enabled:
+            logger.info(f"Email notifications disabled. Suppressing email to {self.config.HR_RECIPIENT_EMAIL}.")
+            return
+        notification_outbox.enqueue_email(db, self.config.HR_RECIPIENT_EMAIL, *self._shortlist_alert_email(candidate, job),
+                                          kind="shortlist_alert", candidate_id=candidate.id)
+
+    def queue_shortlist_digest(self, db, job, task_id: str, candidates: list, total: int, final: bool):
+        """Queues one HR digest covering a bulk task's shortlisted candidates in the caller's transaction."""
+        if not self.config.HR_RECIPIENT_EMAIL:
+            logger.warning("HR_RECIPIENT_EMAIL is not configured. Cannot send shortlist digest.")
+            return
+        if not self.enabled:
+            logger.info(f"Email notifications disabled. Suppressing shortlist digest to {self.config.HR_RECIPIENT_EMAIL}.")
+            return
+        notification_outbox.enqueue_email(db, self.config.HR_RECIPIENT_EMAIL,
+                                          *self._shortlist_digest_email(job, task_id, candidates, total, final),
+                                          kind="shortlist_digest")
@@ -0,0 +1,54 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/pagination.py
+# =============================================================================
+import base64
+import json
+import threading
+import time
+from datetime import datetime
+
+from exception.custom_exception import ValidationError
+
+
+def encode_cursor(updated_at: datetime, row_id: int) -> str:
+    """Encodes the (updated_at, id) sort key of the last row on a page as an opaque, URL-safe cursor."""
+    payload = json.dumps({"u": updated_at.isoformat() if updated_at else None, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+    :return: (updated_at, id)
+    :raises ValidationError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (datetime.fromisoformat(payload["u"]) if payload["u"] else None), int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValidationError(f"Invalid pagination cursor: {e}")
+
+
+class TTLCountCache:
+    """Small in-process cache for expensive COUNT(*) results, keyed by the filters that produced them."""
+    def __init__(self, ttl_seconds: float, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute_fn) -> int:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[1] < self.ttl_seconds:
+                return entry[0]
+        value = compute_fn()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if now - v[1] < self.ttl_seconds}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (value, now)
+        return value
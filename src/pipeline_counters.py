@@ -0,0 +1,88 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/pipeline_counters.py
+# =============================================================================
+from collections import Counter
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from logger.logger import logger
+from model.models import Candidate, PipelineCounter
+
+
+class PipelineCounterStore:
+    """
+    Maintains the `pipeline_counters` table: the number of candidates per (job, status).
+    HiringService applies deltas inside the same transaction as every candidate insert, status change
+    and delete, so job listings and tab counts read a few rows per job instead of scanning candidates.
+    `rebuild` recomputes the table from scratch if it ever drifts.
+    """
+    def apply(self, db, deltas: dict):
+        """
+        Adds deltas to the counters within the caller's transaction; the caller commits.
+        :param deltas: {(job_description_id, status): delta}. Zero deltas and rows without a job are ignored.
+        """
+        for (job_id, status), delta in deltas.items():
+            if not delta or job_id is None or status is None:
+                continue
+            updated = db.query(PipelineCounter).filter(
+                PipelineCounter.job_description_id == job_id, PipelineCounter.status == status
+            ).update({PipelineCounter.count: PipelineCounter.count + delta}, synchronize_session=False)
+            if updated:
+                continue
+            try:
+                with db.begin_nested():  # A concurrent writer may create the same row first
+                    db.add(PipelineCounter(job_description_id=job_id, status=status, count=delta))
+            except IntegrityError:
+                db.query(PipelineCounter).filter(
+                    PipelineCounter.job_description_id == job_id, PipelineCounter.status == status
+                ).update({PipelineCounter.count: PipelineCounter.count + delta}, synchronize_session=False)
+
+    def record_created(self, db, job_id: int, statuses: list[str]):
+        """Counts newly inserted candidates, given the status of each."""
+        self.apply(db, {(job_id, status): n for status, n in Counter(statuses).items()})
+
+    def record_status_change(self, db, job_id: int, old_status: str, new_status: str):
+        if old_status != new_status:
+            self.apply(db, {(job_id, old_status): -1, (job_id, new_status): 1})
+
+    def record_deleted(self, db, candidates: list):
+        """Uncounts candidates that are about to be deleted (anything with job_description_id and current_status)."""
+        deltas = Counter((c.job_description_id, c.current_status) for c in candidates)
+        self.apply(db, {key: -n for key, n in deltas.items()})
+
+    def delete_jobs(self, db, job_ids: list[int]):
+        db.query(PipelineCounter).filter(PipelineCounter.job_description_id.in_(job_ids)).delete(synchronize_session=False)
+
+    def job_totals(self, db) -> dict:
+        """Returns {job_description_id: candidate count} for every job with candidates."""
+        rows = db.query(PipelineCounter.job_description_id, func.sum(PipelineCounter.count)).group_by(PipelineCounter.job_description_id).all()
+        return {job_id: int(total or 0) for job_id, total in rows}
+
+    def status_totals(self, db) -> dict:
+        """Returns {status: candidate count} across all jobs."""
+        rows = db.query(PipelineCounter.status, func.sum(PipelineCounter.count)).group_by(PipelineCounter.status).all()
+        return {status: int(total or 0) for status, total in rows if total}
+
+    def rebuild(self, db) -> int:
+        """
+        Recomputes every counter from the candidates table in one transaction.
+        :return: The number of counter rows written.
+        """
+        rows = db.query(Candidate.job_description_id, Candidate.current_status, func.count(Candidate.id)).filter(
+            Candidate.job_description_id.isnot(None)
+        ).group_by(Candidate.job_description_id, Candidate.current_status).all()
+        db.query(PipelineCounter).delete(synchronize_session=False)
+        db.add_all([PipelineCounter(job_description_id=job_id, status=status, count=n) for job_id, status, n in rows])
+        db.commit()
+        logger.info(f"Rebuilt pipeline counters: {len(rows)} rows.")
+        return len(rows)
+
+    def ensure_initialized(self, db):
+        """Builds the counters on first start after an upgrade, when candidates exist but no counters do."""
+        if db.query(PipelineCounter.job_description_id).first() is None and db.query(Candidate.id).first() is not None:
+            logger.info("Pipeline counters are empty; building them from existing candidates.")
+            self.rebuild(db)
+
+
+pipeline_counters = PipelineCounterStore()
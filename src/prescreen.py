@@ -0,0 +1,138 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/prescreen.py
+# =============================================================================
+import re
+
+from sqlalchemy import func
+
+from config.config_loader import config
+from model.models import PrescreenOutcome
+from src.skill_matcher import extract_terms, JOB_TITLE_WEIGHT
+
+PRESCREEN_MODES = ('off', 'shadow', 'reject', 'defer')
+MAX_JD_TERMS = 40  # Only the most frequent JD terms count, so boilerplate in a long JD does not dilute coverage
+_YEARS_RE = re.compile(r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years|yrs|year)\b", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _required_years(min_experience_years: str) -> float:
+    """Parses the JD's minimum experience ("3", "3-5", "3+ years"); 0 when absent."""
+    match = _NUMBER_RE.search(str(min_experience_years or ""))
+    return float(match.group(0)) if match else 0.0
+
+
+def _resume_years(resume_text: str, structured_data: dict) -> float:
+    """Best-effort years of experience: the parser's total_experience, else the largest "N years" in the text."""
+    parsed = (structured_data or {}).get('total_experience')
+    if isinstance(parsed, (int, float)) and parsed > 0:
+        return float(parsed)
+    years = [float(y) for y in _YEARS_RE.findall(resume_text or "") if float(y) <= 45]
+    return max(years) if years else None
+
+
+class PreScreener:
+    """
+    Cheap local score of how well a resume covers a job description, used to keep obviously irrelevant
+    resumes away from the LLM. The score (0-100) is the weighted share of the JD's key terms found in the
+    resume, reduced when the resume states fewer years of experience than the JD requires.
+    One instance is built per bulk run and shared by the scoring threads (it is read-only).
+    """
+    def __init__(self, title: str, description_text: str, min_experience_years: str, mode: str = None, min_score: float = None):
+        self.mode = (mode or config.PRESCREEN_MODE or 'off').lower()
+        if self.mode not in PRESCREEN_MODES:
+            raise ValueError(f"Unsupported prescreen_mode '{self.mode}'. Use one of {PRESCREEN_MODES}.")
+        self.min_score = config.PRESCREEN_MIN_SCORE if min_score is None else min_score
+
+        terms = extract_terms(description_text)
+        terms.update(extract_terms(title, weight=JOB_TITLE_WEIGHT))
+        self.jd_terms = dict(terms.most_common(MAX_JD_TERMS))
+        self.jd_weight = float(sum(self.jd_terms.values())) or 1.0
+        self.required_years = _required_years(min_experience_years)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    @property
+    def gates(self) -> bool:
+        """True if low-scoring resumes are kept from the LLM (reject or defer), not only observed."""
+        return self.mode in ('reject', 'defer')
+
+    def score(self, resume_text: str, structured_data: dict = None) -> dict:
+        """:return: {"score", "matched_terms", "missing_terms", "resume_years", "required_years"}"""
+        resume_terms = extract_terms(resume_text)
+        matched = [term for term in self.jd_terms if term in resume_terms]
+        coverage = sum(self.jd_terms[term] for term in matched) / self.jd_weight
+
+        experience_factor, years = 1.0, _resume_years(resume_text, structured_data)
+        if self.required_years and years is not None and years < self.required_years:
+            experience_factor = 0.5 + 0.5 * years / self.required_years
+
+        return {
+            "score": round(100.0 * coverage * experience_factor, 2),
+            "matched_terms": matched[:15],
+            "missing_terms": [term for term in self.jd_terms if term not in resume_terms][:15],
+            "resume_years": years,
+            "required_years": self.required_years,
+        }
+
+    def passes(self, prescreen: dict) -> bool:
+        return not self.gates or prescreen["score"] >= self.min_score
+
+    def rejection_result(self, prescreen: dict) -> dict:
+        """An ATS-shaped result for a resume rejected without an LLM call; names and emails come from the parser."""
+        # The ATS score stays 0: the lexical score is on a different scale and is kept under "prescreen" instead.
+        return {
+            "overall_ats_score": 0.0,
+            "summary_reason": (f"Rejected by the local pre-screen (score {prescreen['score']} < {self.min_score}) without an LLM review. "
+                               f"Missing job keywords: {', '.join(prescreen['missing_terms'][:8]) or 'none'}."),
+            "matched_skills": prescreen["matched_terms"],
+            "prescreen": prescreen,
+        }
+
+
+def build_prescreen_report(db, job_description_id: int = None, min_score: float = None) -> dict:
+    """
+    Measures the pre-screen against the LLM on every resume that has both scores (all of them in shadow
+    mode; the ones it let through, or that were deferred and later re-run, otherwise).
+    A resume is "relevant" if the LLM scored it at or above the run's shortlist threshold, and the pre-screen
+    "rejects" it if its score is below `min_score` (defaults to prescreen_min_score, so other cut-offs can be tried).
+    :return: Counts plus rejection_precision (share of would-be rejections the LLM also rejected),
+             shortlist_recall (share of LLM shortlists the pre-screen would keep) and the share of LLM calls saved.
+    """
+    cutoff = config.PRESCREEN_MIN_SCORE if min_score is None else min_score
+    q = db.query(PrescreenOutcome.prescreen_score, PrescreenOutcome.ats_score, PrescreenOutcome.ats_threshold).filter(
+        PrescreenOutcome.ats_score.isnot(None)
+    )
+    if job_description_id:
+        q = q.filter(PrescreenOutcome.job_description_id == job_description_id)
+
+    true_reject = false_reject = kept_relevant = kept_irrelevant = 0
+    for prescreen_score, ats_score, ats_threshold in q.yield_per(1000):
+        relevant = ats_score >= (ats_threshold if ats_threshold is not None else config.ATS_SHORTLIST_THRESHOLD)
+        if prescreen_score < cutoff:
+            false_reject += relevant
+            true_reject += not relevant
+        else:
+            kept_relevant += relevant
+            kept_irrelevant += not relevant
+
+    decided = db.query(PrescreenOutcome.decision, func.count(PrescreenOutcome.id))
+    if job_description_id:
+        decided = decided.filter(PrescreenOutcome.job_description_id == job_description_id)
+    decisions = dict(decided.group_by(PrescreenOutcome.decision).all())
+
+    evaluated = true_reject + false_reject + kept_relevant + kept_irrelevant
+    would_reject = true_reject + false_reject
+    relevant_total = kept_relevant + false_reject
+    return {
+        "job_description_id": job_description_id,
+        "min_score": cutoff,
+        "evaluated": evaluated,
+        "would_reject": would_reject,
+        "rejection_precision": round(true_reject / would_reject, 4) if would_reject else None,
+        "shortlist_recall": round(kept_relevant / relevant_total, 4) if relevant_total else None,
+        "llm_calls_saved_pct": round(100.0 * would_reject / evaluated, 2) if evaluated else None,
+        "missed_shortlists": false_reject,
+        "decisions": decisions,
+    }
@@ -0,0 +1,90 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/rate_limiter.py
+# =============================================================================
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Refills continuously at `rate_per_minute` up to `capacity`,
+    and `acquire` blocks until enough tokens are available.
+    """
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive.")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate_per_second)
+        self._last_refill = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        Blocks until `amount` tokens have been taken from the bucket.
+        Requests larger than the capacity are clamped so they can still proceed once the bucket is full.
+        :return: The number of seconds spent waiting.
+        """
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                sleep_for = (amount - self._tokens) / self.rate_per_second
+            time.sleep(sleep_for)
+            waited += sleep_for
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limiter: the number of concurrent slots grows by one after a run of
+    successes and is halved whenever the upstream service throttles us.
+    """
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = None, increase_after: int = 10):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum or initial)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.increase_after = increase_after
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        """Holds one concurrency slot for the duration of the `with` block."""
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def record_success(self):
+        with self._cond:
+            self._successes += 1
+            if self._successes >= self.increase_after and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify_all()
+
+    def record_throttle(self):
+        with self._cond:
+            self.limit = max(self.minimum, self.limit // 2)
+            self._successes = 0
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {"limit": self.limit, "in_flight": self._in_flight}
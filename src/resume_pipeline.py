@@ -0,0 +1,215 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/resume_pipeline.py
+# =============================================================================
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from logger.logger import logger
+from src.helpers import parse_resume
+from src.archive_ingest import member_file_name
+
+_STAGE_DONE = object()  # Sentinel passed between stages
+
+
+def _extract_text_in_subprocess(file_path: str) -> tuple[str, dict]:
+    """Stage 1 work item. Module-level so it can be pickled into the process pool."""
+    return parse_resume(file_path)
+
+
+_extraction_pool = None
+_extraction_pool_lock = threading.Lock()
+
+def _get_extraction_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Returns this process's extraction pool, created on first use and shared by every bulk run.
+    Its processes are started with forkserver (spawn where that is unavailable), never fork: the app
+    process has worker threads and open DB pools, and a forked child can deadlock on a lock (e.g. the
+    logging lock) that another thread held at the moment of the fork.
+    """
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            context = multiprocessing.get_context(method)
+            if method == "forkserver":
+                # Extraction processes fork from a server that has already imported the parsing stack.
+                context.set_forkserver_preload(["src.resume_pipeline"])
+            _extraction_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        return _extraction_pool
+
+def _discard_extraction_pool(pool: ProcessPoolExecutor):
+    """Drops a pool whose worker process died, so the next run starts a fresh one."""
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is pool:
+            _extraction_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ResumePipeline:
+    """
+    Two-stage bulk resume pipeline.
+
+    Stage 1 extracts text with a ProcessPoolExecutor, so CPU-bound PDF/DOCX/spaCy parsing runs on
+    every core instead of serializing on the GIL. The process pool is created once per app process. Extracted resumes are pushed onto a bounded queue.
+    Stage 2 is a thread pool that pulls from the queue, groups up to `batch_size` resumes and calls
+    `score_fn` for the network-bound LLM scoring. The bounded queue keeps stage 1 from racing ahead
+    and holding thousands of extracted documents in memory while stage 2 waits on the LLM.
+
+    If a cancellation token is passed to `run`, stage 1 stops submitting files and cancels queued
+    extractions, and stage 2 drops anything it has not started scoring. Dropped resumes produce no
+    result, so callers can treat them as still pending and resume them later. The same happens when the
+    caller stops consuming `run` early (closes the generator, or raises while handling a result).
+    """
+    def __init__(self, extraction_workers: int, scoring_workers: int, queue_size: int, batch_size: int = 1):
+        self.extraction_workers = extraction_workers
+        self.scoring_workers = max(1, scoring_workers)
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+
+    def run(self, resumes: list[tuple], score_fn, cancel_token=None):
+        """
+        Runs both stages and yields one result dict per resume as soon as it is scored.
+        Results are yielded on the calling thread, so the caller can safely use its DB session.
+        :param resumes: A list of (file_path, sha256, known_resume_text) tuples.
+        :param score_fn: Called from a stage-2 thread with a list of extracted-resume dicts
+                         ({"file_path", "resume_sha256", "resume_text", "structured_data"}); returns a list of result dicts.
+        :param cancel_token: Optional CancellationToken checked before each new unit of work.
+        """
+        if not resumes:
+            return
+
+        extracted_queue = queue.Queue(maxsize=self.queue_size)
+        results_queue = queue.Queue()
+        # Set when the caller stops reading results, so neither stage spends more work on resumes nobody will see.
+        stopped = threading.Event()
+        is_cancelled = (lambda: stopped.is_set() or cancel_token.is_cancelled()) if cancel_token else stopped.is_set
+
+        feeder = threading.Thread(target=self._extraction_stage, args=(resumes, extracted_queue, results_queue, is_cancelled), daemon=True)
+        feeder.start()
+
+        with ThreadPoolExecutor(max_workers=self.scoring_workers) as scoring_pool:
+            for _ in range(self.scoring_workers):
+                scoring_pool.submit(self._scoring_stage, extracted_queue, results_queue, score_fn, is_cancelled)
+
+            try:
+                finished_scorers = 0
+                while finished_scorers < self.scoring_workers:
+                    result = results_queue.get()
+                    if result is _STAGE_DONE:
+                        finished_scorers += 1
+                        continue
+                    yield result
+            finally:
+                stopped.set()
+
+        feeder.join()
+
+    def _extraction_stage(self, resumes: list[tuple], extracted_queue: queue.Queue, results_queue: queue.Queue, is_cancelled):
+        """Stage 1: extracts text and feeds the bounded queue, then signals every scorer to stop."""
+        try:
+            pending = []
+            for file_path, sha, known_text in resumes:
+                if is_cancelled():
+                    return
+                if known_text:
+                    # Text reused from an identical earlier upload skips extraction entirely.
+                    extracted_queue.put({"file_path": file_path, "resume_sha256": sha, "resume_text": known_text, "structured_data": {}})
+                else:
+                    pending.append((file_path, sha))
+
+            if not pending:
+                return
+
+            if self.extraction_workers <= 0:
+                # In-process extraction, for environments where forking worker processes is not allowed.
+                for file_path, sha in pending:
+                    if is_cancelled():
+                        return
+                    self._put_extracted(extracted_queue, results_queue, file_path, sha, lambda fp=file_path: parse_resume(fp))
+                return
+
+            # Only a couple of files per process are in flight, so cancellation never has a long backlog to drain.
+            max_in_flight = self.extraction_workers * 2
+            remaining = iter(pending)
+            extraction_pool = _get_extraction_pool(self.extraction_workers)
+            in_flight = {}
+            while True:
+                while len(in_flight) < max_in_flight and not is_cancelled():
+                    next_file = next(remaining, None)
+                    if next_file is None:
+                        break
+                    in_flight[extraction_pool.submit(_extract_text_in_subprocess, next_file[0])] = next_file
+                if not in_flight:
+                    break
+                if is_cancelled():
+                    for future in in_flight:
+                        future.cancel()
+                    logger.info("Resume extraction stage cancelled; queued extractions were dropped.")
+                    break
+
+                done, _ = wait(in_flight, timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path, sha = in_flight.pop(future)
+                    self._put_extracted(extracted_queue, results_queue, file_path, sha, future.result)
+        except BrokenProcessPool as e:
+            logger.error(f"Resume extraction pool broke (a worker process died); unfinished files stay pending: {e}")
+            _discard_extraction_pool(extraction_pool)
+        except Exception as e:
+            logger.error(f"Resume extraction stage failed: {e}", exc_info=True)
+        finally:
+            for _ in range(self.scoring_workers):
+                extracted_queue.put(_STAGE_DONE)
+
+    @staticmethod
+    def _put_extracted(extracted_queue: queue.Queue, results_queue: queue.Queue, file_path: str, sha: str, get_text):
+        """Puts a successfully extracted resume on the queue, or reports the failure straight to the results."""
+        try:
+            resume_text, structured_data = get_text()
+        except BrokenProcessPool:
+            # Not this file's fault: every in-flight file is left without a result, so it stays pending.
+            raise
+        except Exception as e:
+            resume_text, structured_data = "", {}
+            logger.error(f"Text extraction crashed for {member_file_name(file_path)}: {e}")
+        if not resume_text and not structured_data:
+            results_queue.put({"file_name": member_file_name(file_path), "error": "Failed to extract content from resume.", "original_path": file_path})
+            return
+        extracted_queue.put({"file_path": file_path, "resume_sha256": sha, "resume_text": resume_text, "structured_data": structured_data})
+
+    def _scoring_stage(self, extracted_queue: queue.Queue, results_queue: queue.Queue, score_fn, is_cancelled):
+        """Stage 2: scores extracted resumes, up to `batch_size` per call, until it sees the stop sentinel."""
+        try:
+            stop = False
+            while not stop:
+                item = extracted_queue.get()
+                if item is _STAGE_DONE:
+                    break
+                batch = [item]
+                # Top the batch up with whatever is already waiting, without blocking on stage 1.
+                while len(batch) < self.batch_size:
+                    try:
+                        next_item = extracted_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if next_item is _STAGE_DONE:
+                        stop = True
+                        break
+                    batch.append(next_item)
+
+                if is_cancelled():
+                    # Keep draining so stage 1 is never blocked on a full queue, but spend no more LLM calls.
+                    continue
+
+                try:
+                    for result in score_fn(batch):
+                        results_queue.put(result)
+                except Exception as e:
+                    logger.error(f"Resume scoring stage failed for a batch of {len(batch)}: {e}", exc_info=True)
+                    for extracted in batch:
+                        results_queue.put({"file_name": member_file_name(extracted["file_path"]), "error": str(e), "original_path": extracted["file_path"]})
+        finally:
+            results_queue.put(_STAGE_DONE)
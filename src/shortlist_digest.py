@@ -0,0 +1,82 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/shortlist_digest.py
+# =============================================================================
+import uuid
+
+from sqlalchemy import func, insert
+
+from config.config_loader import config
+from database.database import BackgroundSessionLocal
+from logger.logger import logger
+from model.models import Candidate, JobDescription, ShortlistDigestEntry
+
+
+class ShortlistDigest:
+    """
+    Coalesces the HR "new candidate shortlisted" alerts of a bulk job into one digest email per task.
+    Shortlisted candidates are recorded in the same transaction that saves them; `flush` later turns everything
+    recorded for a task into a single ranked email in the notification outbox. The bulk worker flushes when the
+    task ends and, for long tasks, every `shortlist_digest_interval_minutes`.
+    """
+    def __init__(self):
+        self.enabled = config.SHORTLIST_DIGEST_ENABLED
+        self.interval_seconds = config.SHORTLIST_DIGEST_INTERVAL_MINUTES * 60
+        self.max_rows = config.SHORTLIST_DIGEST_MAX_ROWS
+
+    def record(self, db, task_id: str, jd_id: int, candidate_ids: list[int]):
+        """Adds shortlisted candidates to the task's next digest, in the caller's transaction."""
+        if candidate_ids:
+            db.execute(insert(ShortlistDigestEntry), [
+                {"task_id": task_id, "job_description_id": jd_id, "candidate_id": cid} for cid in candidate_ids
+            ])
+
+    def remove_candidates(self, db, candidate_ids: list[int]):
+        """Drops candidates from pending digests; must run before the candidate rows are deleted."""
+        db.query(ShortlistDigestEntry).filter(ShortlistDigestEntry.candidate_id.in_(candidate_ids)).delete(synchronize_session=False)
+
+    def flush(self, task_id: str, final: bool = True) -> int:
+        """
+        Queues one digest email for every candidate recorded for the task since the last flush.
+        Entries are claimed with a conditional UPDATE, so the periodic and the end-of-task flush
+        (or two workers after a lease takeover) never put the same candidate into two digests.
+        :param final: False for the interim digests sent while the task is still running.
+        :return: The number of candidates covered by the digest (0 when nothing was pending).
+        """
+        # Imported here so the bulk worker does not load the SMTP stack until a digest is sent.
+        from src.notification_service import NotificationService
+
+        db = BackgroundSessionLocal()
+        try:
+            pending = ShortlistDigestEntry.digest_id.is_(None)
+            ids = [row.id for row in db.query(ShortlistDigestEntry.id).filter(ShortlistDigestEntry.task_id == task_id, pending).all()]
+            if not ids:
+                return 0
+            digest_id = str(uuid.uuid4())
+            db.query(ShortlistDigestEntry).filter(ShortlistDigestEntry.id.in_(ids), pending).update(
+                {"digest_id": digest_id}, synchronize_session=False
+            )
+            claimed = (ShortlistDigestEntry.task_id == task_id, ShortlistDigestEntry.digest_id == digest_id)
+
+            total = db.query(func.count(ShortlistDigestEntry.id)).filter(*claimed).scalar()
+            if total:
+                job = db.query(JobDescription).join(
+                    ShortlistDigestEntry, ShortlistDigestEntry.job_description_id == JobDescription.id
+                ).filter(*claimed).first()
+                candidates = db.query(Candidate.first_name, Candidate.last_name, Candidate.email, Candidate.ats_score).join(
+                    ShortlistDigestEntry, ShortlistDigestEntry.candidate_id == Candidate.id
+                ).filter(*claimed).order_by(Candidate.ats_score.desc(), Candidate.id).limit(self.max_rows).all()
+                NotificationService().queue_shortlist_digest(db, job, task_id, [tuple(row) for row in candidates], total, final)
+            db.query(ShortlistDigestEntry).filter(*claimed).delete(synchronize_session=False)
+            db.commit()
+            if total:
+                logger.info(f"Queued {'final' if final else 'interim'} shortlist digest for task {task_id} covering {total} candidates.")
+            return total
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to flush shortlist digest for task {task_id}: {e}", exc_info=True)
+            return 0
+        finally:
+            db.close()
+
+
+shortlist_digest = ShortlistDigest()
@@ -0,0 +1,258 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/skill_matcher.py
+# =============================================================================
+import json
+import re
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from sqlalchemy import func, insert
+
+from logger.logger import logger
+from model.models import Candidate, CandidateTermVector
+
+_TOKEN_RE = re.compile(r"[\w+#]+")
+_STOPWORDS = frozenset("""
+a about above across after all also an and any are as at be been being both but by can could did do does
+for from had has have having he her his i if in into is it its me my of on or our over per she so such than
+that the their them then there these they this those through to under up us was we were what when where
+which while who will with within would you your
+ability able candidate candidates company description etc experience good including job knowledge looking
+must plus preferred required requirements responsibilities role skills strong team using work working year years
+""".split())
+SKILL_WEIGHT = 3           # A term from ai_analysis.matched_skills counts as this many resume mentions
+JOB_TITLE_WEIGHT = 2       # Job title terms weigh more than description terms in the query (BM25 and cosine)
+MAX_TERMS_PER_CANDIDATE = 300
+BM25_K1 = 1.2
+BM25_B = 0.75
+_INDEX_BATCH_SIZE = 500
+
+
+def extract_terms(text: str, weight: int = 1) -> Counter:
+    """Lower-cases and tokenises text into {term: weighted frequency}, keeping "c++"/"c#" and dropping stopwords and numbers."""
+    terms = Counter()
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        token = token.strip('_')
+        if token in _STOPWORDS or token.isdigit() or (len(token) < 2 and token not in ('c', 'r')):
+            continue
+        terms[token] += weight
+    return terms
+
+
+def candidate_terms(resume_text: str, ai_analysis: str) -> Counter:
+    """Builds a candidate's term vector from the resume text and the AI-matched skills."""
+    terms = extract_terms(resume_text)
+    try:
+        skills = json.loads(ai_analysis or "{}").get("matched_skills") or []
+    except (ValueError, AttributeError):
+        skills = []
+    for skill in skills:
+        terms.update(extract_terms(str(skill), weight=SKILL_WEIGHT))
+    return Counter(dict(terms.most_common(MAX_TERMS_PER_CANDIDATE)))
+
+
+class _MatchIndex:
+    """Inverted index over every stored term vector, held as flat NumPy arrays (postings sorted by term)."""
+    def __init__(self, rows: list, fingerprint: tuple):
+        self.fingerprint = fingerprint
+        self.candidate_ids = np.array([row.candidate_id for row in rows], dtype=np.int64)
+        self.job_ids = np.array([row.job_description_id or 0 for row in rows], dtype=np.int64)
+        self.doc_len = np.array([row.length or 0.0 for row in rows], dtype=np.float64)
+        self.avg_doc_len = float(self.doc_len.mean()) if len(rows) and self.doc_len.mean() > 0 else 1.0
+
+        self.vocabulary = {}
+        term_ids, doc_indexes, frequencies = [], [], []
+        for doc_index, row in enumerate(rows):
+            for term, frequency in json.loads(row.terms or "{}").items():
+                term_ids.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                doc_indexes.append(doc_index)
+                frequencies.append(frequency)
+
+        term_ids = np.array(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids, kind='stable')
+        self.posting_docs = np.array(doc_indexes, dtype=np.int64)[order]
+        self.posting_tf = np.array(frequencies, dtype=np.float64)[order]
+        document_frequency = np.bincount(term_ids, minlength=len(self.vocabulary)).astype(np.float64)
+        self.posting_starts = np.concatenate(([0], np.cumsum(document_frequency))).astype(np.int64)
+
+        n = max(len(rows), 1)
+        self.idf_bm25 = np.log(1.0 + (n - document_frequency + 0.5) / (document_frequency + 0.5))
+        self.idf = np.log((1.0 + n) / (1.0 + document_frequency)) + 1.0
+        # TF-IDF norm of every document, for cosine similarity
+        weights = (self.posting_tf * self.idf[term_ids[order]]) ** 2
+        self.doc_norms = np.sqrt(np.bincount(self.posting_docs, weights=weights, minlength=len(rows)))
+        self.doc_norms[self.doc_norms == 0] = 1.0
+
+    def postings(self, term_id: int):
+        start, end = self.posting_starts[term_id], self.posting_starts[term_id + 1]
+        return self.posting_docs[start:end], self.posting_tf[start:end]
+
+    def score(self, query_terms: Counter, method: str) -> np.ndarray:
+        scores = np.zeros(len(self.candidate_ids), dtype=np.float64)
+        query_norm = 0.0
+        for term, query_tf in query_terms.items():
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            docs, tf = self.postings(term_id)
+            if method == 'bm25':
+                length_norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self.doc_len[docs] / self.avg_doc_len)
+                # Weighted by the term's query frequency, so title terms and terms the JD repeats count for more.
+                scores[docs] += query_tf * self.idf_bm25[term_id] * tf * (BM25_K1 + 1.0) / (tf + length_norm)
+            else:
+                query_weight = query_tf * self.idf[term_id]
+                scores[docs] += query_weight * tf * self.idf[term_id]
+                query_norm += query_weight ** 2
+        if method == 'cosine' and query_norm:
+            scores /= self.doc_norms * np.sqrt(query_norm)
+        return scores
+
+
+class SkillMatcher:
+    """
+    Ranks every stored candidate against a job description locally, without LLM calls.
+    Each candidate's term vector (resume words plus boosted AI-matched skills) is precomputed into
+    `candidate_term_vectors` when the candidate is saved. The vectors are loaded once per process into a
+    NumPy inverted index, which is rebuilt only when the table's fingerprint (row count, last id, last update)
+    changes, so ranking a new job is a handful of vectorised array operations.
+    """
+    METHODS = ('bm25', 'cosine')
+
+    def __init__(self):
+        self._index = None
+        self._build_lock = threading.Lock()
+
+    # --- Writes (within the caller's transaction) ---
+
+    def record_candidates(self, db, candidate_ids: list[int]):
+        """(Re)computes the term vectors of the given candidates; the caller commits."""
+        ids = sorted(set(candidate_ids))
+        for start in range(0, len(ids), _INDEX_BATCH_SIZE):
+            batch = ids[start:start + _INDEX_BATCH_SIZE]
+            db.query(CandidateTermVector).filter(CandidateTermVector.candidate_id.in_(batch)).delete(synchronize_session=False)
+            vectors = self._vectors(db, batch)
+            if vectors:
+                db.execute(insert(CandidateTermVector), vectors)
+
+    def remove_candidates(self, db, candidate_ids: list[int]):
+        """Drops candidates' vectors; must run before the candidate rows are deleted."""
+        db.query(CandidateTermVector).filter(CandidateTermVector.candidate_id.in_(candidate_ids)).delete(synchronize_session=False)
+
+    @staticmethod
+    def _vectors(db, candidate_ids: list[int]) -> list[dict]:
+        rows = db.query(Candidate.id, Candidate.job_description_id, Candidate.resume_text, Candidate.ai_analysis).filter(
+            Candidate.id.in_(candidate_ids)
+        ).all()
+        vectors = []
+        for row in rows:
+            terms = candidate_terms(row.resume_text, row.ai_analysis)
+            vectors.append({
+                "candidate_id": row.id,
+                "job_description_id": row.job_description_id,
+                "terms": json.dumps(terms, separators=(",", ":")),
+                "length": float(sum(terms.values())),
+            })
+        return vectors
+
+    def rebuild(self, db) -> int:
+        """
+        Recomputes every candidate's term vector in one transaction.
+        :return: The number of vectors written.
+        """
+        db.query(CandidateTermVector).delete(synchronize_session=False)
+        total, last_id = 0, 0
+        while True:
+            ids = [row.id for row in db.query(Candidate.id).filter(Candidate.id > last_id).order_by(Candidate.id).limit(_INDEX_BATCH_SIZE).all()]
+            if not ids:
+                break
+            vectors = self._vectors(db, ids)
+            if vectors:
+                db.execute(insert(CandidateTermVector), vectors)
+            total += len(vectors)
+            last_id = ids[-1]
+        db.commit()
+        logger.info(f"Rebuilt candidate term vectors: {total} candidates.")
+        return total
+
+    def ensure_initialized(self, db):
+        """Builds the vectors on first start after an upgrade, when candidates exist but no vectors do."""
+        if db.query(CandidateTermVector.candidate_id).first() is None and db.query(Candidate.id).first() is not None:
+            logger.info("Candidate term vectors are empty; building them from existing candidates.")
+            self.rebuild(db)
+
+    # --- Ranking ---
+
+    @staticmethod
+    def _fingerprint(db) -> tuple:
+        count, last_id, last_update = db.query(
+            func.count(CandidateTermVector.candidate_id), func.max(CandidateTermVector.candidate_id), func.max(CandidateTermVector.updated_at)
+        ).one()
+        return count, last_id, str(last_update)
+
+    def _get_index(self, db) -> _MatchIndex:
+        fingerprint = self._fingerprint(db)
+        index = self._index
+        if index is not None and index.fingerprint == fingerprint:
+            return index
+        with self._build_lock:  # Concurrent requests wait for a single rebuild
+            index = self._index
+            if index is not None and index.fingerprint == fingerprint:
+                return index
+            started = time.monotonic()
+            rows = db.query(CandidateTermVector.candidate_id, CandidateTermVector.job_description_id,
+                            CandidateTermVector.terms, CandidateTermVector.length).order_by(CandidateTermVector.candidate_id).all()
+            index = _MatchIndex(rows, fingerprint)
+            self._index = index
+            logger.info(f"Skill match index built: {len(rows)} candidates, {len(index.vocabulary)} terms in {time.monotonic() - started:.2f}s.")
+            return index
+
+    @staticmethod
+    def job_terms(title: str, description_text: str) -> Counter:
+        terms = extract_terms(description_text)
+        terms.update(extract_terms(title, weight=JOB_TITLE_WEIGHT))
+        return terms
+
+    def rank(self, db, title: str, description_text: str, limit: int = 20, method: str = 'bm25',
+             exclude_job_id: int = None) -> list[dict]:
+        """
+        Ranks every stored candidate against a job's title and description.
+        :param method: 'bm25' or 'cosine' (TF-IDF cosine similarity, 0..1).
+        :param exclude_job_id: Skips candidates who already applied to this job.
+        :return: [{"candidate_id", "score", "matched_terms"}], best match first; candidates with no overlap are omitted.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unsupported match method '{method}'. Use one of {self.METHODS}.")
+        index = self._get_index(db)
+        query_terms = self.job_terms(title, description_text)
+        if not len(index.candidate_ids) or not query_terms:
+            return []
+
+        scores = index.score(query_terms, method)
+        if exclude_job_id:
+            scores[index.job_ids == exclude_job_id] = 0.0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        top = candidates[np.lexsort((-index.candidate_ids[candidates], -scores[candidates]))]
+
+        # Report the shared terms for the returned candidates only, rarest (most telling) first.
+        matched = {doc: [] for doc in top.tolist()}
+        for term in sorted(query_terms, key=lambda t: -index.idf[index.vocabulary[t]] if t in index.vocabulary else 0):
+            term_id = index.vocabulary.get(term)
+            if term_id is None:
+                continue
+            docs, _ = index.postings(term_id)
+            for doc in top[np.isin(top, docs)].tolist():
+                if len(matched[doc]) < 10:
+                    matched[doc].append(term)
+
+        return [{
+            "candidate_id": int(index.candidate_ids[doc]),
+            "score": float(scores[doc]),
+            "matched_terms": matched[doc],
+        } for doc in top.tolist()]
+
+
+skill_matcher = SkillMatcher()
@@ -0,0 +1,158 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/smtp_pool.py
+# =============================================================================
+import smtplib
+import threading
+import time
+
+from config.config_loader import config
+from logger.logger import logger
+
+# Reply codes meaning the server is closing or dropped the session; the message is retried on a new connection.
+_CONNECTION_LOST_CODES = (421,)
+
+
+class _PooledConnection:
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+    def close(self):
+        try:
+            self.server.quit()
+        except Exception:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to `size` authenticated SMTP connections open and shares them between threads, so a batch of
+    emails pays for the TCP/STARTTLS/login handshake once per connection instead of once per message.
+    A message that fails because the server dropped the connection is retried once on a fresh connection.
+    """
+    def __init__(self, host: str, port: int, username: str = None, password: str = None, use_tls: bool = True,
+                 size: int = 4, timeout: float = 30, max_messages_per_connection: int = 100, max_idle_seconds: float = 60):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.max_messages_per_connection = max_messages_per_connection
+        self.max_idle_seconds = max_idle_seconds
+        self._idle = []  # LIFO, so the most recently used (least likely to be timed out) connection is reused first
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._stats = {"connects": 0, "reused": 0, "sent": 0, "failed": 0, "reconnects": 0}
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _connect(self) -> _PooledConnection:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._count("connects")
+        return _PooledConnection(server)
+
+    def _checkout(self) -> _PooledConnection:
+        reusable, stale = None, []
+        with self._lock:
+            while self._idle and reusable is None:
+                connection = self._idle.pop()
+                if time.monotonic() - connection.last_used < self.max_idle_seconds:
+                    reusable = connection
+                    self._stats["reused"] += 1
+                else:
+                    stale.append(connection)
+        for connection in stale:
+            connection.close()
+        return reusable or self._connect()
+
+    def _checkin(self, connection: _PooledConnection):
+        connection.last_used = time.monotonic()
+        if connection.messages_sent >= self.max_messages_per_connection:
+            connection.close()
+            return
+        with self._lock:
+            self._idle.append(connection)
+
+    def send_message(self, msg):
+        """
+        Sends one email.message.Message on a pooled connection, blocking while all `size` connections are busy.
+        :raises smtplib.SMTPException: If the server rejects the message (e.g. refused recipient).
+        :raises OSError: If no connection can be established.
+        """
+        with self._slots:
+            for attempt in (1, 2):
+                try:
+                    # The retry never reuses an idle connection: the server may have dropped those too.
+                    connection = self._checkout() if attempt == 1 else self._connect()
+                except Exception:
+                    self._count("failed")
+                    raise
+                try:
+                    connection.server.send_message(msg)
+                except (smtplib.SMTPServerDisconnected, OSError) as e:
+                    connection_lost = e
+                except smtplib.SMTPResponseException as e:
+                    if e.smtp_code not in _CONNECTION_LOST_CODES:
+                        self._checkin(connection)  # A rejected message leaves the session usable
+                        self._count("failed")
+                        raise
+                    connection_lost = e
+                except smtplib.SMTPException:
+                    self._checkin(connection)
+                    self._count("failed")
+                    raise
+                else:
+                    connection.messages_sent += 1
+                    self._checkin(connection)
+                    self._count("sent")
+                    return
+
+                connection.close()
+                if attempt == 2:
+                    self._count("failed")
+                    raise connection_lost
+                logger.warning(f"SMTP connection lost ({connection_lost}); retrying on a new connection.")
+                self._count("reconnects")
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "idle_connections": len(self._idle), "size": self.size}
+
+
+_smtp_pool = None
+_smtp_pool_lock = threading.Lock()
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """Returns the process-wide SMTP connection pool built from the smtp_* settings."""
+    global _smtp_pool
+    with _smtp_pool_lock:
+        if _smtp_pool is None:
+            _smtp_pool = SMTPConnectionPool(
+                config.SMTP_SERVER, config.SMTP_PORT, config.SMTP_USERNAME, config.SMTP_PASSWORD,
+                use_tls=config.SMTP_USE_TLS, size=config.SMTP_POOL_SIZE, timeout=config.SMTP_TIMEOUT_SECONDS,
+                max_messages_per_connection=config.SMTP_MAX_MESSAGES_PER_CONNECTION,
+                max_idle_seconds=config.SMTP_MAX_IDLE_SECONDS,
+            )
+        return _smtp_pool
@@ -0,0 +1,106 @@
+# =============================================================================
+# HR-HIRE-AGENT/src/upload_store.py
+# =============================================================================
+import os
+import tempfile
+import threading
+
+from exception.custom_exception import ValidationError
+from logger.logger import logger
+
+
+class ChunkedUploadStore:
+    """
+    Writes uploaded resumes straight into a bulk job's upload folder.
+    Chunked uploads are appended to `<upload_dir>/.partial/<file_name>`. The client sends the byte offset
+    of every chunk, so after a dropped connection it asks for the received size and carries on from there.
+    A completed file is renamed into the upload folder, where the bulk job worker picks it up.
+    """
+    PARTIAL_DIR = ".partial"
+    COPY_BUFFER_BYTES = 1024 * 1024
+
+    def __init__(self, max_chunk_bytes: int):
+        self.max_chunk_bytes = max_chunk_bytes
+        self._locks_guard = threading.Lock()
+        self._file_locks = {}  # partial path -> Lock, so two requests never append to one file at once
+
+    def _partial_path(self, upload_dir: str, file_name: str) -> str:
+        return os.path.join(upload_dir, self.PARTIAL_DIR, file_name)
+
+    def _lock_for(self, path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._file_locks.setdefault(path, threading.Lock())
+
+    def received_bytes(self, upload_dir: str, file_name: str) -> int:
+        """Returns how many bytes of a file have been received so far."""
+        partial_path = self._partial_path(upload_dir, file_name)
+        return os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+
+    def write_chunk(self, upload_dir: str, file_name: str, offset: int, total_size: int, stream) -> tuple[int, str]:
+        """
+        Appends one chunk to a partially uploaded file.
+        :param offset: Byte offset of this chunk; it must equal the number of bytes already received.
+        :param total_size: Size of the complete file in bytes.
+        :param stream: A file-like object holding the chunk body.
+        :return: (bytes received so far, final file path once the file is complete, otherwise None).
+        :raises ValidationError: If the offset does not match (409) or the chunk is too large (413).
+        """
+        partial_path = self._partial_path(upload_dir, file_name)
+        os.makedirs(os.path.dirname(partial_path), exist_ok=True)
+
+        with self._lock_for(partial_path):
+            received = self.received_bytes(upload_dir, file_name)
+            if offset != received:
+                raise ValidationError(f"Chunk offset {offset} does not match the {received} bytes received for {file_name}.", status_code=409)
+
+            written = 0
+            with open(partial_path, 'ab') as f:
+                while True:
+                    buffer = stream.read(self.COPY_BUFFER_BYTES)
+                    if not buffer:
+                        break
+                    written += len(buffer)
+                    if written > self.max_chunk_bytes or received + written > total_size:
+                        f.truncate(received)
+                        raise ValidationError(f"Chunk for {file_name} is larger than allowed.", status_code=413)
+                    f.write(buffer)
+            received += written
+
+            if received < total_size:
+                return received, None
+            final_path = self._unique_path(upload_dir, file_name)
+            os.replace(partial_path, final_path)
+
+        with self._locks_guard:
+            self._file_locks.pop(partial_path, None)
+        logger.info(f"Upload of {file_name} completed ({received} bytes).")
+        return received, final_path
+
+    def stream_factory(self, upload_dir: str):
+        """
+        Returns a Werkzeug stream factory that writes every multipart file part directly into the
+        upload folder, instead of spooling it to a system temp file that is copied again on save.
+        """
+        partial_dir = os.path.join(upload_dir, self.PARTIAL_DIR)
+        os.makedirs(partial_dir, exist_ok=True)
+
+        def factory(total_content_length, content_type, filename, content_length=None):
+            return tempfile.NamedTemporaryFile('wb+', dir=partial_dir, delete=False)
+        return factory
+
+    def finalize_streamed_file(self, upload_dir: str, file_storage, file_name: str) -> str:
+        """Renames a file part written by `stream_factory` to its final name in the upload folder."""
+        file_storage.stream.close()
+        final_path = self._unique_path(upload_dir, file_name)
+        os.replace(file_storage.stream.name, final_path)
+        return final_path
+
+    @staticmethod
+    def _unique_path(upload_dir: str, file_name: str) -> str:
+        """Returns a free path for `file_name`, adding a numeric suffix when a file with that name already exists."""
+        base, extension = os.path.splitext(file_name)
+        candidate, counter = os.path.join(upload_dir, file_name), 1
+        while os.path.exists(candidate):
+            candidate = os.path.join(upload_dir, f"{base}_{counter}{extension}")
+            counter += 1
+        return candidate
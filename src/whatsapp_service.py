@@ -1,10 +1,29 @@
 # =============================================================================
 # HR-HIRE-AGENT/src/whatsapp_service.py
 # =============================================================================
-from twilio.rest import Client
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from config.config_loader import config
 from logger.logger import logger
 from exception.custom_exception import WhatsAppMessagingError
+from src.rate_limiter import TokenBucket
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Shared by every WhatsAppService instance in the process, so concurrent requests together stay within
+# the sender's Twilio throughput. The burst is one second's worth of messages.
+_send_bucket = TokenBucket(config.WHATSAPP_MESSAGES_PER_SECOND * 60, capacity=max(1.0, config.WHATSAPP_MESSAGES_PER_SECOND))
+
+
+def _is_transient(error: Exception) -> bool:
+    """Twilio throttling/5xx responses (TwilioRestException.status) and network errors are worth retrying."""
+    status = getattr(error, "status", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+    return isinstance(error, OSError)  # requests' ConnectionError/Timeout derive from IOError
 
 
 # added_what'sappservice
@@ -22,9 +41,23 @@ class WhatsAppService:
             logger.error(f"TWILIO_WHATSAPP_NUMBER in .env is not in 'whatsapp:+<E.164>' format: {self.twilio_whatsapp_number}")
             raise ValueError("TWILIO_WHATSAPP_NUMBER must be in 'whatsapp:+<E.164>' format.")
 
+        self._client = None
+        self._client_lock = threading.Lock()
 
-        self.client = Client(self.account_sid, self.auth_token)
-        logger.info("Twilio WhatsAppService initialized.")
+    @property
+    def client(self):
+        """The Twilio REST client, created (and twilio imported) on the first message rather than per service instance."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from twilio.rest import Client
+                    client = Client(self.account_sid, self.auth_token)
+                    if config.TWILIO_API_BASE_URL:
+                        client.api.base_url = config.TWILIO_API_BASE_URL.rstrip("/")
+                        logger.warning(f"Twilio API calls go to {client.api.base_url} instead of api.twilio.com.")
+                    self._client = client
+                    logger.info("Twilio WhatsAppService initialized.")
+        return self._client
 
     def send_whatsapp_message(self, to_number: str, message: str):
         """
@@ -36,17 +69,61 @@ class WhatsAppService:
             raise WhatsAppMessagingError(f"Target WhatsApp number is not in 'whatsapp:+<E.164>' format: {to_number}")
 
         try:
-            message_obj = self.client.messages.create(
-                from_=self.twilio_whatsapp_number,
-                body=message,
-                to=to_number
-            )
+            message_obj, _ = self._create_message(to_number, message)
             logger.info(f"WhatsApp message sent to {to_number}: SID={message_obj.sid}")
             return True
         except Exception as e:
             logger.error(f"Failed to send WhatsApp message to {to_number}: {e}")
             raise WhatsAppMessagingError(f"Failed to send WhatsApp message: {e}")
 
+    def _create_message(self, to_number: str, message: str):
+        """
+        Calls the Twilio Messages API at the shared send rate, retrying transient errors with
+        exponential backoff and full jitter.
+        :return: (message instance, number of attempts)
+        """
+        attempt = 0
+        while True:
+            _send_bucket.acquire(1)
+            attempt += 1
+            try:
+                return self.client.messages.create(from_=self.twilio_whatsapp_number, body=message, to=to_number), attempt
+            except Exception as e:
+                if not _is_transient(e) or attempt > config.WHATSAPP_MAX_RETRIES:
+                    e.attempts = attempt  # Reported in send_bulk's per-recipient results
+                    raise
+                delay = random.uniform(0, min(config.WHATSAPP_BACKOFF_MAX_SECONDS, config.WHATSAPP_BACKOFF_BASE_SECONDS * (2 ** attempt)))
+                logger.warning(f"WhatsApp send to {to_number} failed ({e}); retry {attempt}/{config.WHATSAPP_MAX_RETRIES} in {delay:.1f}s.")
+                time.sleep(delay)
+
+    def send_bulk(self, messages: dict) -> dict:
+        """
+        Sends many WhatsApp messages concurrently on up to max_workers_whatsapp_sending threads, paced to
+        whatsapp_messages_per_second for the whole process.
+        :param messages: {key: (to_number, body)}, keyed by anything hashable (e.g. candidate id).
+        :return: {key: {"status": "sent" | "failed", "sid", "attempts", "error"}}
+        """
+        def send(item):
+            key, (to_number, body) = item
+            if not to_number or not to_number.startswith("whatsapp:+"):
+                return key, {"status": "failed", "sid": None, "attempts": 0,
+                             "error": f"Target WhatsApp number is not in 'whatsapp:+<E.164>' format: {to_number}"}
+            try:
+                message_obj, attempts = self._create_message(to_number, body)
+                return key, {"status": "sent", "sid": message_obj.sid, "attempts": attempts, "error": None}
+            except Exception as e:
+                logger.error(f"Failed to send WhatsApp message to {to_number}: {e}")
+                return key, {"status": "failed", "sid": None, "attempts": getattr(e, "attempts", None), "error": str(e)}
+
+        if not messages:
+            return {}
+        workers = max(1, min(config.MAX_WORKERS_WHATSAPP_SENDING, len(messages)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whatsapp") as executor:
+            results = dict(executor.map(send, messages.items()))
+        sent = sum(1 for result in results.values() if result["status"] == "sent")
+        logger.info(f"Bulk WhatsApp dispatch finished: {sent} sent, {len(results) - sent} failed.")
+        return results
+
     # The template generation methods below are now primarily for reference, 
     # as the logic will be mirrored and customized on the frontend.
     def generate_ats_score_message(self, candidate_name: str, score: float) -> str:
@@ -0,0 +1,84 @@
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sent_count = 0
+sent_lock = threading.Lock()
+
+
+class MockTwilioHandler(BaseHTTPRequestHandler):
+    """Answers Twilio's Create Message call (POST .../Messages.json) and nothing else."""
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def respond(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        global sent_count
+        form = parse_qs(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8"))
+        if not self.path.endswith("/Messages.json"):
+            return self.respond(404, {"code": 20404, "message": "The requested resource was not found", "status": 404})
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if random.random() < self.server.error_rate:
+            status = random.choice((429, 503))
+            return self.respond(status, {"code": 20429 if status == 429 else 20500, "message": "Simulated transient error", "status": status})
+
+        with sent_lock:
+            sent_count += 1
+        to_number, body = form.get("To", [""])[0], form.get("Body", [""])[0]
+        if not self.server.quiet:
+            print(f"[{sent_count}] To: {to_number} | {body[:60]}")
+        self.respond(201, {
+            "sid": f"SM{uuid.uuid4().hex}", "status": "queued", "to": to_number,
+            "from": form.get("From", [""])[0], "body": body, "num_segments": "1",
+        })
+
+
+class MockTwilioServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, quiet: bool = False, error_rate: float = 0.0, latency: float = 0.0):
+        super().__init__(address, MockTwilioHandler)
+        self.quiet = quiet
+        self.error_rate = error_rate
+        self.latency = latency
+
+
+def run_server(host: str, port: int, quiet: bool, error_rate: float, latency: float):
+    """
+    A local stand-in for the Twilio REST API for development and tests: accepts WhatsApp messages and prints
+    them instead of delivering them, optionally failing a share of requests with 429/503 to exercise retries.
+    Point the app at it with TWILIO_API_BASE_URL=http://<host>:<port>.
+    """
+    with MockTwilioServer((host, port), quiet=quiet, error_rate=error_rate, latency=latency) as server:
+        print(f"--- Mock Twilio API listening on http://{host}:{port} (Ctrl+C to stop) ---")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"\nAccepted {sent_count} messages.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local mock of the Twilio Messages API.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=4010)
+    parser.add_argument("--quiet", action="store_true", help="Do not print each message.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 429/503.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before answering.")
+    args = parser.parse_args()
+
+    run_server(args.host, args.port, args.quiet, args.error_rate, args.latency)